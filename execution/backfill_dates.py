@@ -1,109 +1,77 @@
-import os
-import time
-import json
+"""
+Backfill Dates - Fills article_date on processed signals, locally
+The enrichment pass now captures article_date itself (local heuristic first,
+then the model's date), so this only covers signals processed before that.
+Dates come from date_window.find_content_date (URL path, byline, header):
+no LLM calls, no quota. Signals with no findable date are marked
+article_date_source="none" so later runs skip them.
+
+Usage:
+    python3 execution/backfill_dates.py
+"""
 import logging
 from dotenv import load_dotenv
-from groq import Groq
+import date_window
 import db_client
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 
-# Credentials
-GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
-GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
+WRITE_BATCH = 100  # signal updates per transaction
+
+
+def needs_date(signal):
+    return (signal.get("processed") is True and not signal.get("article_date")
+            and signal.get("article_date_source") != "none")
+
+
+def source_urls():
+    """source_id -> url, so harvester signals (no url field) still have a URL to date."""
+    resp = db_client.query_db({"sources": {}}) or {}
+    return {s["id"]: s.get("url") for s in resp.get("sources", [])}
 
-gemini_client = None
-if GOOGLE_API_KEY:
-    try:
-        from google import genai
-        gemini_client = genai.Client(api_key=GOOGLE_API_KEY)
-        logging.info("✨ Using Gemini 2.0 Flash (via google.genai)")
-    except ImportError:
-        logging.error("❌ google.genai module not found.")
-
-if not gemini_client:
-    logging.warning("⚠️ Gemini client failed to initialize. Will fallback or exit if no other options.")
-
-def extract_date(text):
-    if not text: return None
-    if not gemini_client: return None
-
-    # Flash has large context
-    metrics_text = text[:30000]
-    
-    prompt = f"""
-    You are a data extraction engine.
-    Task: Extract the exact publication date of the article.
-    Format: YYYY-MM-DD
-    Context: If no explicit date ("Jan 1, 2024"), estimate from relative dates ("published 2 days ago") relative to today ({time.strftime('%Y-%m-%d')}). 
-    If absolutely no date context, return null.
-    
-    Return pure JSON: {{ "date": "YYYY-MM-DD" }}
-    
-    TEXT:
-    {metrics_text}
-    """
-    
-    max_retries = 10
-    for attempt in range(max_retries):
-        try:
-            # New SDK usage
-            response = gemini_client.models.generate_content(
-                model="gemini-2.0-flash",
-                contents=prompt,
-                config={"response_mime_type": "application/json"}
-            )
-            
-            if not response.text: return None
-            data = json.loads(response.text)
-            return data.get("date")
-        except Exception as e:
-            error_str = str(e)
-            if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
-                wait = 30 * (attempt + 1)
-                logging.warning(f"   ⚠️ Rate Limit. Retry {attempt+1}/{max_retries} in {wait}s...")
-                time.sleep(wait)
-                continue
-            else:
-                logging.error(f"   ❌ Generation Error: {e}")
-                return None
-    return None
 
 def run_backfill():
-    print("⏳ STARTING DATE BACKFILL (GEMINI 2.0 POWERED)...")
-    
+    print("⏳ STARTING DATE BACKFILL (LOCAL HEURISTIC)...")
+
     try:
         resp = db_client.query_db({"raw_signals": {}})
         signals = resp.get("raw_signals", [])
     except Exception as e:
         print(f"   ⚠️ DB Fetch Failed: {e}")
         return
-    
-    targets = [s for s in signals if s.get("processed") is True and not s.get("article_date")]
+
+    targets = [s for s in signals if needs_date(s)]
     total = len(targets)
     print(f"   Found {total} processed signals missing dates.")
-    
+
     if total == 0:
         print("   ✅ All processed signals have dates!")
         return
 
-    for i, s in enumerate(targets):
-        print(f"[{i+1}/{total}] 🔍 {s.get('id')} ...")
-        
-        date = extract_date(s.get("content", ""))
-        
-        if date:
-            print(f"   📅 Found: {date}")
-            try:
-                db_client.mark_signal_processed(s["id"], article_date=date)
-            except Exception as e:
-                print(f"   ⚠️ Save Failed: {e}")
+    sources = source_urls()
+    updates = {}
+    found = {}
+    for s in targets:
+        url = s.get("url") or sources.get(s.get("source_id")) or s.get("source_url")
+        local_date = date_window.local_article_date(s.get("content") or "", url)
+        fields = date_window.article_date_fields(local_date) or {"article_date_source": "none"}
+        updates[s["id"]] = fields
+        found[fields["article_date_source"]] = found.get(fields["article_date_source"], 0) + 1
+
+    ids = list(updates)
+    saved = 0
+    for i in range(0, len(ids), WRITE_BATCH):
+        chunk = {signal_id: updates[signal_id] for signal_id in ids[i:i + WRITE_BATCH]}
+        # transact_db returns None (and logs) on failure
+        if db_client.update_signals(chunk) is not None:
+            saved += len(chunk)
         else:
-            print("   ❌ No date found context.")
+            print(f"   ⚠️ Save Failed ({len(chunk)} signals)")
+
+    dated = total - found.get("none", 0)
+    print(f"🏁 Backfill done. Dated {dated}/{total} ({found}), {saved}/{total} signals written.")
 
-        # Rate Limit Pacing (Gemini Flash is fast, but let's be safe: 2s)
-        time.sleep(2)
 
 if __name__ == "__main__":
     run_backfill()
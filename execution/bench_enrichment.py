@@ -0,0 +1,176 @@
+"""
+Bench Enrichment - Offline throughput / concurrency / rate-limiter benchmark
+Runs the real enrichment path (enrichment_engine.process_batch: pre-filter,
+cascade, multi-document packing, key pool, router, token buckets) against
+recorded provider responses (llm_replay.py), with InstantDB writes captured
+in memory and the LLM cache disabled, so nothing touches the network or the DB.
+
+1. export  a sample of already-enriched signals to a JSONL file (needs the DB)
+2. record  them once with live keys, writing fixtures (needs keys + quota)
+3. run     replays the sample at each concurrency level (fully offline)
+
+Usage:
+    python3 execution/bench_enrichment.py export 200
+    python3 execution/bench_enrichment.py record
+    python3 execution/bench_enrichment.py run 1,4,8,16
+
+Replay behaviour (latency distribution, injected 429s, server-side RPM,
+number of fake keys) is set with the LLM_REPLAY_* variables (see llm_replay.py);
+client-side quotas with ENRICH_RATE_LIMITS as usual.
+"""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+import credential_pool
+import db_client
+import enrichment_engine
+from engine_router import ROUTER
+import llm_cache
+import llm_replay
+import rate_limiter
+import usage_ledger
+
+load_dotenv()
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+SIGNALS_PATH = Path(os.environ.get("BENCH_SIGNALS", DATA_DIR / "bench_signals.jsonl"))
+FIXTURES_PATH = Path(os.environ.get("LLM_REPLAY") or os.environ.get("LLM_RECORD") or llm_replay.DEFAULT_FIXTURES)
+
+SIGNAL_FIELDS = ("id", "content", "url", "source_id", "source_url")
+
+
+class OfflineDB:
+    """Captures db_client writes in memory (every write goes through transact_db)."""
+
+    def __init__(self):
+        self.steps = []
+
+    def query_db(self, query_dict):
+        return {}
+
+    def transact_db(self, steps):
+        self.steps.extend(steps)
+        return {"status": "offline"}
+
+    def verdicts(self):
+        """{signal_id: llm_relevant} from the captured signal updates."""
+        return {step[2]: step[3].get("llm_relevant") for step in self.steps
+                if step[0] == "update" and step[1] == "raw_signals" and "llm_relevant" in step[3]}
+
+
+def go_offline():
+    """Routes DB writes, the cache and the usage ledger away from shared state."""
+    offline = OfflineDB()
+    db_client.query_db = offline.query_db
+    db_client.transact_db = offline.transact_db
+    llm_cache.ENABLED = False
+    usage_ledger.LEDGER_PATH = Path(":memory:")
+    return offline
+
+
+def load_signals():
+    with open(SIGNALS_PATH, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def export(limit):
+    """Writes the newest `limit` LLM-enriched signals to SIGNALS_PATH (urls resolved from sources)."""
+    enrichment_engine.refresh_sources()
+    resp = db_client.query_db({"raw_signals": {}}) or {}
+    signals = [s for s in resp.get("raw_signals", []) if s.get("enrich_engine") and s.get("content")]
+    signals.sort(key=lambda s: s.get("created_at") or 0, reverse=True)
+    SIGNALS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(SIGNALS_PATH, "w", encoding="utf-8") as f:
+        for s in signals[:limit]:
+            f.write(json.dumps(dict({k: s.get(k) for k in SIGNAL_FIELDS}, url=enrichment_engine.signal_url(s))) + "\n")
+    print(f"📦 Exported {min(limit, len(signals))} signals to {SIGNALS_PATH}")
+
+
+def reset():
+    """Fresh keys, buckets, router health and replay counters for the next run."""
+    credential_pool.reset_pools()
+    rate_limiter.reset_limiters()
+    with ROUTER.lock:
+        ROUTER.health.clear()
+    llm_replay.reset_stats()
+
+
+def enrich_all(signals):
+    """Runs every signal through process_batch in BATCH_SIZE batches. Returns (counts, seconds)."""
+    counts = {}
+    started = time.monotonic()
+    size = max(1, enrichment_engine.BATCH_SIZE)
+    for i in range(0, len(signals), size):
+        batch = [dict(s) for s in signals[i:i + size]]
+        for outcome, n in enrichment_engine.process_batch(batch).items():
+            counts[outcome] = counts.get(outcome, 0) + n
+    return counts, time.monotonic() - started
+
+
+def record():
+    """
+    Enriches the sample with live keys, appending every call to the fixtures.
+    Streaming is off while recording so every fixture holds the whole
+    response; replay streams it back and the engine aborts where it would live.
+    """
+    signals = load_signals()
+    go_offline()
+    enrichment_engine.STREAM = False
+    llm_replay.RECORD_PATH = str(FIXTURES_PATH)
+    reset()
+    print(f"🎙️ Recording {len(signals)} signals to {FIXTURES_PATH} ...")
+    counts, seconds = enrich_all(signals)
+    print(f"🏁 {counts} in {seconds:.1f}s | {usage_ledger.session_summary()}")
+
+
+def run(levels):
+    """Replays the sample at each concurrency level and prints a comparison table."""
+    signals = load_signals()
+    offline = go_offline()
+    llm_replay.REPLAY_PATH = str(FIXTURES_PATH)
+    fixtures = llm_replay.fixtures()
+    print(f"🎞️ Replaying {len(signals)} signals against {sum(map(len, fixtures.values()))} recordings "
+          f"({FIXTURES_PATH})")
+    print(f"   latency={llm_replay.REPLAY_LATENCY} 429_rate={llm_replay.REPLAY_429_RATE} "
+          f"server_rpm={llm_replay.REPLAY_RPM or 'off'} keys={llm_replay.REPLAY_KEYS}")
+    print(f"{'conc':>5} {'secs':>8} {'sig/s':>7} {'calls':>6} {'hits':>5} {'miss':>5} "
+          f"{'429inj':>6} {'429rpm':>6} {'quar':>5}  outcomes")
+
+    baseline = None
+    for level in levels:
+        reset()
+        offline.steps.clear()
+        enrichment_engine.CONCURRENCY = level
+        counts, seconds = enrich_all(signals)
+        stats = dict(llm_replay.STATS)
+        quarantines = sum(k["quarantines"] for k in credential_pool.usage_snapshot().values())
+        print(f"{level:>5} {seconds:>8.1f} {len(signals) / seconds if seconds else 0:>7.2f} {stats['calls']:>6} "
+              f"{stats['hits']:>5} {stats['misses']:>5} {stats['injected_429']:>6} {stats['quota_429']:>6} "
+              f"{quarantines:>5}  {counts}")
+
+        verdicts = offline.verdicts()
+        if baseline is None:
+            baseline = verdicts
+        elif verdicts != baseline:
+            changed = sum(1 for k in set(baseline) | set(verdicts) if baseline.get(k) != verdicts.get(k))
+            print(f"      ⚠️ {changed} verdicts differ from the first run (429s moved work to other engines?)")
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "run"
+    if command == "export":
+        export(int(sys.argv[2]) if len(sys.argv) > 2 else 200)
+    elif command == "record":
+        record()
+    elif command == "run":
+        levels = sys.argv[2] if len(sys.argv) > 2 else "1,4,8,16"
+        run([int(level) for level in levels.split(",") if level.strip()])
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
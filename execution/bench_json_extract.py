@@ -0,0 +1,141 @@
+"""
+Bench JSON Extract - Fuzz corpus and microbenchmark for json_extract.py
+Builds a seeded corpus of model-style responses (prose with stray braces,
+code fences, trailing commas, comments, single quotes, multiple objects,
+braces and escaped quotes inside strings, truncation, bracket bombs) and
+checks json_extract against the expected value for each. Then times it
+against the old greedy regex fallback as responses grow.
+
+Usage:
+    python3 execution/bench_json_extract.py            # fuzz (2000 cases) + benchmark
+    python3 execution/bench_json_extract.py 20000      # bigger fuzz run
+"""
+import json
+import random
+import re
+import sys
+import time
+import json_extract
+
+PROSE = ["Here is the JSON you asked for:", "Sure! {see below}", "Note: use {braces} carefully.",
+         "The article mentions a 40-story tower.", "I hope this helps :}", "Result [1 of 1]:", ""]
+KEYS = ["relevant", "name", "units", "floors", "gdv", "status_stage", "description", "individuals"]
+
+
+def random_value(rng, depth=0):
+    kind = rng.randrange(7 if depth < 3 else 4)
+    if kind == 0:
+        return rng.randrange(-5, 5000)
+    if kind == 1:
+        return rng.choice([True, False, None])
+    if kind == 2:
+        # Strings with braces, brackets, quotes, backslashes and unicode
+        return "".join(rng.choice(['a', ' ', '{', '}', '[', ']', '"', '\\', "'", 'é', '\n', '$1.2B']) for _ in range(rng.randrange(12)))
+    if kind == 3:
+        return rng.random() * 1000
+    if kind in (4, 5):
+        return {rng.choice(KEYS) + str(i): random_value(rng, depth + 1) for i in range(rng.randrange(4))}
+    return [random_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+
+
+def random_object(rng):
+    obj = {"relevant": rng.choice([True, False])}
+    for key in rng.sample(KEYS[1:], rng.randrange(len(KEYS))):
+        obj[key] = random_value(rng)
+    return obj
+
+
+def add_trailing_commas(text):
+    return text.replace("}", ",}").replace("]", ",]").replace("{,}", "{}").replace("[,]", "[]")
+
+
+def make_case(rng):
+    """(response_text, expected_first_value, expected_all_values or None when not checked)."""
+    obj = random_object(rng)
+    body = json.dumps(obj, indent=rng.choice([None, 2]), ensure_ascii=rng.random() < 0.5)
+    mutation = rng.randrange(8)
+    if mutation == 0:
+        return body, obj, [obj]
+    if mutation == 1:
+        return f"```json\n{body}\n```", obj, [obj]
+    if mutation == 2:
+        return f"{rng.choice(PROSE)}\n{body}\n{rng.choice(PROSE)}", obj, None
+    if mutation == 3:
+        return add_trailing_commas(body) if "\"" not in body.replace('":', "").replace(', "', "") else body, obj, None
+    if mutation == 4:
+        second = random_object(rng)
+        return f"{body}\n\nAnd another:\n{json.dumps(second)}", obj, [obj, second]
+    if mutation == 5:
+        return body.replace("true", "True").replace("false", "False").replace("null", "None") \
+            if '"' not in "".join(str(v) for v in obj.values() if isinstance(v, str)) else body, obj, None
+    if mutation == 6:
+        return f"// extraction result\n{body}", obj, None
+    # Truncated response (max tokens hit): nothing valid, must not raise
+    return body[:max(1, len(body) // 2)] if len(body) > 4 else "{", None, None
+
+
+def fuzz(cases, seed=0):
+    rng = random.Random(seed)
+    failures = 0
+    for i in range(cases):
+        text, expected, expected_all = make_case(rng)
+        try:
+            got = json_extract.extract_json(text)
+            got_all = json_extract.extract_all(text)
+        except Exception as e:
+            failures += 1
+            print(f"   💥 case {i} raised {e!r}: {text[:80]!r}")
+            continue
+        if expected is not None and got != expected:
+            failures += 1
+            if failures <= 10:
+                print(f"   ❌ case {i}: got {str(got)[:60]!r} expected {str(expected)[:60]!r}\n      {text[:120]!r}")
+        elif expected_all is not None and got_all != expected_all:
+            failures += 1
+            if failures <= 10:
+                print(f"   ❌ case {i} (all): got {len(got_all)} values, expected {len(expected_all)}")
+    print(f"🧪 Fuzz: {cases - failures}/{cases} cases OK (seed {seed})")
+    return failures
+
+
+def old_extract(text):
+    """The replaced regex fallback, for comparison."""
+    match = re.search(r'\{.*\}', text, re.DOTALL)
+    if match:
+        try:
+            return json.loads(match.group())
+        except json.JSONDecodeError:
+            pass
+    return None
+
+
+def timed(fn, text, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def benchmark():
+    obj = {"results": [{"id": f"sig{i}", "relevant": True, "name": "Tower {A}", "units": 300} for i in range(5)]}
+    print("⏱️ Benchmark (ms per call): new extractor vs old regex fallback")
+    print(f"   {'response':32s} {'size':>8} {'new':>9} {'old':>9}  found (new/old)")
+    for n in (1, 10, 100, 1000):
+        prose = "The model rambles {with braces} here. " * n
+        shapes = {
+            "object only": json.dumps(obj) + " " * (40 * n),
+            "prose + object": f"{prose}\n{json.dumps(obj)}\n{prose}",
+            "unclosed brace + object": f"{prose} {{ {prose}\n{json.dumps(obj)}",
+            "bracket bomb (no JSON)": "{[" * (40 * n),
+        }
+        for name, text in shapes.items():
+            repeat = max(1, 200 // n)
+            new_ms = timed(json_extract.extract_json, text, repeat)
+            old_ms = timed(old_extract, text, repeat)
+            found = f"{json_extract.extract_json(text) == obj}/{old_extract(text) == obj}"
+            print(f"   {name:32s} {len(text):>8,d} {new_ms:>9.3f} {old_ms:>9.3f}  {found}")
+
+
+if __name__ == "__main__":
+    fuzz(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
+    benchmark()
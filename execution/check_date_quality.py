@@ -12,16 +12,23 @@ def check_date_quality():
     print(f"Total Signals: {len(signals)}")
     
     missing_dates = 0
+    undatable = 0
     malformed_dates = 0
     good_dates = 0
     
     formats = collections.Counter()
+    sources = collections.Counter()
     
     for s in signals:
         ad = s.get("article_date")
         if not ad:
-            missing_dates += 1
+            # Backfill found no date anywhere in the article: nothing left to try
+            if s.get("article_date_source") == "none":
+                undatable += 1
+            else:
+                missing_dates += 1
             continue
+        sources[s.get("article_date_source") or "unknown"] += 1
             
         # Check format
         try:
@@ -35,6 +42,8 @@ def check_date_quality():
 
     print(f"✅ Good Dates (YYYY-MM-DD): {good_dates}")
     print(f"⚠️ Missing Dates: {missing_dates}")
+    print(f"🤷 No Date In Article: {undatable}")
+    print(f"📍 Date Sources: {dict(sources)}")
     print(f"❌ Malformed Dates: {malformed_dates}")
     
     if malformed_dates > 0:
@@ -0,0 +1,135 @@
+"""
+Condense - Fit an article into a per-model token budget before enrichment
+Blind truncation (content[:2500]) kept nav menus and cookie banners and cut
+off the paragraph with unit counts and GDV. Instead:
+1. strip boilerplate lines (nav, share/subscribe, cookie and legal text)
+2. score each paragraph for project facts (numbers with units, money,
+   "stories"/"units", developer/architect/lender mentions, proper names)
+3. pack the best paragraphs into the model's token budget (token_count.py),
+   re-emitted in their original order so the article still reads top-down.
+The first paragraph (usually the headline) is always kept.
+"""
+import os
+import re
+from token_count import count_tokens
+
+# Article tokens per model (the prompt template adds ~450 more)
+MODEL_TOKEN_BUDGETS = {
+    "llama-3.3-70b-versatile": 1500,
+    "llama-3.1-8b-instant": 1200,
+    "gemini-flash-latest": 3000,
+    "gemini-2.0-flash": 3000,
+}
+DEFAULT_TOKEN_BUDGET = int(os.environ.get("ENRICH_TOKEN_BUDGET", "1500"))
+
+# Cookie banners and legal footers: never article text, whatever their shape
+LEGAL_RE = re.compile(
+    r"\bcookies?\b|privacy policy|terms of (?:use|service)|all rights reserved|©",
+    re.IGNORECASE
+)
+# Nav/share/footer labels. Only dropped when the line has a nav shape (short,
+# no sentence punctuation) or is exactly one of these phrases, so article
+# text like "The developer declined to comment." is kept.
+BOILERPLATE_RE = re.compile(
+    r"copyright|subscribe|newsletter|sign up|log ?in|share (?:this|on)|follow us|advertis|"
+    r"related (?:posts|articles|stories)|read more|click here|comments?\b|leave a reply|skip to content",
+    re.IGNORECASE
+)
+BOILERPLATE_LINE_RE = re.compile(
+    r"(?:\d+\s+)?(?:" + BOILERPLATE_RE.pattern + r")(?:\s*\(\d+\))?[\s.:!»›>…-]*",
+    re.IGNORECASE
+)
+NAV_LINE_CHARS = 60
+SENTENCE_END_RE = re.compile(r"[.!?][\"')\]]?$")
+
+
+def is_boilerplate(line):
+    """True for cookie/legal lines and for nav-shaped share/subscribe/comment labels."""
+    if len(line) >= 200:
+        return False
+    if LEGAL_RE.search(line) or BOILERPLATE_LINE_RE.fullmatch(line):
+        return True
+    nav_shaped = len(line) < NAV_LINE_CHARS and not SENTENCE_END_RE.search(line)
+    return nav_shaped and bool(BOILERPLATE_RE.search(line))
+
+# Fact patterns: (compiled pattern, weight per hit)
+FACT_PATTERNS = [
+    (re.compile(r"\b\d{1,3}[- ]stor(?:y|ies)\b|\b\d{1,3}[- ]floors?\b", re.IGNORECASE), 4.0),
+    (re.compile(r"\b\d[\d,]*\s+(?:\w+\s+)?(?:units|residences|condos|apartments|keys|rooms)\b", re.IGNORECASE), 4.0),
+    (re.compile(r"\$\s?\d[\d,.]*\s?(?:million|billion|m\b|b\b|k\b)?", re.IGNORECASE), 3.0),
+    (re.compile(r"\b\d[\d,]*\s+square[- ]f(?:ee|oo)t\b", re.IGNORECASE), 1.5),
+    (re.compile(r"\b(?:developer|developed by|architect|designed by|lender|financing|loan|"
+                r"sales|marketing|broker|general contractor)\b", re.IGNORECASE), 2.0),
+    (re.compile(r"\b(?:condo|tower|high-rise|residential|mixed-use|multifamily|penthouse|"
+                r"groundbreaking|permit|rezoning|completion|delivery|topped out)\w*\b", re.IGNORECASE), 1.0),
+    (re.compile(r"\b\d{2,5}\s+(?:[NSEW]\.?\s+)?\w+\s+(?:street|st|avenue|ave|boulevard|blvd|road|rd|drive|dr|way)\b",
+                re.IGNORECASE), 2.5),
+    (re.compile(r"\b(?:19|20)\d{2}\b"), 0.5),
+]
+
+# Capitalised multi-word names ("Related Group", "Arquitectonica International")
+NAME_RE = re.compile(r"\b[A-Z][a-z]+(?:\s+[A-Z][a-z&]+)+\b")
+
+MIN_PARAGRAPH_CHARS = 40
+
+
+def paragraphs(content):
+    """Non-boilerplate paragraphs, merging runs of short lines (bullets, split sentences)."""
+    paras = []
+    buffer = []
+    seen = set()
+    for line in (content or "").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        key = line.lower()
+        if key in seen:
+            continue  # repeated menu/footer lines
+        seen.add(key)
+        if is_boilerplate(line):
+            continue
+        buffer.append(line)
+        if len(" ".join(buffer)) >= MIN_PARAGRAPH_CHARS or line.endswith((".", "!", "?", ":")):
+            paras.append(" ".join(buffer))
+            buffer = []
+    if buffer:
+        paras.append(" ".join(buffer))
+    # Short fragments without any fact are nav labels
+    return [p for i, p in enumerate(paras) if i == 0 or len(p) >= MIN_PARAGRAPH_CHARS or score_paragraph(p) > 0]
+
+
+def score_paragraph(text):
+    """Project-fact density of a paragraph."""
+    score = sum(weight * len(pattern.findall(text)) for pattern, weight in FACT_PATTERNS)
+    score += 0.5 * len(NAME_RE.findall(text))
+    return score
+
+
+def token_budget(model):
+    return MODEL_TOKEN_BUDGETS.get(model, DEFAULT_TOKEN_BUDGET)
+
+
+def condense(content, budget):
+    """
+    Returns the content packed into `budget` tokens. Text that already fits
+    (after boilerplate stripping) is returned whole.
+    """
+    paras = paragraphs(content)
+    if not paras:
+        return ""
+    costs = [count_tokens(p) + 1 for p in paras]
+    if sum(costs) <= budget:
+        return "\n".join(paras)
+
+    # Headline first, then by fact density per token, earlier paragraphs winning ties
+    order = sorted(range(1, len(paras)), key=lambda i: (-score_paragraph(paras[i]) / costs[i], i))
+    chosen = {0}
+    used = costs[0]
+    for i in order:
+        if used + costs[i] <= budget:
+            chosen.add(i)
+            used += costs[i]
+    if used > budget:
+        # A giant first paragraph: fall back to trimming it
+        return paras[0][:budget * 4]
+    return "\n".join(paras[i] for i in sorted(chosen))
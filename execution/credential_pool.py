@@ -0,0 +1,207 @@
+"""
+Credential Pool - Several API keys per provider, each with its own quota
+Keys come from GROQ_API_KEYS / GOOGLE_API_KEYS (comma-separated) plus the
+single GROQ_API_KEY / GOOGLE_API_KEY, so adding capacity is an .env change:
+
+    GROQ_API_KEYS=gsk_aaa,gsk_bbb,gsk_ccc
+
+Every key gets its own Provider client and its own RPM/TPM buckets
+(rate_limiter, keyed by key id). A call takes the least-loaded key with
+quota free; a key that hits a 429 is quarantined for its Retry-After (or
+an exponential backoff, or an hour when the message says a daily quota is
+exhausted) while the other keys keep serving. Quotas are per key AND model
+(Groq), so the quarantine is too: a 70B daily-quota hit leaves the same key
+serving the 8B triage model.
+
+Usage:
+    python3 execution/credential_pool.py    # list configured keys (masked)
+"""
+import os
+import threading
+import time
+import llm_providers
+import llm_replay
+import rate_limiter
+
+# Plural env var per provider kind, read alongside Provider.key_env
+POOL_ENV = {
+    "groq": "GROQ_API_KEYS",
+    "gemini": "GOOGLE_API_KEYS",
+}
+
+QUARANTINE_BASE = 10.0     # seconds, doubled per consecutive 429 without Retry-After
+QUARANTINE_MAX = 600.0
+DAILY_QUOTA_QUARANTINE = 3600.0
+DAILY_QUOTA_MARKERS = ("per day", "requests per day", "tokens per day", "rpd", "tpd", "daily")
+
+
+def mask_key(key):
+    return f"…{key[-4:]}" if key and len(key) > 8 else "…"
+
+
+class KeySlot:
+    """One API key: its client, per-model quarantine state and usage counters."""
+
+    def __init__(self, kind, index, provider):
+        self.kind = kind
+        self.key_id = f"{kind}#{index + 1}"
+        self.label = f"{self.key_id} ({mask_key(provider.api_key)})"
+        self.provider = provider
+        self.quarantined_until = {}  # model -> time.time() the quarantine ends
+        self.consecutive_429 = {}    # model -> 429s in a row
+        self.in_flight = 0
+        self.usage = {"calls": 0, "tokens": 0, "rate_limited": 0, "errors": 0, "quarantines": 0}
+
+    def limiter(self, model):
+        return rate_limiter.get_limiter(self.kind, model, self.key_id)
+
+    def quarantine_remaining(self, model, now=None):
+        return max(0.0, self.quarantined_until.get(model, 0.0) - (now or time.time()))
+
+
+class CredentialPool:
+    """All keys for one provider kind. Thread-safe."""
+
+    def __init__(self, kind, keys=None):
+        self.kind = kind
+        provider_cls = llm_providers.PROVIDERS[kind]
+        keys = keys if keys is not None else configured_keys(kind)
+        if provider_cls.key_env is None:
+            providers = [llm_providers.get_provider(kind)]  # keyless (local stand-in)
+        else:
+            providers = [provider_cls(api_key=key) for key in keys]
+        providers = llm_replay.wrap_providers(kind, providers)  # LLM_RECORD / LLM_REPLAY
+        self.slots = [KeySlot(kind, i, p) for i, p in enumerate(providers)]
+        self.lock = threading.Lock()
+
+    @property
+    def available(self):
+        return any(slot.provider.available for slot in self.slots)
+
+    def _ready(self, model, now):
+        return [s for s in self.slots if s.provider.available and s.quarantined_until.get(model, 0.0) <= now]
+
+    def try_acquire(self, model, tokens):
+        """Least-loaded key (fewest in flight, then fewest calls) with quota free now, or None."""
+        with self.lock:
+            for slot in sorted(self._ready(model, time.time()), key=lambda s: (s.in_flight, s.usage["calls"])):
+                if slot.limiter(model).try_acquire(tokens):
+                    slot.in_flight += 1
+                    return slot
+        return None
+
+    def wait_time(self, model, tokens):
+        """Seconds until some key could take the call (quota refill or quarantine end)."""
+        now = time.time()
+        waits = [max(s.quarantine_remaining(model, now), s.limiter(model).wait_time(tokens))
+                 for s in self.slots if s.provider.available]
+        return min(waits) if waits else float("inf")
+
+    def acquire(self, model, tokens, max_wait=60.0):
+        """Blocks until a key has quota. Returns the slot, or None past max_wait."""
+        deadline = time.monotonic() + max_wait
+        while True:
+            slot = self.try_acquire(model, tokens)
+            if slot is not None:
+                return slot
+            wait = self.wait_time(model, tokens)
+            if time.monotonic() + wait > deadline:
+                return None
+            time.sleep(min(max(wait, 0.05), 1.0))
+
+    def healthy_keys(self, model):
+        """Keys not in quarantine for model."""
+        with self.lock:
+            return len(self._ready(model, time.time()))
+
+    def release(self, slot, model, tokens=0, error=None):
+        """
+        Records the outcome of a call made with slot for model. error is the
+        exception the call raised, usually a ProviderError (None on success).
+        Returns the quarantine in seconds (0 if none).
+        """
+        with self.lock:
+            slot.in_flight = max(0, slot.in_flight - 1)
+            slot.usage["calls"] += 1
+            slot.usage["tokens"] += tokens
+            if error is None:
+                slot.consecutive_429.pop(model, None)
+                return 0.0
+            if not getattr(error, "rate_limited", False):
+                slot.usage["errors"] += 1
+                return 0.0
+
+            slot.usage["rate_limited"] += 1
+            slot.usage["quarantines"] += 1
+            streak = slot.consecutive_429[model] = slot.consecutive_429.get(model, 0) + 1
+            if any(marker in str(error).lower() for marker in DAILY_QUOTA_MARKERS):
+                seconds = max(error.retry_after or 0.0, DAILY_QUOTA_QUARANTINE)
+            elif error.retry_after is not None:
+                seconds = error.retry_after
+            else:
+                seconds = min(QUARANTINE_MAX, QUARANTINE_BASE * 2 ** (streak - 1))
+            slot.quarantined_until[model] = max(slot.quarantined_until.get(model, 0.0), time.time() + seconds)
+            return seconds
+
+    def snapshot(self):
+        """{key_id: usage + quarantine per model still quarantined} for logs and the monitor."""
+        now = time.time()
+        with self.lock:
+            return {
+                slot.key_id: dict(slot.usage, in_flight=slot.in_flight,
+                                  quarantine={model: round(slot.quarantine_remaining(model, now), 1)
+                                              for model in slot.quarantined_until
+                                              if slot.quarantine_remaining(model, now) > 0})
+                for slot in self.slots
+            }
+
+
+def configured_keys(kind):
+    """Distinct keys for a provider kind, plural env var first."""
+    provider_cls = llm_providers.PROVIDERS[kind]
+    raw = os.environ.get(POOL_ENV[kind], "") if kind in POOL_ENV else ""
+    keys = [k.strip() for k in raw.split(",") if k.strip()]
+    single = os.environ.get(provider_cls.key_env) if provider_cls.key_env else None
+    if single and single.strip() not in keys:
+        keys.append(single.strip())
+    return keys
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(kind):
+    """Shared credential pool for a provider kind."""
+    with _POOLS_LOCK:
+        if kind not in _POOLS:
+            if kind not in llm_providers.PROVIDERS:
+                raise ValueError(f"Unknown LLM provider: {kind}")
+            _POOLS[kind] = CredentialPool(kind)
+        return _POOLS[kind]
+
+
+def reset_pools():
+    """Drops every pool (fresh keys, quarantines and counters), e.g. between benchmark runs."""
+    with _POOLS_LOCK:
+        _POOLS.clear()
+
+
+def usage_snapshot():
+    """Per-key usage across every pool created in this process."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+    snapshot = {}
+    for pool in pools:
+        snapshot.update(pool.snapshot())
+    return snapshot
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    for kind in llm_providers.PROVIDERS:
+        pool = get_pool(kind)
+        print(f"🔑 {kind}: {len(pool.slots)} key(s)")
+        for slot in pool.slots:
+            print(f"   {slot.label}{'' if slot.provider.available else ' (unavailable)'}")
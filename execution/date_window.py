@@ -0,0 +1,202 @@
+"""
+Date Window - Publication date parsing for the 5-month backfill
+Parses article dates from URL paths, sitemap <lastmod> values,
+listing-page timestamps and article text, and decides whether they fall
+inside the window.
+Partial dates (year or year/month only) resolve to the LATEST day they could
+mean, so an in-window article is never dropped for being imprecise.
+"""
+import calendar
+import re
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+# Required historical backfill (MASTER_INSTRUCTIONS: 5-month backfill)
+BACKFILL_MONTHS = 5
+
+# Overlap applied to incremental (post-backfill) runs so late-published
+# articles near the previous run are still picked up.
+INCREMENTAL_OVERLAP_DAYS = 2
+
+# /2024/12/15/  /2024/8/12/  /2024/10/  /2024-12-15-slug  /2025/
+URL_DATE_PATTERNS = [
+    re.compile(r"/(20\d{2})[/-](\d{1,2})[/-](\d{1,2})(?=[/-]|$)"),
+    re.compile(r"/(20\d{2})[/-](\d{1,2})(?=/|$)"),
+    re.compile(r"/(20\d{2})(?=/|$)"),
+]
+
+MONTH_DAY_YEAR = re.compile(r"([A-Z][a-z]{2,8})\.?\s+(\d{1,2}),?\s+(\d{4})")
+
+# Article text: dates are looked for in the header (byline / metadata) only
+CONTENT_DATE_CHARS = 3000
+MIN_CONTENT_YEAR = 2000
+_TEXT_DATE = r"(?:[A-Z][a-z]{2,8}\.?\s+\d{1,2},?\s+\d{4}|20\d{2}-\d{2}-\d{2}(?:T[\d:.]+(?:Z|[+-]\d{2}:?\d{2})?)?)"
+# "Published: Jan 12, 2024", "Posted on 2024-01-12", "Updated March 4, 2025 at 9:00"
+LABELLED_DATE = re.compile(r"(?i:\b(?:published|posted|updated|date)\b(?:\s+on)?)[:\s-]+(" + _TEXT_DATE + ")")
+TEXT_DATE = re.compile(r"\b" + _TEXT_DATE)
+
+
+def subtract_months(day, months):
+    """Returns the same day-of-month `months` earlier (clamped to month end)."""
+    month_index = day.year * 12 + (day.month - 1) - months
+    year, month = divmod(month_index, 12)
+    month += 1
+    last_day = calendar.monthrange(year, month)[1]
+    return date(year, month, min(day.day, last_day))
+
+
+def get_backfill_cutoff(today=None, months=BACKFILL_MONTHS):
+    """Oldest publication date that still belongs to the backfill window."""
+    today = today or date.today()
+    return subtract_months(today, months)
+
+
+def cutoff_from_ms(ts_ms, overlap_days=INCREMENTAL_OVERLAP_DAYS):
+    """Cutoff for an incremental run: the last run time minus a small overlap."""
+    last_run = datetime.fromtimestamp(ts_ms / 1000.0, tz=timezone.utc).date()
+    return last_run - timedelta(days=overlap_days)
+
+
+def date_to_ms(day):
+    """Epoch milliseconds (UTC midnight) for a date, as stored in InstantDB."""
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def ms_to_date(ts_ms):
+    """Inverse of date_to_ms."""
+    return datetime.fromtimestamp(ts_ms / 1000.0, tz=timezone.utc).date()
+
+
+def _latest_date(year, month=None, day=None):
+    """Builds a date, filling missing parts with the latest possible value."""
+    try:
+        year = int(year)
+        month = int(month) if month else 12
+        if not 1 <= month <= 12:
+            return None
+        last_day = calendar.monthrange(year, month)[1]
+        day = int(day) if day else last_day
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def parse_url_date(url):
+    """Parses a publication date from a URL path (None if the URL has no date)."""
+    if not url:
+        return None
+    path = url.split("?", 1)[0].split("#", 1)[0]
+    for pattern in URL_DATE_PATTERNS:
+        match = pattern.search(path)
+        if match:
+            parsed = _latest_date(*match.groups())
+            if parsed:
+                return parsed
+    return None
+
+
+def parse_timestamp(value):
+    """
+    Parses a sitemap <lastmod>, <time datetime=...> or visible listing date.
+    Accepts ISO 8601, RFC 822 (RSS) and "Month DD, YYYY". Returns a date or None.
+    """
+    if not value:
+        return None
+    value = value.strip()
+
+    # ISO 8601 (2025-03-04, 2025-03-04T10:00:00Z, 2025-03-04T10:00:00+00:00)
+    iso = value.replace("Z", "+00:00") if value.endswith("Z") else value
+    try:
+        return datetime.fromisoformat(iso).date()
+    except ValueError:
+        pass
+
+    match = re.match(r"(\d{4})-(\d{2})-(\d{2})", value)
+    if match:
+        return _latest_date(*match.groups())
+
+    # RFC 822 (RSS pubDate)
+    try:
+        return parsedate_to_datetime(value).date()
+    except (TypeError, ValueError):
+        pass
+
+    # "March 4, 2025" / "Sept. 12, 2024"
+    match = MONTH_DAY_YEAR.search(value)
+    if match:
+        month_name, day, year = match.groups()
+        try:
+            return datetime.strptime(f"{month_name[:3]} {day} {year}", "%b %d %Y").date()
+        except ValueError:
+            pass
+
+    return None
+
+
+def _plausible(day, today):
+    return day is not None and MIN_CONTENT_YEAR <= day.year and day <= today + timedelta(days=1)
+
+
+def find_content_date(text, url=None, today=None):
+    """
+    Publication date of a fetched article, without an LLM. Returns (date, how):
+    how is "url" (full date in the URL path), "label" (a Published/Posted/
+    Updated date in the header), "text" (first date in the header, least
+    reliable), or (None, None). Future and pre-MIN_CONTENT_YEAR dates are skipped.
+    """
+    today = today or date.today()
+    path = url.split("?", 1)[0] if url else ""
+    if URL_DATE_PATTERNS[0].search(path):
+        url_date = parse_url_date(url)
+        if _plausible(url_date, today):
+            return url_date, "url"
+
+    header = (text or "")[:CONTENT_DATE_CHARS]
+    for pattern, how in ((LABELLED_DATE, "label"), (TEXT_DATE, "text")):
+        for match in pattern.finditer(header):
+            parsed = parse_timestamp(match.group(match.lastindex or 0))
+            if _plausible(parsed, today):
+                return parsed, how
+    return None, None
+
+
+def local_article_date(content, url):
+    """(YYYY-MM-DD, how) from find_content_date, or (None, None)."""
+    found, how = find_content_date(content, url)
+    return (found.isoformat(), how) if found else (None, None)
+
+
+def article_date_fields(local_date, model_date=None):
+    """
+    article_date and where it came from. A URL or labelled byline date beats
+    the model's; the model's beats a bare date found in the header.
+    """
+    local, how = local_date
+    if local and how != "text":
+        chosen, source = local, how
+    elif model_date:
+        chosen, source = model_date, "llm"
+    elif local:
+        chosen, source = local, how
+    else:
+        return {}
+    return {"article_date": chosen, "article_date_source": source}
+
+
+def resolve_article_date(url, hint=None):
+    """
+    Best known publication date for a candidate article.
+    A full URL date wins (it is the publish date); otherwise the listing/lastmod
+    hint; otherwise a partial URL date.
+    """
+    url_date = parse_url_date(url)
+    if url_date and URL_DATE_PATTERNS[0].search(url.split("?", 1)[0]):
+        return url_date
+    if hint:
+        return hint
+    return url_date
+
+
+def is_in_window(article_date, cutoff):
+    """True if the date is known and on/after the cutoff."""
+    return article_date is not None and article_date >= cutoff
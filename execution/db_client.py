@@ -159,6 +159,193 @@ def get_unprocessed_signals(limit=10):
     # Return limited batch
     return unprocessed[:limit]
 
+# Signal lease lifecycle: PENDING -> IN_PROGRESS (owner + expiry) -> processed.
+# An IN_PROGRESS lease past its expiry is claimable again (crashed worker).
+# A failed attempt goes back to PENDING with next_retry_at (exponential
+# backoff); after MAX_ATTEMPTS it is parked as DEAD_LETTER until replayed.
+# Quota outages are not attempts: release_signals(next_retry_at=...) only.
+LEASE_SECONDS = 600
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 6 * 3600
+
+def is_claimable(signal, now_ts=None):
+    """
+    True if a raw signal can be claimed: not processed, and either PENDING
+    (or legacy rows without status) and due for retry, or holding an expired lease.
+    """
+    if signal.get("processed") is True:
+        return False
+    now_ts = now_ts or int(time.time() * 1000)
+    status = signal.get("status")
+    if status in (None, "PENDING"):
+        return (signal.get("next_retry_at") or 0) <= now_ts
+    if status == "IN_PROGRESS":
+        return (signal.get("lease_expires_at") or 0) < now_ts
+    return False
+
+def get_signals_by_id(signal_ids):
+    """
+    Fetches raw_signals rows by id.
+    """
+    ids = set(signal_ids)
+    if not ids:
+        return []
+    query = {"raw_signals": {"$": {"where": {"id": {"$in": list(ids)}}}}}
+    data = query_db(query)
+    if not data or "raw_signals" not in data:
+        return []
+    # Filter again in case the where clause was ignored
+    return [s for s in data["raw_signals"] if s.get("id") in ids]
+
+def claim_signals(owner, limit=10, lease_seconds=LEASE_SECONDS, eligible=None, order=None):
+    """
+    Claims up to `limit` claimable raw_signals for `owner`.
+    Candidates are leased in ONE transaction with a fresh lease token, then
+    read back: only rows still carrying our token are returned. This is
+    best-effort, duplicates are possible: InstantDB has no conditional write,
+    so if worker A writes and reads back before worker B's write lands, both
+    see their own token. Holders re-check the token (holds_lease) right before
+    writing results and renew it (renew_leases) during long quota waits, which
+    narrows the window. `eligible` is an optional filter callable.
+    `order(candidates, limit)` optionally picks which claimable rows to take
+    (e.g. queue_priority.select); otherwise the first `limit` in DB order.
+    Returns a list of signal dicts (status IN_PROGRESS), in the chosen order.
+    """
+    import uuid
+
+    data = query_db({"raw_signals": {}})
+    if not data or "raw_signals" not in data:
+        return []
+
+    now_ts = int(time.time() * 1000)
+    candidates = []
+    for s in data["raw_signals"]:
+        if not s.get("id") or not is_claimable(s, now_ts):
+            continue
+        if eligible is not None and not eligible(s):
+            continue
+        candidates.append(s)
+        if order is None and len(candidates) >= limit:
+            break
+
+    if order is not None:
+        candidates = order(candidates, limit)
+    if not candidates:
+        return []
+    recovered = sum(1 for s in candidates if s.get("status") == "IN_PROGRESS")
+
+    token = str(uuid.uuid4())
+    lease = {
+        "status": "IN_PROGRESS",
+        "lease_owner": owner,
+        "lease_token": token,
+        "lease_expires_at": now_ts + lease_seconds * 1000,
+        "claimed_at": now_ts
+    }
+    steps = [["update", "raw_signals", s["id"], lease] for s in candidates]
+    if transact_db(steps) is None:
+        return []
+
+    rank = {s["id"]: i for i, s in enumerate(candidates)}
+    claimed = [s for s in get_signals_by_id(list(rank)) if s.get("lease_token") == token]
+    claimed.sort(key=lambda s: rank[s["id"]])
+    if recovered:
+        print(f"[DB] Recovered {recovered} abandoned lease(s)")
+    return claimed
+
+def holds_lease(signal_id, token):
+    """
+    True if the signal is unprocessed and still carries lease `token`
+    (no other worker re-claimed it after the lease expired).
+    """
+    rows = get_signals_by_id([signal_id])
+    return bool(rows) and rows[0].get("lease_token") == token and rows[0].get("processed") is not True
+
+def renew_leases(signal_ids, lease_seconds=LEASE_SECONDS):
+    """
+    Pushes the lease expiry of signals still being worked on lease_seconds out.
+    """
+    payload = {"lease_expires_at": int(time.time() * 1000) + lease_seconds * 1000}
+    steps = [["update", "raw_signals", signal_id, payload] for signal_id in signal_ids]
+    if not steps:
+        return None
+    return transact_db(steps)
+
+def release_signals(signal_ids, **updates):
+    """
+    Returns leased signals to PENDING (e.g. every engine was busy), clearing the lease.
+    """
+    payload = {"status": "PENDING", "lease_owner": None, "lease_token": None, "lease_expires_at": None}
+    if updates:
+        payload.update(updates)
+    steps = [["update", "raw_signals", signal_id, payload] for signal_id in signal_ids]
+    if not steps:
+        return None
+    return transact_db(steps)
+
+def retry_delay_seconds(attempts):
+    """Backoff before attempt `attempts + 1`: 1m, 2m, 4m, ... capped at RETRY_MAX_SECONDS."""
+    return min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1))
+
+def record_signal_failure(signal, reason, max_attempts=MAX_ATTEMPTS):
+    """
+    Records a failed enrichment attempt on a leased signal (dict with id and
+    its current `attempts`). Schedules a retry with exponential backoff, or
+    parks the signal as DEAD_LETTER once it has failed max_attempts times.
+    Returns the new status.
+    """
+    attempts = (signal.get("attempts") or 0) + 1
+    now_ts = int(time.time() * 1000)
+    payload = {
+        "attempts": attempts,
+        "last_error": str(reason)[:500],
+        "last_attempt_at": now_ts,
+        "lease_owner": None,
+        "lease_token": None,
+        "lease_expires_at": None
+    }
+    if attempts >= max_attempts:
+        payload.update({"status": "DEAD_LETTER", "next_retry_at": None, "dead_lettered_at": now_ts})
+    else:
+        payload.update({"status": "PENDING", "next_retry_at": now_ts + retry_delay_seconds(attempts) * 1000})
+
+    steps = [
+        [
+            "update", "raw_signals", signal["id"], payload
+        ]
+    ]
+    transact_db(steps)
+    return payload["status"]
+
+def get_dead_letter_signals():
+    """
+    Fetches raw_signals parked as DEAD_LETTER.
+    """
+    data = query_db({"raw_signals": {}})
+    if not data or "raw_signals" not in data:
+        return []
+    return [s for s in data["raw_signals"] if s.get("status") == "DEAD_LETTER"]
+
+def replay_signals(signal_ids):
+    """
+    Puts signals back in the queue with a fresh attempt budget.
+    """
+    payload = {"status": "PENDING", "attempts": 0, "next_retry_at": None, "dead_lettered_at": None}
+    steps = [["update", "raw_signals", signal_id, payload] for signal_id in signal_ids]
+    if not steps:
+        return None
+    return transact_db(steps)
+
+def update_signals(updates):
+    """
+    Applies {signal_id: fields} to raw_signals in one transaction.
+    """
+    steps = [["update", "raw_signals", signal_id, fields] for signal_id, fields in updates.items()]
+    if not steps:
+        return None
+    return transact_db(steps)
+
 def get_projects_without_coordinates(limit=10):
     """
     Fetches a batch of projects that are missing coordinates.
@@ -248,9 +435,10 @@ def link_project_signal(project_id, signal_id):
 
 def mark_signal_processed(signal_id, **updates):
     """
-    Updates raw_signals row to processed=True and applies specific updates.
+    Updates raw_signals row to processed=True (status PROCESSED, lease cleared)
+    and applies specific updates.
     """
-    payload = {"processed": True}
+    payload = {"processed": True, "status": "PROCESSED", "lease_owner": None, "lease_token": None, "lease_expires_at": None}
     if updates:
         payload.update(updates)
         
@@ -288,12 +476,12 @@ def check_source_exists(url):
     if not data or "sources" not in data:
         return False
         
-    # normalization: strip slash?
-    normalized_url = url.rstrip("/")
+    # normalization: canonical URL key (scheme, www, tracking params, trailing slash)
+    import url_canon
+    target_key = url_canon.url_key(url)
     
     for s in data["sources"]:
-        s_url = s.get("url", "").rstrip("/")
-        if s_url == normalized_url:
+        if url_canon.url_key(s.get("url", "")) == target_key:
             return True
             
     return False
@@ -303,12 +491,29 @@ def add_source(url):
     Adds a new source to the sources table.
     """
     import uuid
+    import url_canon
     source_id = str(uuid.uuid4())
     
     steps = [
         [
             "update", "sources", source_id, 
-            {"url": url, "last_crawled": None}
+            {"url": url_canon.canonicalize_url(url) or url, "last_crawled": None}
+        ]
+    ]
+    return transact_db(steps)
+
+def update_source_cursor(source_id, cursor, **updates):
+    """
+    Persists the dredge cursor for a source (Ralph rule: save after every item).
+    Extra keyword updates (e.g. last_dredged) are written in the same step.
+    """
+    payload = {"dredge_cursor": cursor}
+    if updates:
+        payload.update(updates)
+
+    steps = [
+        [
+            "update", "sources", source_id, payload
         ]
     ]
     return transact_db(steps)
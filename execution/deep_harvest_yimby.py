@@ -1,7 +1,9 @@
 """
 OPERATION DEEP DREDGE - Florida YIMBY Archive Harvester
 Scrapes historical pages from floridayimby.com's archive.
-Filters for 2024/2025 articles, deduplicates, and saves full content.
+Pages back only until the listing crosses the 5-month backfill cutoff,
+deduplicates, and saves full content.
+Selectors come from the "yimby" entry in site_adapters.py.
 """
 import time
 import re
@@ -9,10 +11,16 @@ import requests
 from bs4 import BeautifulSoup
 from db_client import query_db, transact_db
 import uuid
+import date_window
+import near_dup
+import url_canon
+import triage
+import site_adapters
 
 # Configuration
-BASE_URL = "https://floridayimby.com/page/{}"
-MAX_PAGES = 20
+SITE_URL = "https://floridayimby.com"
+ADAPTER = site_adapters.get_adapter(site_adapters.resolve_adapter_name(SITE_URL))
+MAX_PAGES = 200  # safety cap; paging stops at the backfill cutoff
 MIN_CONTENT_LENGTH = 500
 FETCH_DELAY = 2  # seconds between article fetches
 
@@ -22,46 +30,57 @@ HEADERS = {
 }
 
 
+# Near-duplicate index over recent signals (built by get_existing_urls)
+DUP_INDEX = None
+
+
 def get_existing_urls():
-    """Fetches all existing URLs in raw_signals for deduplication."""
+    """
+    Fetches all existing URLs in raw_signals for deduplication.
+    Also builds the near-duplicate content index (DUP_INDEX) from the same rows.
+    """
+    global DUP_INDEX
     query = {"raw_signals": {}}
     data = query_db(query)
     
     if not data or "raw_signals" not in data:
+        DUP_INDEX = near_dup.NearDupIndex()
         return set()
     
     urls = set()
     for signal in data["raw_signals"]:
         url = signal.get("url", "")
         if url:
-            urls.add(url.rstrip("/"))
+            urls.add(url_canon.url_key(url))
+    
+    DUP_INDEX = near_dup.build_index(data["raw_signals"])
     
     print(f"📊 Loaded {len(urls)} existing URLs for deduplication")
+    print(f"📊 Indexed {len(DUP_INDEX)} recent signals for near-duplicate detection")
     return urls
 
 
-def is_valid_year(url):
-    """Checks if URL contains /2024/, /2025/, or /2026/ (recent articles only)."""
-    return "/2024/" in url or "/2025/" in url or "/2026/" in url
+def listing_date(a_tag):
+    """Reads the adapter's date element (<time class="entry-date">) for a listing entry."""
+    article = a_tag.find_parent("article")
+    time_tag = article.select_one(ADAPTER["dates"]) if article else None
+    if time_tag is None:
+        return None
+    return date_window.parse_timestamp(time_tag.get("datetime") or time_tag.get_text(strip=True))
 
 
 def extract_article_links(page_html):
-    """Extracts article links from a page listing."""
+    """Extracts article links from a page listing as [(url, listing_date, title)]."""
     soup = BeautifulSoup(page_html, "html.parser")
     links = []
+    seen = set()
     
-    # Primary selector: h2 > a
-    for h2 in soup.select("h2.entry-title a"):
-        href = h2.get("href")
-        if href:
-            links.append(href)
-    
-    # Fallback: article header links
-    if not links:
-        for article in soup.select("article a[rel='bookmark']"):
-            href = article.get("href")
-            if href and href not in links:
-                links.append(href)
+    # Adapter listing selector (h2.entry-title a, article a[rel='bookmark'])
+    for a_tag in soup.select(ADAPTER["listing_links"]):
+        href = a_tag.get("href")
+        if href and href not in seen:
+            seen.add(href)
+            links.append((href, listing_date(a_tag), a_tag.get_text(" ", strip=True)))
     
     return links
 
@@ -81,8 +100,8 @@ def extract_article_content(html):
     """Extracts the main article content from an article page."""
     soup = BeautifulSoup(html, "html.parser")
     
-    # Try entry-content first
-    content_div = soup.select_one("div.entry-content")
+    # Adapter content selector first
+    content_div = soup.select_one(ADAPTER["content"])
     if not content_div:
         # Fallback to article tag
         content_div = soup.select_one("article")
@@ -99,26 +118,43 @@ def extract_article_content(html):
     return text
 
 
-def save_signal(url, content, source="floridayimby.com"):
-    """Saves a new raw signal to the database."""
+def save_signal(url, content, source="floridayimby.com", triage_score=None):
+    """
+    Saves a new raw signal to the database.
+    Near-duplicates of a recent signal are saved pre-processed with duplicate_of.
+    """
     signal_id = str(uuid.uuid4())
     now_ts = int(time.time() * 1000)
     
+    payload = {
+        "url": url,
+        "content": content,
+        "source": source,
+        "processed": False,
+        "created_at": now_ts,
+        "harvest_mode": "backfill"
+    }
+    if triage_score is not None:
+        payload["triage_score"] = round(triage_score, 3)
+    
+    dup_fields, signature = near_dup.check_duplicate(DUP_INDEX, content)
+    payload.update(dup_fields)
+    
     tx_steps = [
         [
-            "update", "raw_signals", signal_id,
-            {
-                "url": url,
-                "content": content,
-                "source": source,
-                "processed": False,
-                "created_at": now_ts
-            }
+            "update", "raw_signals", signal_id, payload
         ]
     ]
     
     result = transact_db(tx_steps)
-    return result is not None
+    if result is None:
+        return False
+    
+    if dup_fields:
+        print(f"   🪞 Near-duplicate of {dup_fields['duplicate_of'][:8]} ({dup_fields['duplicate_score']:.0%} similar), skipping enrichment")
+    elif signature is not None:
+        DUP_INDEX.add(signal_id, signature)
+    return True
 
 
 def run_deep_harvest():
@@ -126,16 +162,22 @@ def run_deep_harvest():
     print("🚀 OPERATION DEEP DREDGE - Florida YIMBY Archive Harvester")
     print("=" * 60)
     
+    cutoff = date_window.get_backfill_cutoff()
+    print(f"📅 Backfill window: articles since {cutoff.isoformat()}")
+    
     # Load existing URLs for deduplication
     existing_urls = get_existing_urls()
     
     total_new = 0
     total_skipped = 0
     total_old_year = 0
+    total_triaged = 0
+    
+    page_pattern = ADAPTER["pagination"][0]
     
     for page_num in range(1, MAX_PAGES + 1):
-        page_url = BASE_URL.format(page_num)
-        print(f"\n📄 Processing Page {page_num}/{MAX_PAGES}: {page_url}")
+        page_url = page_pattern.format(base=SITE_URL, n=page_num)
+        print(f"\n📄 Processing Page {page_num}: {page_url}")
         
         page_html = fetch_page(page_url)
         if not page_html:
@@ -145,18 +187,35 @@ def run_deep_harvest():
         article_links = extract_article_links(page_html)
         print(f"   Found {len(article_links)} article links")
         
+        if not article_links:
+            print("   🛑 Empty listing page, end of archive")
+            break
+        
         page_new = 0
+        page_dates = []
         
-        for article_url in article_links:
-            normalized_url = article_url.rstrip("/")
+        for article_url, hint, title in article_links:
+            normalized_url = url_canon.canonicalize_url(article_url, base_url=SITE_URL)
+            if not normalized_url:
+                continue
             
-            # Filter by year
-            if not is_valid_year(normalized_url):
+            # Filter by backfill window
+            article_date = date_window.resolve_article_date(normalized_url, hint)
+            if article_date:
+                page_dates.append(article_date)
+            if not date_window.is_in_window(article_date, cutoff):
                 total_old_year += 1
                 continue
             
+            # Triage on slug + listing title before spending a fetch
+            keep, triage_score = triage.should_fetch(normalized_url, title)
+            if not keep:
+                total_triaged += 1
+                print(f"   ✂️ Triage skip ({triage_score:.2f}): {normalized_url[:60]}...")
+                continue
+            
             # Deduplicate
-            if normalized_url in existing_urls:
+            if url_canon.url_key(normalized_url) in existing_urls:
                 total_skipped += 1
                 print(f"   ⏭️ Skipping (exists): {normalized_url[:60]}...")
                 continue
@@ -178,9 +237,17 @@ def run_deep_harvest():
             if len(content) < MIN_CONTENT_LENGTH:
                 print(f"   ⚠️ Warning: Short content found ({len(content)} chars). Check selectors.")
             
+            # Save under the page's rel=canonical URL
+            canonical_url = url_canon.canonical_from_html(article_html, normalized_url, page_url)
+            if url_canon.url_key(canonical_url) in existing_urls:
+                total_skipped += 1
+                print(f"   ⏭️ Skipping (canonical exists): {canonical_url[:60]}...")
+                continue
+            
             # Save to database
-            if save_signal(normalized_url, content, "floridayimby.com"):
-                existing_urls.add(normalized_url)  # Add to local cache
+            if save_signal(canonical_url, content, "floridayimby.com", triage_score=triage_score):
+                existing_urls.add(url_canon.url_key(normalized_url))  # Add to local cache
+                existing_urls.add(url_canon.url_key(canonical_url))
                 total_new += 1
                 page_new += 1
                 print(f"   ✅ Saved ({len(content)} chars)")
@@ -192,6 +259,11 @@ def run_deep_harvest():
         
         print(f"   📊 Page {page_num} summary: {page_new} new articles saved")
         
+        # The archive is newest-first: once a whole page is older, we're done
+        if page_dates and max(page_dates) < cutoff:
+            print(f"   🛑 Crossed backfill cutoff ({cutoff.isoformat()}), stopping")
+            break
+        
         # Small delay between pages too
         time.sleep(1)
     
@@ -200,7 +272,8 @@ def run_deep_harvest():
     print("🏁 OPERATION DEEP DREDGE COMPLETE")
     print(f"   ✅ New articles saved: {total_new}")
     print(f"   ⏭️ Duplicates skipped: {total_skipped}")
-    print(f"   📅 Old articles filtered (not 2024/2025): {total_old_year}")
+    print(f"   ✂️ Skipped by slug/title triage: {total_triaged}")
+    print(f"   📅 Articles outside window (before {cutoff.isoformat()}): {total_old_year}")
     print("=" * 60)
     print("\n💡 Next step: Run `python3 execution/swarm_pipeline.py` to enrich the new signals!")
 
@@ -0,0 +1,124 @@
+"""
+Engine Router - Health-aware ordering of the enrichment engines
+The old swarm always walked ENGINES in fixed order, so while llama-3.3-70b was
+rate-limited every signal first burned a failed call on it. The router keeps,
+per engine:
+- rolling latency (EWMA of successful calls)
+- 429 rate over the last WINDOW outcomes
+- cooldown_until, set from Retry-After on a 429 (exponential backoff without one)
+and routes around engines that are cooling down, throttled or slow, so
+traffic spreads over whatever currently has headroom. Preference order
+(quality) still decides between healthy engines.
+"""
+import threading
+import time
+from collections import deque
+
+WINDOW = 20               # outcomes kept for the 429 rate
+DEGRADED_429_RATE = 0.3   # above this an engine drops behind healthy ones
+SLOW_LATENCY = 20.0       # seconds (EWMA) above which an engine drops behind healthy ones
+LATENCY_ALPHA = 0.2
+
+BACKOFF_BASE = 5.0        # seconds, doubled per consecutive 429 without Retry-After
+BACKOFF_MAX = 300.0
+NOT_FOUND_COOLDOWN = 3600.0
+ERROR_STREAK_COOLDOWN = 30.0
+ERROR_STREAK = 3          # consecutive non-429 errors before a short cooldown
+
+
+class EngineHealth:
+    """Rolling health of one engine. Not thread-safe on its own (the router locks)."""
+
+    def __init__(self):
+        self.latency = None
+        self.outcomes = deque(maxlen=WINDOW)  # True = 429
+        self.cooldown_until = 0.0
+        self.consecutive_429 = 0
+        self.consecutive_errors = 0
+        self.calls = 0
+
+    @property
+    def rate_429(self):
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def degraded(self):
+        return self.rate_429 >= DEGRADED_429_RATE or (self.latency or 0.0) >= SLOW_LATENCY
+
+
+class EngineRouter:
+    def __init__(self):
+        self.health = {}
+        self.lock = threading.Lock()
+
+    def _get(self, name):
+        health = self.health.get(name)
+        if health is None:
+            health = self.health[name] = EngineHealth()
+        return health
+
+    def cooldown_remaining(self, name, now=None):
+        with self.lock:
+            return max(0.0, self._get(name).cooldown_until - (now or time.time()))
+
+    def rank(self, engines):
+        """
+        Engines not cooling down, healthy before degraded, preference order
+        within each group. Returns (ranked, cooling) lists.
+        """
+        now = time.time()
+        with self.lock:
+            cooling = [e for e in engines if self._get(e["name"]).cooldown_until > now]
+            ready = [e for e in engines if e not in cooling]
+            ranked = sorted(ready, key=lambda e: self._get(e["name"]).degraded())  # stable: keeps preference
+        return ranked, cooling
+
+    def record_success(self, name, latency):
+        with self.lock:
+            health = self._get(name)
+            health.calls += 1
+            health.outcomes.append(False)
+            health.consecutive_429 = 0
+            health.consecutive_errors = 0
+            health.latency = latency if health.latency is None else (
+                LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * health.latency)
+
+    def record_rate_limit(self, name, retry_after=None):
+        """429: cool down for Retry-After, else exponential backoff. Returns the cooldown in seconds."""
+        with self.lock:
+            health = self._get(name)
+            health.calls += 1
+            health.outcomes.append(True)
+            health.consecutive_429 += 1
+            if retry_after is None:
+                retry_after = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (health.consecutive_429 - 1))
+            health.cooldown_until = max(health.cooldown_until, time.time() + retry_after)
+            return retry_after
+
+    def record_error(self, name, not_found=False):
+        with self.lock:
+            health = self._get(name)
+            health.calls += 1
+            health.outcomes.append(False)
+            health.consecutive_errors += 1
+            if not_found:
+                health.cooldown_until = time.time() + NOT_FOUND_COOLDOWN
+            elif health.consecutive_errors >= ERROR_STREAK:
+                health.cooldown_until = time.time() + ERROR_STREAK_COOLDOWN
+                health.consecutive_errors = 0
+
+    def snapshot(self):
+        """{engine: {latency, rate_429, cooldown, calls}} for logging and the monitor."""
+        now = time.time()
+        with self.lock:
+            return {
+                name: {
+                    "latency": round(h.latency, 2) if h.latency is not None else None,
+                    "rate_429": round(h.rate_429, 2),
+                    "cooldown": round(max(0.0, h.cooldown_until - now), 1),
+                    "calls": h.calls,
+                }
+                for name, h in self.health.items()
+            }
+
+
+ROUTER = EngineRouter()
@@ -0,0 +1,1019 @@
+"""
+Enrichment Engine - The one Brain loop behind every enricher script
+Replaces five divergent enrichers (enricher.py, mass_enricher.py,
+universal_pipeline.py, swarm_pipeline.py, batch_enricher.py) with:
+- one versioned extraction prompt/schema (SCHEMA_VERSION)
+- one engine roster over pluggable providers (llm_providers.py)
+- concurrent in-flight requests paced by per-model RPM/TPM token buckets
+  (rate_limiter.py) instead of fixed sleeps
+- a pool of API keys per provider (credential_pool.py), least-loaded first
+- health-aware routing (engine_router.py): engines cooling down after a 429
+  (Retry-After) are skipped, slow or throttled ones drop behind healthy ones
+- configurable concurrency and content limits (env vars below)
+- leased claims (db_client.claim_signals), best effort: InstantDB has no
+  compare-and-set, so leases make collisions between parallel workers rare
+  and the lease is re-checked right before each write (a lost lease skips
+  the write), which narrows the race window without closing it; a crashed
+  worker's signals come back after LEASE_SECONDS
+- retries with exponential backoff and a dead-letter state instead of
+  dropping signals on errors (replay with replay_signals.py)
+- an on-disk response cache (llm_cache.py) so identical inputs cost no calls
+- a local relevance pre-filter (relevance_filter.py) that rejects clear negatives
+- per-model token budgets: articles are condensed (condense.py), not truncated
+- multi-document requests: short articles share one call, results keyed by signal id
+- a two-tier cascade: llama-3.1-8b-instant triages, the large models extract
+- token/cost accounting per engine, model, key and source (usage_ledger.py)
+- typed validation/coercion of every result before it is written (extraction_schema.py)
+- article_date in the same pass: a local heuristic (URL / byline date) first,
+  the model's date otherwise, so no second LLM pass is needed for dates
+- priority-ordered claims: fresh, high-yield, likely-relevant signals first,
+  with a reserved share for backfill (queue_priority.py)
+- streamed completions: an irrelevant verdict stops the stream at its first
+  tokens, and each multi-document result is written as soon as it closes
+
+Configuration (environment):
+    ENRICH_ENGINES        comma list of engine names, in preference order
+    ENRICH_CONCURRENCY    in-flight signals per worker (default 8)
+    ENRICH_RATE_LIMITS    per-model quota overrides (see rate_limiter.py)
+    ENRICH_MAX_WAIT       max seconds to wait for quota before giving up (default 60)
+    ENRICH_MAX_CHARS      article characters considered for condensation (default 30000)
+    ENRICH_TOKEN_BUDGET   article tokens for models without a budget (see condense.py)
+    ENRICH_BATCH_SIZE     signals fetched per cycle (default 20)
+    ENRICH_MULTI_DOC      pack short articles into one request (default 1; 0 disables)
+    ENRICH_MULTI_MAX_DOCS articles per multi-document request (default 5)
+    ENRICH_CASCADE        triage with a fast model before extraction (default 1; 0 disables)
+    ENRICH_TRIAGE_ENGINE  engine used for triage (default groq-llama3-8b)
+    ENRICH_STREAM         stream completions of engines with a "stream" mode (default 1; 0 disables)
+    ENRICH_LIVE_SHARE / ENRICH_LIVE_DAYS        live vs backfill split (see queue_priority.py)
+    ENRICH_WORKER_INDEX / ENRICH_WORKER_COUNT   shard of the queue this worker owns
+"""
+import json
+import logging
+import os
+import re
+import socket
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from dotenv import load_dotenv
+import condense
+import credential_pool
+import date_window
+import db_client
+from engine_router import ROUTER
+import extraction_schema
+from json_extract import ArrayItemStream, extract_json
+import llm_cache
+import llm_providers
+import queue_priority
+import rate_limiter
+import relevance_filter
+from token_count import count_tokens
+import usage_ledger
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+# --- 1. SCHEMA ---
+SCHEMA_VERSION = 2
+
+# Cache namespace: bump SCHEMA_VERSION (or this) whenever EXTRACTION_PROMPT changes
+PROMPT_VERSION = f"extract-v{SCHEMA_VERSION}"
+
+_FILTER_RULES = """STRICT FILTERING RULES:
+- Track ONLY High-Rise Residential, Condo, Multi-Family, Mixed-Use with Residential, or Luxury Hospitality projects.
+- IGNORE Single Family Homes, Retail-only stores (e.g. Amazon Fresh, Target), Industrial, and minor renovations.
+- If irrelevant, the result is {{"relevant": false}}.
+
+STAKEHOLDERS: list every person mentioned as "Name (Role)", e.g. "Jorge Perez (Developer)".
+DATE: the article publication date as "YYYY-MM-DD" (estimate from context if not explicit)."""
+
+_RESULT_SCHEMA = """{{
+  "relevant": true,
+  "name": "Project Name (or address if unnamed)",
+  "address": "Full Address",
+  "city": "City",
+  "developer": "Developer Name",
+  "architect": "Architect Name",
+  "lender": "Lender Name",
+  "sales_team": "Sales/Marketing Firm",
+  "individuals": ["Name (Role)"],
+  "gdv": "Gross development value, e.g. $500M",
+  "units": 0,
+  "floors": 0,
+  "delivery_date": "Expected completion",
+  "unit_mix": [{{"type": "2BR", "count": 0, "price": "$1.2M"}}],
+  "status_stage": "Proposed/Planning/Permitting/Construction/Completed",
+  "signal_type": "e.g. Groundbreaking, Filing, Sales Launch, Financing",
+  "image_url": "Rendering URL if present",
+  "article_date": "YYYY-MM-DD",
+  "description": "2-3 sentence summary."
+}}"""
+
+EXTRACTION_PROMPT = (
+    "You are a Real Estate Intelligence Analyst. Analyze this article from {url}.\n\n"
+    + _FILTER_RULES
+    + "\n\nIf relevant, return this JSON (use null for anything not stated):\n"
+    + _RESULT_SCHEMA
+    + "\n\nReturn ONLY valid JSON.\n\nTEXT:\n{content}\n"
+)
+
+# Several short articles in one request; results come back keyed by signal id
+MULTI_EXTRACTION_PROMPT = (
+    "You are a Real Estate Intelligence Analyst. Analyze each of the {count} articles below independently.\n\n"
+    + _FILTER_RULES
+    + "\n\nA relevant result uses this JSON (use null for anything not stated):\n"
+    + _RESULT_SCHEMA
+    + '\n\nReturn ONLY valid JSON of the form {{"results": [{{"id": "<article id>", ...result fields}}]}}'
+    + " with exactly one result per article id.\n\nARTICLES:\n{articles}\n"
+)
+
+# --- 2. ENGINES ---
+# Preference order; every entry is a (provider kind, model) pair.
+# stream: None (whole response), "json" (streamed, JSON mode kept) or "text"
+# (streamed without JSON mode: results arrive sooner, but the schema rests on
+# the prompt and json_extract). Groq's JSON mode does not stream, so Groq
+# engines stay unstreamed; set "text" to opt one in to that trade-off.
+ENGINES = [
+    {"name": "groq-llama3-70b", "type": "groq", "model": "llama-3.3-70b-versatile", "stream": None},
+    {"name": "groq-llama3-8b", "type": "groq", "model": "llama-3.1-8b-instant", "stream": None},
+    {"name": "gemini-flash-latest", "type": "gemini", "model": "gemini-flash-latest", "stream": "json"},
+    {"name": "gemini-2.0-flash", "type": "gemini", "model": "gemini-2.0-flash", "stream": "json"},
+    {"name": "local", "type": "local", "model": "heuristic", "stream": None},
+]
+
+# The local stand-in is opt-in (ENRICH_ENGINES=local) so it never writes guesses in production
+DEFAULT_ENGINES = "groq-llama3-70b,groq-llama3-8b,gemini-flash-latest,gemini-2.0-flash"
+
+# --- 3. CONFIG ---
+CONCURRENCY = int(os.environ.get("ENRICH_CONCURRENCY", "8"))
+MAX_QUOTA_WAIT = float(os.environ.get("ENRICH_MAX_WAIT", "60"))
+MAX_CONTENT_CHARS = int(os.environ.get("ENRICH_MAX_CHARS", "30000"))
+BATCH_SIZE = int(os.environ.get("ENRICH_BATCH_SIZE", "20"))
+MULTI_DOC = os.environ.get("ENRICH_MULTI_DOC", "1") != "0"
+MULTI_MAX_DOCS = int(os.environ.get("ENRICH_MULTI_MAX_DOCS", "5"))
+MULTI_DOC_MAX_TOKENS = 500   # condensed articles at or under this count as short
+MULTI_GROUP_TOKENS = 2500    # article tokens per multi-document request
+WORKER_INDEX = int(os.environ.get("ENRICH_WORKER_INDEX", "0"))
+WORKER_COUNT = max(1, int(os.environ.get("ENRICH_WORKER_COUNT", "1")))
+# Lease owner recorded on claimed signals
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{WORKER_INDEX}"
+
+MIN_CONTENT_LENGTH = 100
+
+# Failure outcomes -> reason recorded on the signal (retried with backoff, then dead-lettered)
+FAILURE_REASONS = {
+    "failed": "engine errors",
+    "parse_error": "unparseable model response",
+}
+# "busy" (every engine rate-limited / out of quota) is not a failed attempt:
+# the signal is released until the first engine frees up, at least this long
+BUSY_MIN_DELAY = 60
+# Leases are renewed before an engine attempt once this old (quota waits can outlast LEASE_SECONDS)
+LEASE_RENEW_SECONDS = db_client.LEASE_SECONDS / 3
+IDLE_SLEEP = 10        # MASTER_INSTRUCTIONS: if queue is empty, sleep 10s
+FAILURE_COOLDOWN = 30  # all engines failed for a whole batch
+
+STREAM = os.environ.get("ENRICH_STREAM", "1") != "0"
+# A response opening with this is an irrelevant verdict; nothing after it matters
+_IRRELEVANT_PREFIX = re.compile(r'\s*(?:```[a-zA-Z]*\s*)?\{\s*"relevant"\s*:\s*false\b')
+IRRELEVANT_RESPONSE = '{"relevant": false}'
+
+STREAM_STATS = {"streams": 0, "stopped_early": 0, "irrelevant_aborts": 0, "streamed_writes": 0}
+_STREAM_LOCK = threading.Lock()
+
+
+def active_engines():
+    """Engines selected by ENRICH_ENGINES whose provider is configured."""
+    wanted = [n.strip() for n in os.environ.get("ENRICH_ENGINES", DEFAULT_ENGINES).split(",") if n.strip()]
+    by_name = {e["name"]: e for e in ENGINES}
+    engines = []
+    for name in wanted:
+        engine = by_name.get(name)
+        if engine and credential_pool.get_pool(engine["type"]).available:
+            engines.append(engine)
+    return engines
+
+
+def engine_pool(engine):
+    return credential_pool.get_pool(engine["type"])
+
+
+def next_engine(remaining, tokens_for):
+    """
+    Picks the best-ranked engine (engine_router: not cooling down, healthy
+    before degraded, then preference order) with a key that has quota free
+    right now (credential_pool: least-loaded key). If all are saturated,
+    waits on whichever frees up first.
+    Returns (engine, key_slot), or (None, None) if nothing is usable within MAX_QUOTA_WAIT.
+    """
+    ranked, _ = ROUTER.rank(remaining)
+    for engine in ranked:
+        slot = engine_pool(engine).try_acquire(engine["model"], tokens_for(engine))
+        if slot is not None:
+            return engine, slot
+
+    def ready_in(engine):
+        return max(engine_pool(engine).wait_time(engine["model"], tokens_for(engine)),
+                   ROUTER.cooldown_remaining(engine["name"]))
+
+    engine = min(remaining, key=ready_in)
+    cooldown = ROUTER.cooldown_remaining(engine["name"])
+    if ready_in(engine) > MAX_QUOTA_WAIT:
+        return None, None
+    if cooldown > 0:
+        time.sleep(cooldown)
+    slot = engine_pool(engine).acquire(engine["model"], tokens_for(engine), max_wait=MAX_QUOTA_WAIT - cooldown)
+    return (engine, slot) if slot is not None else (None, None)
+
+
+def record_usage(engine, slot, prompt, text, usage, sources):
+    """Books a call's tokens in usage_ledger (estimated when the API reported none)."""
+    estimated = usage is None
+    if estimated:
+        usage = {"prompt_tokens": count_tokens(prompt), "completion_tokens": count_tokens(text)}
+    usage_ledger.record_call(engine["name"], engine["model"], slot.key_id, sources or ["unknown"],
+                             usage["prompt_tokens"], usage["completion_tokens"], estimated=estimated)
+
+
+def count_stream(key, n=1):
+    with _STREAM_LOCK:
+        STREAM_STATS[key] += n
+
+
+def stream_completion(provider, model, prompt, watch, json_mode=True):
+    """
+    Reads a streamed completion, calling watch(text_so_far) after every chunk;
+    stops reading (closing the stream) as soon as it returns True.
+    Returns (text, usage); usage is None when the stream was cut before the API reported it.
+    """
+    usage = {}
+    text = ""
+    chunks = provider.stream(model, prompt, json_mode=json_mode, usage=usage)
+    count_stream("streams")
+    try:
+        for chunk in chunks:
+            text += chunk
+            if watch(text):
+                count_stream("stopped_early")
+                break
+    finally:
+        chunks.close()
+    return text, usage or None
+
+
+class EnginesBusy(Exception):
+    """Every engine was rate-limited or out of quota; none returned a real error."""
+
+
+def engines_ready_in(engines):
+    """Seconds until the first engine has a key out of quarantine and off router cooldown."""
+    waits = [max(engine_pool(e).wait_time(e["model"], 1), ROUTER.cooldown_remaining(e["name"])) for e in engines]
+    return min(waits) if waits else 0.0
+
+
+def generate(prompt, engines=None, completions=1, reserve=rate_limiter.OUTPUT_TOKEN_RESERVE, sources=None,
+             watch=None, renew=None):
+    """
+    Tries engines in order until one succeeds. Returns (text, engine), or
+    (None, None) when engines errored; raises EnginesBusy when every engine
+    was only rate-limited / out of quota.
+    prompt is a string, or a callable engine -> prompt for per-model prompts;
+    completions is how many results the response holds and reserve the
+    completion tokens per result (for the TPM estimate); sources names the
+    source of each article in the prompt, for usage accounting.
+    watch, when STREAM is on and the engine has a "stream" mode, is a
+    callable engine -> (text_so_far -> stop?):
+    the response is streamed and cut short once the watcher has what it needs
+    (a fresh watcher per attempt, so a failover starts from an empty text).
+    renew, if given, is called before every attempt (lease_renewer: quota
+    waits can outlast the signals' lease).
+    """
+    remaining = list(engines if engines is not None else active_engines())
+    prompts = {}
+
+    def prompt_for(engine):
+        if engine["model"] not in prompts:
+            prompts[engine["model"]] = prompt(engine) if callable(prompt) else prompt
+        return prompts[engine["model"]]
+
+    tokens = {}
+
+    def tokens_for(engine):
+        if engine["model"] not in tokens:
+            tokens[engine["model"]] = rate_limiter.estimate_tokens(prompt_for(engine), completions, reserve)
+        return tokens[engine["model"]]
+
+    errored = False
+    while remaining:
+        engine, slot = next_engine(remaining, tokens_for)
+        if engine is None:
+            logging.warning("   ⏳ No engine quota available")
+            break
+        remaining.remove(engine)
+        pool = engine_pool(engine)
+        started = time.monotonic()
+        error = None
+        try:
+            if renew is not None:
+                renew()
+            stream_mode = engine.get("stream") if watch is not None and STREAM else None
+            if stream_mode:
+                text, usage = stream_completion(slot.provider, engine["model"], prompt_for(engine), watch(engine),
+                                                json_mode=stream_mode == "json")
+            else:
+                text, usage = slot.provider.complete(engine["model"], prompt_for(engine))
+        except Exception as e:
+            error = e
+            if not isinstance(e, llm_providers.ProviderError):
+                raise
+        finally:
+            # The key's concurrency slot goes back whatever the attempt raised
+            pool.release(slot, engine["model"], tokens_for(engine), error=error)
+
+        if error is None:
+            ROUTER.record_success(engine["name"], time.monotonic() - started)
+            record_usage(engine, slot, prompt_for(engine), text, usage, sources)
+            return text, engine
+
+        if error.rate_limited:
+            slot.limiter(engine["model"]).penalize()
+            if pool.healthy_keys(engine["model"]):
+                # Only this key is exhausted: retry the same engine on another key
+                remaining.insert(0, engine)
+                logging.warning(f"   ⚠️ Rate Limit ({engine['name']} {slot.key_id}), key quarantined")
+                continue
+            cooldown = ROUTER.record_rate_limit(engine["name"], error.retry_after)
+            logging.warning(f"   ⚠️ Rate Limit ({engine['name']}), cooling down {cooldown:.0f}s")
+        elif error.not_found:
+            errored = True
+            ROUTER.record_error(engine["name"], not_found=True)
+            logging.info(f"   ❌ {engine['name']} not found (404)")
+        else:
+            errored = True
+            ROUTER.record_error(engine["name"])
+            logging.warning(f"   ⚠️ {engine['name']} Error: {error}")
+    if not errored:
+        raise EnginesBusy()
+    return None, None
+
+
+def build_prompt(content, url, model=None):
+    """Renders the versioned extraction prompt with content condensed to the model's budget."""
+    condensed = condense.condense(content[:MAX_CONTENT_CHARS], condense.token_budget(model))
+    return EXTRACTION_PROMPT.format(url=url, content=condensed)
+
+
+def build_project_record(data, signal_id, url):
+    """Maps a validated schema-v2 extraction (extraction_schema.validate) onto the projects table fields."""
+    return {
+        "name": data.get("name") or "Unknown",
+        "address": data.get("address"),
+        "city": data.get("city"),
+        "developer": data.get("developer"),
+        "architect": data.get("architect"),
+        "lender": data.get("lender"),
+        "sales_team": data.get("sales_team"),
+        "key_people": data.get("individuals"),
+        "gdv": data.get("gdv"),
+        "gdv_usd": data.get("gdv_usd"),
+        "units": data.get("units"),
+        "stories": data.get("floors"),
+        "delivery_date": data.get("delivery_date"),
+        "delivery_year": data.get("delivery_year"),
+        "unit_mix": data.get("unit_mix"),
+        "status_stage": data.get("status_stage"),
+        "signal_type": data.get("signal_type"),
+        "image_url": data.get("image_url"),
+        "description": data.get("description"),
+        "source_url": url,
+        "sourceLinks": [url],
+        "source_signal_id": signal_id,
+        "schema_version": SCHEMA_VERSION,
+        "created_at": int(time.time() * 1000)
+    }
+
+
+# --- 4. SOURCES CACHE ---
+SOURCES_MAP = {}
+
+
+def refresh_sources():
+    """Caches source_id -> url so harvester signals (no url field) get a real link."""
+    try:
+        resp = db_client.query_db({"sources": {}}) or {}
+        for s in resp.get("sources", []):
+            SOURCES_MAP[s["id"]] = s.get("url")
+        logging.info(f"   ✅ Cached {len(SOURCES_MAP)} sources.")
+    except Exception as e:
+        logging.error(f"   ⚠️ Failed to cache sources: {e}")
+
+
+def signal_url(signal):
+    """Best URL for a signal: its own url, else its source's url."""
+    return signal.get("url") or SOURCES_MAP.get(signal.get("source_id")) or signal.get("source_url") or "Unknown"
+
+
+def signal_source(signal):
+    """Source label for usage accounting: the source's host, else its id."""
+    url = SOURCES_MAP.get(signal.get("source_id")) or signal.get("url") or signal.get("source_url") or ""
+    host = urlparse(url).netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host or signal.get("source_id") or "unknown"
+
+
+# --- 5. WORK ---
+def owns_signal(signal_id):
+    """
+    Stable shard assignment: WORKER_COUNT workers claim from disjoint shards,
+    so leases rarely collide. Leases themselves are best effort (see
+    db_client.claim_signals); writes re-check them but a race is still possible.
+    """
+    if WORKER_COUNT == 1:
+        return True
+    return zlib.crc32(signal_id.encode("utf-8")) % WORKER_COUNT == WORKER_INDEX
+
+
+def fetch_queue(limit=BATCH_SIZE):
+    """Claims (leases) the `limit` highest-priority unprocessed signals in this worker's shard (queue_priority.py)."""
+    return db_client.claim_signals(WORKER_ID, limit, eligible=lambda s: owns_signal(s["id"]),
+                                   order=lambda candidates, n: queue_priority.select(candidates, n, signal_source))
+
+
+def prepare_signal(signal):
+    """
+    Local stages before any LLM call (empty check, article date heuristic,
+    relevance pre-filter). Returns (outcome, None) when the signal is settled,
+    else (None, job).
+    """
+    signal_id = signal["id"]
+    url = signal_url(signal)
+    content = signal.get("content") or ""
+
+    if len(content) < MIN_CONTENT_LENGTH:
+        db_client.mark_signal_processed(signal_id)
+        logging.info(f"   🗑️ Empty content: {url[:50]}")
+        return "empty", None
+
+    local_date = date_window.local_article_date(content, url)
+    forward, prefilter_score = relevance_filter.should_enrich(content)
+    if not forward:
+        db_client.mark_signal_processed(signal_id, prefilter_rejected=True, prefilter_score=round(prefilter_score, 4),
+                                        **date_window.article_date_fields(local_date))
+        logging.info(f"   🧹 Pre-filter rejected ({prefilter_score:.2f}): {url[:50]}")
+        return "prefiltered", None
+
+    return None, {
+        "signal_id": signal_id,
+        "url": url,
+        "source": signal_source(signal),
+        "content": content[:MAX_CONTENT_CHARS],
+        "prefilter_score": prefilter_score,
+        "local_date": local_date,
+        "lease_token": signal.get("lease_token"),
+        "lease_renewed_at": (signal.get("claimed_at") or time.time() * 1000) / 1000,
+    }
+
+
+def lease_held(job):
+    """Re-checks the claim right before writing: an expired lease may have been re-claimed by another worker."""
+    if not job.get("lease_token") or db_client.holds_lease(job["signal_id"], job["lease_token"]):
+        return True
+    logging.warning(f"   🔒 Lease lost, result not written: {job['url'][:50]}")
+    return False
+
+
+def lease_renewer(jobs):
+    """Callable that renews the jobs' leases once LEASE_RENEW_SECONDS have passed since the last renewal."""
+    def renew():
+        now = time.time()
+        due = [job for job in jobs if job.get("lease_token") and now - job["lease_renewed_at"] >= LEASE_RENEW_SECONDS]
+        if due:
+            db_client.renew_leases([job["signal_id"] for job in due])
+            for job in due:
+                job["lease_renewed_at"] = now
+    return renew
+
+
+def finish_signal(job, data, engine, from_cache=False, batch_size=1):
+    """
+    Validates and writes an extraction result (project + link + signal update).
+    Returns the outcome ("lease_lost" when another worker holds the signal now).
+    """
+    data = extraction_schema.validate(data)
+    if not lease_held(job):
+        return "lease_lost"
+    signal_id = job["signal_id"]
+    url = job["url"]
+    engine_used = engine["name"]
+    updates = {
+        "enrich_engine": engine_used,
+        "schema_version": SCHEMA_VERSION,
+        "llm_relevant": data.get("relevant") is True,
+        "prefilter_score": round(job["prefilter_score"], 4),
+    }
+    if from_cache:
+        updates["enrich_cached"] = True
+        engine_used += " cache"
+    if batch_size > 1:
+        updates["enrich_batch_size"] = batch_size
+        engine_used += f" x{batch_size}"
+    updates.update(date_window.article_date_fields(job["local_date"], data.get("article_date")))
+
+    if data.get("relevant") is True:
+        record = build_project_record(data, signal_id, url)
+        _, project_id = db_client.upsert_project(record)
+        db_client.link_project_signal(project_id, signal_id)
+        db_client.mark_signal_processed(signal_id, **updates)
+        usage_ledger.record_outcome(job["source"], saved=True)
+        logging.info(f"   ✅ [{engine_used}] Saved: {record['name']}")
+        return "saved"
+
+    db_client.mark_signal_processed(signal_id, **updates)
+    usage_ledger.record_outcome(job["source"])
+    logging.info(f"   🚫 [{engine_used}] Irrelevant: {url[:50]}")
+    return "irrelevant"
+
+
+def cached_result(job, engines):
+    """Finishes the job from llm_cache if any engine has answered this content before."""
+    text, model = llm_cache.get_any(PROMPT_VERSION, [e["model"] for e in engines], job["content"])
+    if text is None:
+        return None
+    data = extract_json(text)
+    if not isinstance(data, dict):
+        return None
+    engine = next(e for e in engines if e["model"] == model)
+    return finish_signal(job, data, engine, from_cache=True)
+
+
+def irrelevant_verdict(text):
+    return _IRRELEVANT_PREFIX.match(text) is not None
+
+
+def watch_single(engine):
+    """Stream watcher for one article: stop at an irrelevant verdict or once the result object has closed."""
+    scanner = ArrayItemStream()
+
+    def watch(text):
+        if irrelevant_verdict(text):
+            count_stream("irrelevant_aborts")
+            return True
+        scanner.feed(text)
+        # Prose like "{see below}" also closes; only stop on a parseable result
+        return scanner.done and isinstance(extract_json(text), dict)
+    return watch
+
+
+def enrich_job(job, engines):
+    """One article, one request."""
+    content, url = job["content"], job["url"]
+    try:
+        json_str, engine = generate(lambda e: build_prompt(content, url, e["model"]), engines,
+                                    sources=[job["source"]], watch=watch_single, renew=lease_renewer([job]))
+    except EnginesBusy:
+        return "busy"
+    if not json_str:
+        return "failed"
+
+    data = extract_json(json_str)
+    if not isinstance(data, dict) and irrelevant_verdict(json_str):
+        # Stream cut after '{"relevant": false'
+        data, json_str = {"relevant": False}, IRRELEVANT_RESPONSE
+    if not isinstance(data, dict):
+        logging.error(f"   ⚠️ Parse Error ({engine['name']}): {url[:50]}")
+        return "parse_error"
+    llm_cache.put(PROMPT_VERSION, engine["model"], content, json_str)
+    return finish_signal(job, data, engine)
+
+
+def enrich_signal(signal, engines=None):
+    """
+    Enriches one signal end to end. Returns an outcome:
+    "saved", "irrelevant", "prefiltered", "empty", "busy" (no engine quota;
+    released without using an attempt), or a failure ("parse_error", "failed")
+    that process_batch schedules for retry.
+    (process_batch can also settle signals as "triaged_out" via the cascade.)
+    """
+    engines = list(engines if engines is not None else active_engines())
+    outcome, job = prepare_signal(signal)
+    if outcome:
+        return outcome
+    return cached_result(job, engines) or enrich_job(job, engines)
+
+
+# --- 6. MULTI-DOCUMENT REQUESTS ---
+def condensed_tokens(job, engines):
+    """Article tokens at the tightest budget among the engines."""
+    budget = min(condense.token_budget(e["model"]) for e in engines)
+    return count_tokens(condense.condense(job["content"], budget))
+
+
+def group_jobs(jobs, engines):
+    """
+    Splits jobs into single requests (long articles) and multi-document
+    groups of short ones (<= MULTI_DOC_MAX_TOKENS each, <= MULTI_MAX_DOCS and
+    MULTI_GROUP_TOKENS per group). Returns a list of job lists.
+    """
+    if not MULTI_DOC or MULTI_MAX_DOCS < 2:
+        return [[job] for job in jobs]
+
+    units = []
+    group, group_tokens = [], 0
+    for job in jobs:
+        tokens = condensed_tokens(job, engines)
+        if tokens > MULTI_DOC_MAX_TOKENS:
+            units.append([job])
+            continue
+        if group and (len(group) >= MULTI_MAX_DOCS or group_tokens + tokens > MULTI_GROUP_TOKENS):
+            units.append(group)
+            group, group_tokens = [], 0
+        group.append(job)
+        group_tokens += tokens
+    if group:
+        units.append(group)
+    return units
+
+
+def build_multi_prompt(jobs, model=None):
+    """Renders several articles into one request, each tagged with its signal id."""
+    budget = condense.token_budget(model)
+    articles = "\n\n".join(
+        f"### ARTICLE id={job['signal_id']} url={job['url']}\n{condense.condense(job['content'], budget)}"
+        for job in jobs
+    )
+    return MULTI_EXTRACTION_PROMPT.format(count=len(jobs), articles=articles)
+
+
+def validate_results(data, jobs):
+    """Per-article results {signal_id: result} that are well-formed; missing ids are absent."""
+    expected = {job["signal_id"] for job in jobs}
+    results = data.get("results") if isinstance(data, dict) else None
+    valid = {}
+    for item in results if isinstance(results, list) else []:
+        if not isinstance(item, dict) or not isinstance(item.get("relevant"), bool):
+            continue
+        signal_id = str(item.get("id"))
+        if signal_id in expected and signal_id not in valid:
+            valid[signal_id] = {k: v for k, v in item.items() if k != "id"}
+    return valid
+
+
+def enrich_group(jobs, engines, settled=None):
+    """
+    One request for several short articles. Articles whose result is missing
+    or malformed are split in half and retried; singletons fall back to enrich_job.
+    With streaming, each result is written as soon as its object closes and
+    the stream stops once every article has one.
+    Returns one (signal_id, outcome) per job. settled, if given, receives
+    signal_id -> outcome as each job settles, so a caller still knows which
+    jobs were written when the group raises part-way.
+    """
+    settled = {} if settled is None else settled
+    if len(jobs) == 1:
+        settled[jobs[0]["signal_id"]] = enrich_job(jobs[0], engines)
+        return [(jobs[0]["signal_id"], settled[jobs[0]["signal_id"]])]
+
+    finished = set()
+
+    def watch(engine):
+        scanner = ArrayItemStream()
+
+        def on_text(text):
+            for item in scanner.feed(text):
+                pending = [job for job in jobs if job["signal_id"] not in finished]
+                for signal_id, data in validate_results({"results": [item]}, pending).items():
+                    job = next(j for j in pending if j["signal_id"] == signal_id)
+                    llm_cache.put(PROMPT_VERSION, engine["model"], job["content"], json.dumps(data))
+                    try:
+                        outcome = finish_signal(job, data, engine, batch_size=len(jobs))
+                    except Exception as e:
+                        # Left unfinished: written again from the full response below
+                        logging.warning(f"   ⚠️ Streamed write failed for {signal_id}: {e}")
+                        continue
+                    finished.add(signal_id)
+                    settled[signal_id] = outcome
+                    count_stream("streamed_writes")
+            return len(finished) == len(jobs)
+        return on_text
+
+    try:
+        text, engine = generate(lambda e: build_multi_prompt(jobs, e["model"]), engines, completions=len(jobs),
+                                sources=[job["source"] for job in jobs], watch=watch, renew=lease_renewer(jobs))
+    except EnginesBusy:
+        text, engine = None, None
+        failure = "busy"
+    else:
+        failure = "failed"
+    if not text:
+        for job in jobs:
+            if job["signal_id"] not in finished:
+                settled[job["signal_id"]] = failure
+        return [(job["signal_id"], settled[job["signal_id"]]) for job in jobs]
+
+    results = validate_results(extract_json(text), jobs)
+    retry = []
+    for job in jobs:
+        if job["signal_id"] in finished:
+            continue
+        data = results.get(job["signal_id"])
+        if data is None:
+            retry.append(job)
+            continue
+        llm_cache.put(PROMPT_VERSION, engine["model"], job["content"], json.dumps(data))
+        settled[job["signal_id"]] = finish_signal(job, data, engine, batch_size=len(jobs))
+
+    if retry:
+        logging.warning(f"   ✂️ [{engine['name']}] {len(retry)}/{len(jobs)} batch results invalid, splitting")
+        mid = (len(retry) + 1) // 2
+        enrich_group(retry[:mid], engines, settled)
+        if retry[mid:]:
+            enrich_group(retry[mid:], engines, settled)
+    return [(job["signal_id"], settled[job["signal_id"]]) for job in jobs]
+
+
+# --- 7. CASCADE ---
+# A fast model answers only "relevant?" for a group of articles; only passes
+# reach the large models for full extraction.
+CASCADE = os.environ.get("ENRICH_CASCADE", "1") != "0"
+TRIAGE_ENGINE = os.environ.get("ENRICH_TRIAGE_ENGINE", "groq-llama3-8b")
+TRIAGE_PROMPT_VERSION = "triage-v1"
+TRIAGE_TOKEN_BUDGET = 300   # article tokens per triaged article
+TRIAGE_MAX_DOCS = 8
+TRIAGE_OUTPUT_TOKENS = 20   # completion tokens per verdict
+
+TRIAGE_PROMPT = (
+    "You screen news for a real estate intelligence team. For each of the {count} articles below, decide if it "
+    "is about a specific High-Rise Residential, Condo, Multi-Family, Mixed-Use with Residential, or Luxury "
+    "Hospitality project (new, planned, under construction, sold or financed). Single Family Homes, "
+    "Retail-only stores, Industrial, politics and general news are NOT relevant.\n\n"
+    'Return ONLY valid JSON: {{"results": [{{"id": "<article id>", "relevant": true}}]}} '
+    "with exactly one result per article id.\n\nARTICLES:\n{articles}\n"
+)
+
+CASCADE_STATS = {"triaged": 0, "passed": 0, "rejected": 0, "triage_tokens": 0, "large_tokens_freed": 0}
+_CASCADE_LOCK = threading.Lock()
+
+
+def cascade_engines(engines):
+    """(triage_engine, extraction_engines); triage_engine is None when the cascade is off or unusable."""
+    triage = next((e for e in ENGINES if e["name"] == TRIAGE_ENGINE), None)
+    extraction = [e for e in engines if e["name"] != TRIAGE_ENGINE]
+    if not CASCADE or not triage or not extraction or not engine_pool(triage).available:
+        return None, engines
+    return triage, extraction
+
+
+def build_triage_prompt(jobs):
+    articles = "\n\n".join(
+        f"### ARTICLE id={job['signal_id']}\n{condense.condense(job['content'], TRIAGE_TOKEN_BUDGET)}"
+        for job in jobs
+    )
+    return TRIAGE_PROMPT.format(count=len(jobs), articles=articles)
+
+
+def reject_job(job, triage_engine, extraction_engines):
+    """Settles a signal the triage model called irrelevant."""
+    if not lease_held(job):
+        return "lease_lost"
+    db_client.mark_signal_processed(
+        job["signal_id"],
+        enrich_engine=triage_engine["name"],
+        schema_version=SCHEMA_VERSION,
+        llm_relevant=False,
+        cascade_rejected=True,
+        prefilter_score=round(job["prefilter_score"], 4),
+        **date_window.article_date_fields(job["local_date"])
+    )
+    usage_ledger.record_outcome(job["source"])
+    freed = rate_limiter.estimate_tokens(build_prompt(job["content"], job["url"], extraction_engines[0]["model"]))
+    with _CASCADE_LOCK:
+        CASCADE_STATS["rejected"] += 1
+        CASCADE_STATS["large_tokens_freed"] += freed
+    logging.info(f"   🪜 [{triage_engine['name']}] Triaged out: {job['url'][:50]}")
+    return "triaged_out"
+
+
+def triage_jobs(jobs, triage_engine, extraction_engines):
+    """
+    Runs the triage model over a group. Returns (passed_jobs, outcomes) where
+    outcomes are (signal_id, outcome) for the rejected ones.
+    Missing verdicts and triage failures pass.
+    """
+    model = triage_engine["model"]
+    verdicts = {}
+    pending = []
+    for job in jobs:
+        cached = llm_cache.get(TRIAGE_PROMPT_VERSION, model, job["content"])
+        if cached is not None:
+            verdicts[job["signal_id"]] = json.loads(cached).get("relevant") is True
+        else:
+            pending.append(job)
+
+    if pending:
+        prompt = build_triage_prompt(pending)
+        try:
+            text, _ = generate(prompt, [triage_engine], completions=len(pending), reserve=TRIAGE_OUTPUT_TOKENS,
+                               sources=[job["source"] for job in pending])
+        except EnginesBusy:
+            text = None
+        with _CASCADE_LOCK:
+            CASCADE_STATS["triage_tokens"] += rate_limiter.estimate_tokens(prompt, len(pending), TRIAGE_OUTPUT_TOKENS)
+        for signal_id, result in (validate_results(extract_json(text), pending) if text else {}).items():
+            verdicts[signal_id] = result["relevant"]
+        for job in pending:
+            if job["signal_id"] in verdicts:
+                llm_cache.put(TRIAGE_PROMPT_VERSION, model, job["content"],
+                              json.dumps({"relevant": verdicts[job["signal_id"]]}))
+
+    passed, outcomes = [], []
+    for job in jobs:
+        if verdicts.get(job["signal_id"], True):
+            passed.append(job)
+        else:
+            outcomes.append((job["signal_id"], reject_job(job, triage_engine, extraction_engines)))
+    with _CASCADE_LOCK:
+        CASCADE_STATS["triaged"] += len(jobs)
+        CASCADE_STATS["passed"] += len(passed)
+    return passed, outcomes
+
+
+def cascade_summary():
+    """One-line report of how much large-model capacity the cascade freed."""
+    with _CASCADE_LOCK:
+        stats = dict(CASCADE_STATS)
+    if not stats["triaged"]:
+        return "Cascade: idle"
+    return (f"Cascade: {stats['rejected']}/{stats['triaged']} triaged out "
+            f"({stats['rejected'] / stats['triaged']:.0%} of large-model calls freed), "
+            f"~{stats['large_tokens_freed']:,} large-model tokens saved for {stats['triage_tokens']:,} triage tokens")
+
+
+def stream_summary():
+    """One-line report of streamed calls and how many were acted on before the response ended."""
+    with _STREAM_LOCK:
+        stats = dict(STREAM_STATS)
+    if not stats["streams"]:
+        return "Streaming: off" if not STREAM else "Streaming: idle"
+    return (f"Streaming: {stats['streams']} streams, {stats['stopped_early']} stopped early "
+            f"({stats['irrelevant_aborts']} irrelevant verdicts), {stats['streamed_writes']} results written mid-stream")
+
+
+def process_batch(queue, engines=None):
+    """
+    Runs a batch with CONCURRENCY requests in flight. Returns outcome counts.
+    Failed signals are scheduled for retry with backoff (db_client.record_signal_failure)
+    and counted as "dead_letter" once they run out of attempts. "busy" signals
+    (no engine quota) are released without using an attempt, due again when
+    the first engine frees up.
+    """
+    engines = list(engines if engines is not None else active_engines())
+    counts = {}
+    failures = {}
+    errors = {}
+
+    outcomes_by_id = {}
+
+    def count(signal_id, outcome):
+        counts[outcome] = counts.get(outcome, 0) + 1
+        outcomes_by_id[signal_id] = outcome
+        if outcome in FAILURE_REASONS and signal_id:
+            failures[signal_id] = errors.get(signal_id) or FAILURE_REASONS[outcome]
+
+    def safe_prepare(signal):
+        try:
+            outcome, job = prepare_signal(signal)
+            if outcome is None:
+                outcome = cached_result(job, engines)
+                if outcome is None:
+                    return job
+            return signal["id"], outcome
+        except Exception as e:
+            logging.error(f"   ⚠️ Enrich Error ({signal.get('id', '?')[:8]}): {e}")
+            errors[signal.get("id")] = f"error: {e}"
+            return signal.get("id"), "failed"
+
+    triage_engine, extraction_engines = cascade_engines(engines)
+
+    def safe_triage(group):
+        try:
+            return triage_jobs(group, triage_engine, extraction_engines)
+        except Exception as e:
+            logging.error(f"   ⚠️ Triage Error ({group[0]['signal_id'][:8]} +{len(group) - 1}): {e}")
+            return group, []  # triage is optional: unscreened signals go on to extraction
+
+    def safe_enrich(group):
+        settled = {}
+        try:
+            return enrich_group(group, extraction_engines, settled)
+        except Exception as e:
+            logging.error(f"   ⚠️ Enrich Error ({group[0]['signal_id'][:8]} +{len(group) - 1}): {e}")
+            # Jobs already written before the error keep their outcome (no retry/reset for them)
+            unsettled = [job for job in group if job["signal_id"] not in settled]
+            for job in unsettled:
+                errors[job["signal_id"]] = f"error: {e}"
+            return list(settled.items()) + [(job["signal_id"], "failed") for job in unsettled]
+
+    with ThreadPoolExecutor(max_workers=max(1, CONCURRENCY)) as pool:
+        jobs = []
+        for result in pool.map(safe_prepare, queue):
+            if isinstance(result, dict):
+                jobs.append(result)
+            else:
+                count(*result)
+
+        if triage_engine and jobs:
+            groups = [jobs[i:i + TRIAGE_MAX_DOCS] for i in range(0, len(jobs), TRIAGE_MAX_DOCS)]
+            jobs = []
+            for passed, outcomes in pool.map(safe_triage, groups):
+                jobs += passed
+                for result in outcomes:
+                    count(*result)
+
+        for outcomes in pool.map(safe_enrich, group_jobs(jobs, extraction_engines)):
+            for result in outcomes:
+                count(*result)
+
+    busy = [signal_id for signal_id, outcome in outcomes_by_id.items() if outcome == "busy"]
+    if busy:
+        retry_in = min(db_client.RETRY_MAX_SECONDS, max(BUSY_MIN_DELAY, engines_ready_in(extraction_engines)))
+        db_client.release_signals(busy, next_retry_at=int((time.time() + retry_in) * 1000),
+                                  last_error="engines busy (quota)")
+        logging.warning(f"   ⏳ {len(busy)} signals released, engines busy for ~{retry_in:.0f}s")
+
+    for signal in queue:
+        reason = failures.get(signal.get("id"))
+        if reason and db_client.record_signal_failure(signal, reason) == "DEAD_LETTER":
+            counts["dead_letter"] = counts.get("dead_letter", 0) + 1
+            logging.error(f"   ☠️ Dead-lettered after {db_client.MAX_ATTEMPTS} attempts ({reason}): {signal['id'][:8]}")
+    return counts
+
+
+def run_engine(once=False, label="ENRICHMENT ENGINE"):
+    """
+    The Brain loop (Ralph protocol: never crash, never exit).
+    once=True drains the current queue and returns (batch mode).
+    """
+    engines = active_engines()
+    print("=" * 60)
+    print(f"🚀 {label}")
+    print(f"   Schema v{SCHEMA_VERSION} | Engines: {', '.join(e['name'] for e in engines) or 'NONE'}")
+    print(f"   Concurrency {CONCURRENCY} | Token-bucket pacing | Condensed to per-model token budgets")
+    triage_engine, extraction_engines = cascade_engines(engines)
+    if triage_engine:
+        print(f"   Cascade: {triage_engine['name']} triage -> {', '.join(e['name'] for e in extraction_engines)}")
+    print(f"   Worker {WORKER_INDEX + 1}/{WORKER_COUNT}")
+    print("=" * 60)
+
+    if not engines:
+        print("❌ CRITICAL: no LLM engine configured (check GROQ_API_KEY / GOOGLE_API_KEY / ENRICH_ENGINES).")
+        return
+
+    refresh_sources()
+    totals = {}
+
+    while True:
+        try:
+            queue = fetch_queue()
+            if not queue:
+                if once:
+                    break
+                logging.info(f"✅ Pipeline Clear. Sleeping {IDLE_SLEEP}s...")
+                time.sleep(IDLE_SLEEP)
+                continue
+
+            logging.info(f"⚡ Processing batch of {len(queue)}... | {queue_priority.summary()}")
+            counts = process_batch(queue, engines)
+            for outcome, n in counts.items():
+                totals[outcome] = totals.get(outcome, 0) + n
+            cache = llm_cache.stats()
+            logging.info(f"📊 Batch: {counts} | Totals: {totals} | Cache hit rate {cache['hit_rate']:.0%} ({cache['hits']} hits)")
+            logging.info(f"🧭 Engines: {ROUTER.snapshot()}")
+            logging.info(f"🔑 Keys: {credential_pool.usage_snapshot()}")
+            logging.info(f"🪜 {cascade_summary()}")
+            logging.info(f"💸 {usage_ledger.session_summary()}")
+            logging.info(f"🧾 {extraction_schema.summary()}")
+            logging.info(f"🌊 {stream_summary()}")
+
+            if counts.get("failed", 0) + counts.get("busy", 0) == len(queue):
+                logging.error(f"❌ All engines busy/errored. Cooldown {FAILURE_COOLDOWN}s...")
+                if once:
+                    break
+                time.sleep(FAILURE_COOLDOWN)
+
+        except KeyboardInterrupt:
+            print("\n🛑 Stopping...")
+            break
+        except Exception as e:
+            logging.error(f"🔥 CRITICAL ERROR: {e}")
+            time.sleep(10)
+
+    print(f"🏁 {label} finished: {totals}")
+
+
+if __name__ == "__main__":
+    run_engine()
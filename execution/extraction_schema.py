@@ -0,0 +1,296 @@
+"""
+Extraction Schema - Typed validation and coercion of LLM extraction results
+Model output used to go into projects as-is: units/floors as "approx. 300" or
+"40-story", gdv as "$1.2 billion" or "$500M", status_stage as free text. Every
+result now passes through validate() before it is written:
+- units, floors: ints within a plausible range ("approx. 300" -> 300, "40-story" -> 40)
+- gdv: kept as text, plus gdv_usd as whole dollars ("$1.2 billion" -> 1200000000)
+- unit_mix: count as int, price_usd alongside the price text
+- status_stage: one of STAGES (whole-word synonyms mapped, anything else dropped)
+- article_date: "YYYY-MM-DD" (date_window.parse_timestamp formats), not in the future
+- delivery_date: kept as text, plus delivery_year
+- text fields: stripped, placeholders ("N/A", "unknown", "null") become None;
+  the template's 0 for a number it could not find is a placeholder too
+
+Values already of the right type and range take a fast path without any
+regex. Per-field counters (ok / coerced / rejected) show how often models
+drift from the schema (stats(), summary()).
+"""
+import re
+import threading
+from datetime import date, timedelta
+import date_window
+
+STAGES = ("Proposed", "Planning", "Permitting", "Construction", "Completed")
+
+# Free-text stage -> STAGES (checked in order, first whole-word match wins)
+STAGE_PATTERNS = [
+    ("Completed", re.compile(r"\b(?:complet(?:e|ed|ion)|delivered|opened|finished|occupancy)\b")),
+    ("Construction", re.compile(r"\b(?:construction|groundbreaking|broke ground|topped out|topping out|"
+                                r"vertical|foundations?|under ?way)\b")),
+    ("Permitting", re.compile(r"\b(?:permit(?:s|ted|ting)?|approv(?:al|als|ed|e)|zoning|rezon(?:e|ed|ing)|"
+                              r"filed|filings?|entitle(?:d|ments?)|review)\b")),
+    ("Planning", re.compile(r"\b(?:planning|plans?|planned|design(?:ed|s)?|pre-?development|financing|"
+                            r"land acquired|acquisition)\b")),
+    ("Proposed", re.compile(r"\b(?:propos(?:al|ed|e)|announce(?:d|ment)?|conceptual|concept|pitch(?:ed)?|"
+                            r"rumou?red|envisioned)\b")),
+]
+# Phrases that contain a stage word without meaning that stage; removed
+# before matching ("pre-construction sales", "sales gallery opened",
+# "incomplete", "completion expected in 2027")
+STAGE_MISLEADING_RE = re.compile(
+    r"\bpre-?construction\b|\b(?:opened\s+(?:a\s+|an\s+|its\s+|the\s+)?)?sales\s+(?:gallery|center|centre|office)"
+    r"(?:\s+(?:opened|is open))?|\bincomplete\b|\bnot\s+(?:yet\s+)?(?:complete|completed|finished|opened)\b|"
+    r"\b(?:expected|scheduled|slated|planned|anticipated|targeted|estimated|set)\s+(?:to\s+|for\s+)?"
+    r"(?:be\s+)?(?:complet\w*|open\w*|deliver\w*|finish\w*)|"
+    r"\b(?:complet\w*|open\w*|deliver\w*)\s+(?:is\s+|are\s+)?(?:expected|scheduled|slated|planned|"
+    r"anticipated|targeted|estimated)"
+)
+# The prompt template's own stage value, echoed back when the article says nothing
+STAGE_TEMPLATE = "/".join(STAGES).lower()
+
+# Plausible ranges; anything outside is rejected as a misread
+INT_RANGES = {
+    "units": (1, 20000),
+    "floors": (1, 200),
+}
+USD_RANGE = (100000, 100 * 10 ** 9)
+MIN_ARTICLE_YEAR = 2000
+
+TEXT_FIELDS = ("name", "address", "city", "developer", "architect", "lender", "sales_team",
+               "signal_type", "image_url", "description", "gdv", "delivery_date")
+PLACEHOLDERS = {"", "n/a", "na", "none", "null", "unknown", "not stated", "not mentioned", "tbd", "-", "?", "0"}
+
+_INT_RE = re.compile(r"\d[\d,]*(?:\.\d+)?")
+_USD_RE = re.compile(
+    r"(\d[\d,]*(?:\.\d+)?)(?:\s*(?:-|–|to)\s*\$?\d[\d,]*(?:\.\d+)?)?\s*"
+    r"(billion|bn|b|million|mil|mm|m|thousand|k)?\b",
+    re.IGNORECASE
+)
+_FOREIGN_CURRENCY_RE = re.compile(r"[€£¥]|\b(?:eur|gbp|cad|mxn|aed)\b", re.IGNORECASE)
+_USD_MULTIPLIERS = {
+    "billion": 10 ** 9, "bn": 10 ** 9, "b": 10 ** 9,
+    "million": 10 ** 6, "mil": 10 ** 6, "mm": 10 ** 6, "m": 10 ** 6,
+    "thousand": 10 ** 3, "k": 10 ** 3,
+}
+_YEAR_RE = re.compile(r"\b(20\d{2})\b")
+
+STATS = {}
+_STATS_LOCK = threading.Lock()
+
+
+def count(field, result):
+    """result: "ok", "coerced" or "rejected"."""
+    with _STATS_LOCK:
+        field_stats = STATS.setdefault(field, {"ok": 0, "coerced": 0, "rejected": 0})
+        field_stats[result] += 1
+
+
+def is_zero(value):
+    """The prompt template's numeric placeholder (0), which means "not stated"."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value == 0
+
+
+# --- COERCERS ---
+# Each returns (value, result): result is "ok" (already valid), "coerced" or "rejected" (value None).
+
+def coerce_text(value):
+    if value is None:
+        return None, "ok"
+    if is_zero(value):
+        return None, "coerced"
+    if isinstance(value, str):
+        stripped = value.strip()
+        if stripped.lower() in PLACEHOLDERS:
+            return None, "coerced"
+        return stripped, "ok" if stripped == value else "coerced"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value), "coerced"
+    return None, "rejected"
+
+
+def coerce_int(value, low, high):
+    if value is None:
+        return None, "ok"
+    if is_zero(value):
+        return None, "coerced"
+    if type(value) is int:
+        return (value, "ok") if low <= value <= high else (None, "rejected")
+    if isinstance(value, float) and not isinstance(value, bool):
+        number = int(round(value))
+    elif isinstance(value, str):
+        if value.strip().lower() in PLACEHOLDERS:
+            return None, "coerced"
+        match = _INT_RE.search(value)  # first number: "approx. 300", "40-story", "300-350 units"
+        if not match:
+            return None, "rejected"
+        number = int(float(match.group(0).replace(",", "")))
+    else:
+        return None, "rejected"
+    return (number, "coerced") if low <= number <= high else (None, "rejected")
+
+
+def parse_usd(text):
+    """Whole dollars from "$1.2 billion", "$500M", "USD 85 million", "$1.2-1.5B" (lower bound), or None."""
+    if not isinstance(text, str) or _FOREIGN_CURRENCY_RE.search(text):
+        return None
+    matches = list(_USD_RE.finditer(text))
+    if not matches:
+        return None
+    # Prefer an amount with a "$" or a unit over bare numbers (years, unit counts)
+    match = next((m for m in matches if m.group(2) or text[:m.start()].rstrip().endswith("$")), matches[0])
+    amount = float(match.group(1).replace(",", ""))
+    unit = (match.group(2) or "").lower()
+    return int(round(amount * _USD_MULTIPLIERS.get(unit, 1)))
+
+
+def coerce_usd(value):
+    if value is None:
+        return None, "ok"
+    if is_zero(value):
+        return None, "coerced"
+    if type(value) is int:
+        return (value, "ok") if USD_RANGE[0] <= value <= USD_RANGE[1] else (None, "rejected")
+    if isinstance(value, float) and not isinstance(value, bool):
+        amount = int(round(value))
+    else:
+        amount = parse_usd(value)
+    if amount is None or not USD_RANGE[0] <= amount <= USD_RANGE[1]:
+        return None, "rejected"
+    return amount, "coerced"
+
+
+def coerce_stage(value):
+    if value is None:
+        return None, "ok"
+    if value in STAGES:
+        return value, "ok"
+    if is_zero(value):
+        return None, "coerced"
+    if not isinstance(value, str):
+        return None, "rejected"
+    lowered = value.strip().lower()
+    if lowered in PLACEHOLDERS or lowered == STAGE_TEMPLATE:
+        return None, "coerced"
+    lowered = STAGE_MISLEADING_RE.sub(" ", lowered)
+    for stage, pattern in STAGE_PATTERNS:
+        if pattern.search(lowered):
+            return stage, "coerced"
+    return None, "rejected"
+
+
+def coerce_article_date(value, today=None):
+    if value is None:
+        return None, "ok"
+    if not isinstance(value, str):
+        return None, "rejected"
+    parsed = date_window.parse_timestamp(value)
+    latest = (today or date.today()) + timedelta(days=1)
+    if parsed is None or parsed.year < MIN_ARTICLE_YEAR or parsed > latest:
+        return None, "coerced" if value.strip().lower() in PLACEHOLDERS else "rejected"
+    iso = parsed.isoformat()
+    return iso, "ok" if iso == value else "coerced"
+
+
+def delivery_year(text):
+    """Year from "Q4 2026", "late 2027", "2026-2027" (first), or None."""
+    match = _YEAR_RE.search(text) if isinstance(text, str) else None
+    return int(match.group(1)) if match else None
+
+
+def coerce_unit_mix(value):
+    if value is None:
+        return None, "ok"
+    if not isinstance(value, list):
+        return None, "rejected"
+    result = "ok"
+    rows = []
+    for row in value:
+        if not isinstance(row, dict):
+            result = "coerced"
+            continue
+        row = dict(row)
+        count_value, count_result = coerce_int(row.get("count"), 1, INT_RANGES["units"][1])
+        price_usd = parse_usd(row.get("price")) if isinstance(row.get("price"), str) else None
+        if count_result != "ok":
+            result = "coerced"
+        row["count"] = count_value
+        if price_usd is not None:
+            row["price_usd"] = price_usd
+        rows.append(row)
+    return rows or None, result
+
+
+def coerce_individuals(value):
+    if value is None:
+        return None, "ok"
+    if isinstance(value, str):
+        value = [part for part in re.split(r";|\n", value)]
+    if not isinstance(value, list):
+        return None, "rejected"
+    people = [p.strip() for p in value if isinstance(p, str) and p.strip().lower() not in PLACEHOLDERS]
+    return people or None, "ok" if people == value else "coerced"
+
+
+def coerce_bool(value):
+    if isinstance(value, bool):
+        return value, "ok"
+    if isinstance(value, str) and value.strip().lower() in ("true", "yes"):
+        return True, "coerced"
+    if isinstance(value, str) and value.strip().lower() in ("false", "no"):
+        return False, "coerced"
+    return None, "rejected"
+
+
+# field -> coercer, built once
+FIELD_COERCERS = dict(
+    {field: coerce_text for field in TEXT_FIELDS},
+    relevant=coerce_bool,
+    units=lambda v: coerce_int(v, *INT_RANGES["units"]),
+    floors=lambda v: coerce_int(v, *INT_RANGES["floors"]),
+    status_stage=coerce_stage,
+    article_date=coerce_article_date,
+    unit_mix=coerce_unit_mix,
+    individuals=coerce_individuals,
+)
+
+
+def validate(data):
+    """
+    Returns a typed copy of an extraction result: known fields coerced (or
+    set to None when unusable), derived gdv_usd / delivery_year added,
+    unknown fields passed through. Counts every known field in STATS.
+    """
+    clean = dict(data)
+    for field, coercer in FIELD_COERCERS.items():
+        if field not in data:
+            continue
+        value, result = coercer(data[field])
+        clean[field] = value
+        count(field, result)
+
+    if clean.get("gdv") is not None:
+        clean["gdv_usd"], result = coerce_usd(clean["gdv"])
+        count("gdv_usd", result)
+    if clean.get("delivery_date") is not None:
+        clean["delivery_year"] = delivery_year(clean["delivery_date"])
+    return clean
+
+
+def stats():
+    with _STATS_LOCK:
+        return {field: dict(s) for field, s in STATS.items()}
+
+
+def summary():
+    """One-line report of coerced / rejected fields in this process."""
+    current = stats()
+    checked = sum(sum(s.values()) for s in current.values())
+    if not checked:
+        return "Schema: nothing validated yet"
+    coerced = sum(s["coerced"] for s in current.values())
+    rejected = sum(s["rejected"] for s in current.values())
+    worst = sorted(((s["coerced"] + s["rejected"], field) for field, s in current.items()), reverse=True)[:3]
+    detail = ", ".join(f"{field} {n}" for n, field in worst if n)
+    return (f"Schema: {checked} fields checked, {coerced} coerced, {rejected} rejected"
+            + (f" (most fixed: {detail})" if detail else ""))
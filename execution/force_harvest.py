@@ -6,6 +6,7 @@ import time
 import logging
 from dotenv import load_dotenv
 import db_client
+import url_canon
 
 # Try to import scraper
 try:
@@ -40,17 +41,16 @@ STALE_URLS = [
 
 
 def find_source_by_url(url):
-    """Find source ID by URL."""
+    """Find source ID by URL (canonical match, see url_canon)."""
     query = {"sources": {}}
     data = db_client.query_db(query)
     
     if not data or "sources" not in data:
-        return None
+        return None, None
     
-    normalized = url.rstrip("/")
+    target_key = url_canon.url_key(url)
     for source in data["sources"]:
-        source_url = source.get("url", "").rstrip("/")
-        if normalized in source_url or source_url in normalized:
+        if url_canon.url_key(source.get("url", "")) == target_key:
             return source.get("id"), source.get("url")
     
     return None, None
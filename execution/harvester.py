@@ -13,7 +13,30 @@ load_dotenv()
 
 import free_scraper
 
-# ...
+# Lines of the last snapshot saved per source. Homepage snapshots are not
+# run through near_dup: one new headline on an otherwise unchanged page is
+# still >0.7 similar and would be dropped. A snapshot is skipped only when
+# it has no line the previous one lacked.
+LAST_SNAPSHOT = None
+
+
+def snapshot_lines(content):
+    return {line.strip() for line in content.splitlines() if line.strip()}
+
+
+def get_last_snapshots():
+    """{source_id: lines of its newest snapshot}, loaded from raw_signals on first use."""
+    global LAST_SNAPSHOT
+    if LAST_SNAPSHOT is None:
+        data = db_client.query_db({"raw_signals": {}}) or {}
+        newest = {}
+        for s in data.get("raw_signals", []):
+            source_id = s.get("source_id")
+            if source_id and s.get("content") and (s.get("created_at") or 0) >= (newest.get(source_id, {}).get("created_at") or 0):
+                newest[source_id] = s
+        LAST_SNAPSHOT = {source_id: snapshot_lines(s["content"]) for source_id, s in newest.items()}
+        logging.info(f"Loaded last snapshots of {len(LAST_SNAPSHOT)} sources")
+    return LAST_SNAPSHOT
 
 def do_the_work():
     """
@@ -39,9 +62,15 @@ def do_the_work():
         
         # 4. Save to InstantDB
         if markdown_content:
-            logging.info(f"Scraped {len(markdown_content)} bytes. Saving to DB...")
-            
-            db_client.add_raw_signal(source_id, markdown_content)
+            snapshots = get_last_snapshots()
+            lines = snapshot_lines(markdown_content)
+            new_lines = lines - snapshots.get(source_id, set())
+            if new_lines:
+                logging.info(f"Scraped {len(markdown_content)} bytes ({len(new_lines)} new lines). Saving to DB...")
+                if db_client.add_raw_signal(source_id, markdown_content) is not None:
+                    snapshots[source_id] = lines
+            else:
+                logging.info("Snapshot unchanged since the last one. Not saved.")
             
             # 5. Update Source Timestamp
             db_client.update_source_timestamp(source_id)
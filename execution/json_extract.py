@@ -0,0 +1,194 @@
+"""
+JSON Extract - Pull JSON out of model responses in linear time
+The old fallback, re.search(r'\\{.*\\}', text, re.DOTALL), backtracked on long
+responses and grabbed the wrong span whenever the model wrapped its answer
+in prose containing braces ("{see below}") or returned two objects.
+
+extract_json() instead:
+1. tries json.loads on the response (code fences stripped): the common case
+2. otherwise scans it once, visiting only brackets, quotes and backslashes,
+   and records every balanced {...} / [...] span (brackets inside strings ignored)
+3. parses spans outermost-first, skipping ones that cannot start JSON
+   ("{see below}"); a span that fails is retried after a
+   tolerant rewrite (trailing commas, // and /* */ comments, single-quoted
+   strings, Python True/False/None), then its children are tried instead
+At most MAX_PARSE_ATTEMPTS spans are parsed, so the cost stays linear in
+the response length whatever the model sends.
+
+    extract_json(text)   -> first JSON object/array, or None
+    extract_all(text)    -> every top-level JSON object/array, in order
+    ArrayItemStream      -> objects inside arrays as soon as they close, and
+                            whether the whole value has closed, for responses
+                            still streaming in (each chunk scanned once)
+"""
+import json
+import re
+
+MAX_PARSE_ATTEMPTS = 32
+
+_FENCE_RE = re.compile(r"^```[a-zA-Z0-9]*\s*|\s*```$")
+_TOKEN_RE = re.compile(r'[{}\[\]"\\]')
+_CLOSERS = {"}": "{", "]": "["}
+# What may follow the opening bracket of real JSON; prose like "{see below}" fails this cheaply
+_PLAUSIBLE_START = re.compile(r'\{\s*["\'}]|\[\s*[-\d"\'{\[\]tfnTFN]')
+
+# JSON5-ish leniency: strings are matched first so their contents are never rewritten
+_RELAX_RE = re.compile(
+    r'"(?:[^"\\]|\\.)*"'            # double-quoted string: keep
+    r"|'((?:[^'\\]|\\.)*)'"         # single-quoted string: requote
+    r"|//[^\n]*"                    # line comment: drop
+    r"|/\*(?:[^*]|\*(?!/))*\*/"     # block comment: drop
+    r"|,(\s*[}\]])"                 # trailing comma: drop
+    r"|\b(True|False|None)\b",      # Python literals
+    re.DOTALL
+)
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+def _relax_token(match):
+    token = match.group(0)
+    if match.group(1) is not None:
+        inner = match.group(1).replace("\\'", "'").replace('"', '\\"')
+        return f'"{inner}"'
+    if match.group(2) is not None:
+        return match.group(2)
+    if match.group(3) is not None:
+        return _PY_LITERALS[match.group(3)]
+    if token.startswith("/"):
+        return ""
+    return token
+
+
+def relax(text):
+    """Rewrites common JSON5/Python-isms into strict JSON."""
+    return _RELAX_RE.sub(_relax_token, text)
+
+
+def balanced_spans(text):
+    """
+    (start, end) of every balanced {...} or [...] in text, sorted outermost
+    first. One pass over the bracket/quote tokens only; quotes are tracked
+    inside brackets (prose apostrophes and quotes outside are ignored).
+    """
+    spans = []
+    stack = []
+    in_string = False
+    skip_to = -1
+    for match in _TOKEN_RE.finditer(text):
+        pos = match.start()
+        if pos < skip_to:
+            continue  # escaped character
+        ch = match.group(0)
+        if in_string:
+            if ch == "\\":
+                skip_to = pos + 2
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = bool(stack)
+        elif ch in "{[":
+            stack.append((ch, pos))
+        elif ch in _CLOSERS and stack and stack[-1][0] == _CLOSERS[ch]:
+            spans.append((stack.pop()[1], pos + 1))
+    spans.sort(key=lambda span: (span[0], -span[1]))
+    return spans
+
+
+def _parse(span):
+    try:
+        return json.loads(span), True
+    except ValueError:
+        pass
+    try:
+        return json.loads(relax(span)), True
+    except ValueError:
+        return None, False
+
+
+def extract_all(text, limit=None):
+    """Every top-level JSON value in text (outermost parseable spans), in order."""
+    if not text:
+        return []
+    values = []
+    covered_to = 0
+    attempts = 0
+    for start, end in balanced_spans(text):
+        if start < covered_to:
+            continue  # inside a span that already parsed
+        if not _PLAUSIBLE_START.match(text, start):
+            continue
+        if attempts >= MAX_PARSE_ATTEMPTS:
+            break
+        attempts += 1
+        value, ok = _parse(text[start:end])
+        if ok:
+            values.append(value)
+            covered_to = end
+            if limit and len(values) >= limit:
+                break
+    return values
+
+
+def strip_fences(text):
+    return _FENCE_RE.sub("", text.strip())
+
+
+def extract_json(text):
+    """The JSON object/array in a model response (fences, prose, JSON5-isms tolerated), or None."""
+    if not text:
+        return None
+    body = strip_fences(text)
+    try:
+        return json.loads(body)
+    except ValueError:
+        pass
+    values = extract_all(body, limit=1)
+    return values[0] if values else None
+
+
+class ArrayItemStream:
+    """
+    Incremental scanner for a response that is still arriving. feed() takes
+    the text received so far and returns the objects that are items of the
+    outermost array (e.g. each result in {"results": [...]}, not the
+    unit_mix rows inside it) and closed since the last call. done turns
+    True once the outermost value has closed.
+    """
+
+    def __init__(self):
+        self.pos = 0
+        self.stack = []
+        self.in_string = False
+        self.skip_to = -1
+        self.arrays = 0  # "[" currently open
+        self.done = False
+
+    def feed(self, text):
+        items = []
+        for match in _TOKEN_RE.finditer(text, self.pos):
+            pos = match.start()
+            if pos < self.skip_to:
+                continue
+            ch = match.group(0)
+            if self.in_string:
+                if ch == "\\":
+                    self.skip_to = pos + 2
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = bool(self.stack)
+            elif ch in "{[":
+                self.stack.append((ch, pos))
+                self.arrays += ch == "["
+            elif ch in _CLOSERS and self.stack and self.stack[-1][0] == _CLOSERS[ch]:
+                start = self.stack.pop()[1]
+                self.arrays -= ch == "]"
+                if ch == "}" and self.arrays == 1 and self.stack[-1][0] == "[":
+                    value, ok = _parse(text[start:pos + 1])
+                    if ok:
+                        items.append(value)
+                elif not self.stack:
+                    self.done = True
+        # A trailing backslash escapes the first character of the next chunk
+        self.pos = max(len(text), self.skip_to)
+        return items
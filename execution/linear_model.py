@@ -0,0 +1,80 @@
+"""
+Linear Model - Logistic model over binary features, on top of prior weights
+Shared by triage.py (URL slug + listing title) and relevance_filter.py
+(article text): both score a feature set with hand-set prior log-odds plus
+weights learned by SGD from our own history, stored as JSON
+({"bias": float, "weights": {feature: float}, "examples": int}).
+"""
+import json
+import math
+import random
+
+SEED = 1842
+
+
+def load(path):
+    """Learned model from `path`, or None if missing or unreadable."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save(model, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(model, f, indent=1, sort_keys=True)
+
+
+def logit(feats, priors, model=None):
+    """Bias + prior and learned weight of every feature, clamped to +-30."""
+    weights = model.get("weights", {}) if model else {}
+    total = model.get("bias", 0.0) if model else 0.0
+    for f in feats:
+        total += priors.get(f, 0.0) + weights.get(f, 0.0)
+    return max(-30.0, min(30.0, total))
+
+
+def probability(feats, priors, model=None):
+    return 1.0 / (1.0 + math.exp(-logit(feats, priors, model)))
+
+
+def train(rows, priors, epochs, learning_rate, l2, min_count=1, seed=SEED):
+    """
+    Fits bias + per-feature weights on top of the priors with SGD.
+    rows: list of (feature set, label) where label is 1 (relevant) or 0.
+    Features seen in fewer than min_count rows are ignored (priors always count).
+    """
+    if min_count > 1:
+        counts = {}
+        for feats, _ in rows:
+            for f in feats:
+                counts[f] = counts.get(f, 0) + 1
+        vocab = {f for f, n in counts.items() if n >= min_count} | set(priors)
+        rows = [(feats & vocab, label) for feats, label in rows]
+    else:
+        rows = list(rows)
+
+    weights = {}
+    bias = 0.0
+    rng = random.Random(seed)
+    for _ in range(epochs):
+        rng.shuffle(rows)
+        for feats, label in rows:
+            error = probability(feats, priors, {"bias": bias, "weights": weights}) - label
+            bias -= learning_rate * error
+            for f in feats:
+                w = weights.get(f, 0.0)
+                weights[f] = w - learning_rate * (error + l2 * w)
+
+    weights = {f: round(w, 4) for f, w in weights.items() if abs(w) >= 0.01}
+    return {"bias": round(bias, 4), "weights": weights, "examples": len(rows)}
+
+
+def split(examples, holdout=0.2, seed=SEED):
+    """Deterministic train/test split."""
+    rows = list(examples)
+    random.Random(seed).shuffle(rows)
+    cut = int(len(rows) * (1 - holdout))
+    return rows[:cut], rows[cut:]
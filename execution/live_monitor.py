@@ -1,11 +1,13 @@
 """
 Live Monitor - 5 Minute Dashboard
-Shows real-time pipeline status every 5 minutes.
+Shows real-time pipeline status every 5 minutes, including LLM token
+usage and cost from the usage ledger (usage_ledger.py, written by the enrichers on this host).
 """
 import time
 import logging
 from datetime import datetime
 import db_client
+import usage_ledger
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
@@ -66,10 +68,36 @@ def get_stats():
             stats["ungeo_projects"] = stats["total_projects"] - geocoded
     except Exception as e:
         logging.warning(f"Project query error: {e}")
+
+    # LLM usage (local ledger)
+    try:
+        stats["usage"] = usage_ledger.summary(hours=24)
+    except Exception as e:
+        logging.warning(f"Usage ledger error: {e}")
     
     return stats
 
 
+def display_usage(usage):
+    """Token/cost section: 24h totals, per engine, and sources burning tokens for no projects."""
+    totals = usage["totals"]
+    tokens = int(totals["prompt_tokens"] + totals["completion_tokens"])
+    print(f" 💸 LLM Usage (24h):   {tokens:,} tokens in {totals['calls']:.0f} calls (~${totals['cost']:.2f})")
+    for name, entry in sorted(usage["by_engine"].items(), key=lambda kv: -(kv[1]["prompt_tokens"] + kv[1]["completion_tokens"])):
+        engine_tokens = int(entry["prompt_tokens"] + entry["completion_tokens"])
+        print(f"    - {name}: {engine_tokens:,} tokens (~${entry['cost']:.2f})")
+    keys = ", ".join(f"{key} {int(e['prompt_tokens'] + e['completion_tokens']):,}"
+                     for key, e in sorted(usage["by_key"].items()))
+    if keys:
+        print(f"    🔑 Keys: {keys}")
+
+    wasted = [(source, int(e["prompt_tokens"] + e["completion_tokens"]))
+              for source, e in usage["by_source"].items() if not e.get("projects")]
+    wasted = sorted((w for w in wasted if w[1] > 0), key=lambda w: -w[1])[:5]
+    if wasted:
+        print(" 🔥 Tokens, 0 projects: " + ", ".join(f"{source} {n:,}" for source, n in wasted))
+
+
 def display_dashboard(stats):
     """Display a beautiful terminal dashboard."""
     global previous_counts
@@ -120,6 +148,9 @@ def display_dashboard(stats):
     
     # AI Health
     print(f" 🤖 AI Health:         Gemini 1.5 Flash (Robust Mode)")
+
+    if stats.get("usage"):
+        display_usage(stats["usage"])
     
     print()
     print("-" * 60)
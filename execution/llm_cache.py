@@ -0,0 +1,176 @@
+"""
+LLM Cache - On-disk response cache for enrichment calls
+Re-runs after a crash, schema migrations, duplicate homepage snapshots and
+date backfills resend identical text to the models. Responses are stored in
+SQLite keyed by (prompt version, model, normalized content hash), so an
+identical input costs zero API calls.
+
+Eviction is LRU by total response size (LLM_CACHE_MAX_MB, default 256).
+Hit rate is tracked per process (stats()) and per entry (hits column).
+
+Usage:
+    python3 execution/llm_cache.py stats    # entries, size, hit rate by prompt version
+    python3 execution/llm_cache.py clear    # drop every entry
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+CACHE_PATH = Path(os.environ.get("LLM_CACHE_PATH", Path(__file__).parent.parent / "data" / "llm_cache.sqlite"))
+MAX_BYTES = int(float(os.environ.get("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024)
+ENABLED = os.environ.get("LLM_CACHE", "1") != "0"
+
+# Evict down to this fraction of MAX_BYTES so we don't evict on every insert
+EVICT_TO = 0.9
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_lock = threading.Lock()
+_conn = None
+_total_bytes = None
+_stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+
+def normalize(content):
+    """Whitespace-insensitive form of the input text."""
+    return _WHITESPACE_RE.sub(" ", content or "").strip()
+
+
+def content_hash(content):
+    return hashlib.sha256(normalize(content).encode("utf-8")).hexdigest()
+
+
+def cache_key(prompt_version, model, content):
+    return f"{prompt_version}|{model}|{content_hash(content)}"
+
+
+def _connect():
+    """Opens (and creates) the cache database once per process. Caller holds _lock."""
+    global _conn, _total_bytes
+    if _conn is None:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(str(CACHE_PATH), check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, prompt_version TEXT, model TEXT, response TEXT,"
+            " size INTEGER, created_at REAL, last_used REAL, hits INTEGER DEFAULT 0)"
+        )
+        _conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used)")
+        _total_bytes = _conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+    return _conn
+
+
+def get(prompt_version, model, content):
+    """Cached response text, or None."""
+    if not ENABLED:
+        return None
+    key = cache_key(prompt_version, model, content)
+    with _lock:
+        conn = _connect()
+        row = conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            _stats["misses"] += 1
+            return None
+        conn.execute("UPDATE responses SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+        conn.commit()
+        _stats["hits"] += 1
+        return row[0]
+
+
+def get_any(prompt_version, models, content):
+    """First cached response across models (in order). Returns (text, model) or (None, None)."""
+    if not ENABLED:
+        return None, None
+    keys = [(cache_key(prompt_version, m, content), m) for m in models]
+    with _lock:
+        conn = _connect()
+        for key, model in keys:
+            row = conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE responses SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+                conn.commit()
+                _stats["hits"] += 1
+                return row[0], model
+        _stats["misses"] += 1
+    return None, None
+
+
+def put(prompt_version, model, content, response):
+    """Stores a response, evicting least-recently-used entries past MAX_BYTES."""
+    global _total_bytes
+    if not ENABLED or not response:
+        return
+    key = cache_key(prompt_version, model, content)
+    size = len(response.encode("utf-8"))
+    now = time.time()
+    with _lock:
+        conn = _connect()
+        old = conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, prompt_version, model, response, size, created_at, last_used, hits)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+            (key, prompt_version, model, response, size, now, now)
+        )
+        _total_bytes += size - (old[0] if old else 0)
+        _stats["writes"] += 1
+        if _total_bytes > MAX_BYTES:
+            _evict(conn)
+        conn.commit()
+
+
+def _evict(conn):
+    """Deletes least-recently-used entries until under EVICT_TO * MAX_BYTES. Caller holds _lock."""
+    global _total_bytes
+    target = MAX_BYTES * EVICT_TO
+    victims = []
+    for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+        if _total_bytes <= target:
+            break
+        victims.append((key,))
+        _total_bytes -= size
+    conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+    _stats["evictions"] += len(victims)
+
+
+def stats():
+    """This process's counters plus hit rate."""
+    lookups = _stats["hits"] + _stats["misses"]
+    return dict(_stats, hit_rate=_stats["hits"] / lookups if lookups else 0.0, bytes=_total_bytes or 0)
+
+
+def report():
+    """Prints on-disk cache contents by prompt version."""
+    with _lock:
+        conn = _connect()
+        rows = conn.execute(
+            "SELECT prompt_version, COUNT(*), SUM(size), SUM(hits) FROM responses GROUP BY prompt_version"
+        ).fetchall()
+    print(f"📊 LLM cache at {CACHE_PATH} ({(_total_bytes or 0) / 1024 / 1024:.1f} / {MAX_BYTES / 1024 / 1024:.0f} MB)")
+    for version, count, size, hits in rows:
+        print(f"   {version}: {count} entries, {size / 1024:.0f} KB, {hits} hits (calls saved)")
+    if not rows:
+        print("   (empty)")
+
+
+def clear():
+    global _total_bytes
+    with _lock:
+        conn = _connect()
+        conn.execute("DELETE FROM responses")
+        conn.commit()
+        _total_bytes = 0
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if command == "clear":
+        clear()
+        print("🗑️ LLM cache cleared")
+    else:
+        report()
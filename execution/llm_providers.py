@@ -0,0 +1,295 @@
+"""
+LLM Providers - One interface over Groq, Gemini and a local stand-in
+Every enrichment path talks to a Provider instead of an SDK client:
+
+    provider = get_provider("groq")
+    text = provider.generate("llama-3.3-70b-versatile", prompt, json_mode=True)
+
+provider.complete() returns (text, usage) with the prompt/completion token
+counts the API reported (None when it reported none), for usage_ledger.py.
+provider.stream() yields the completion in chunks as they arrive, so callers
+can act on (or abandon) a response before it is finished; closing the
+generator early closes the HTTP stream.
+Failures are raised as ProviderError with `rate_limited` / `not_found` set
+(and `retry_after` seconds when the API said how long to back off), so
+callers branch on flags instead of grepping exception strings.
+SDKs are imported lazily: a worker that only uses Groq never needs google-genai.
+"""
+import os
+import re
+import threading
+
+
+class ProviderError(Exception):
+    """A failed completion. rate_limited: 429/quota; not_found: unknown model; retry_after: seconds."""
+
+    def __init__(self, message, rate_limited=False, not_found=False, retry_after=None):
+        super().__init__(message)
+        self.rate_limited = rate_limited
+        self.not_found = not_found
+        self.retry_after = retry_after
+
+
+# Retry hints inside error messages: Groq "Please try again in 7.5s" / "in 1m2.5s",
+# Gemini RetryInfo "retryDelay': '37s'"
+_RETRY_IN_RE = re.compile(r"try again in (?:(\d+)m)?(\d+(?:\.\d+)?)s", re.IGNORECASE)
+_RETRY_DELAY_RE = re.compile(r"retryDelay\W+(\d+(?:\.\d+)?)s")
+
+
+def retry_after_seconds(exc):
+    """Retry-After from the HTTP response headers or the error message, or None."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        value = headers.get("retry-after")
+        try:
+            if value is not None:
+                return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+    message = str(exc)
+    match = _RETRY_IN_RE.search(message)
+    if match:
+        return int(match.group(1) or 0) * 60 + float(match.group(2))
+    match = _RETRY_DELAY_RE.search(message)
+    if match:
+        return float(match.group(1))
+    return None
+
+
+def classify_error(exc):
+    """Wraps an SDK exception in a ProviderError with the right flags."""
+    if isinstance(exc, ProviderError):
+        return exc
+    error_str = str(exc)
+    lowered = error_str.lower()
+    rate_limited = (
+        "429" in error_str
+        or "RESOURCE_EXHAUSTED" in error_str
+        or "quota" in lowered
+        or "rate limit" in lowered
+        or "rate_limit" in lowered
+    )
+    not_found = "404" in error_str or "not found" in lowered
+    return ProviderError(
+        error_str,
+        rate_limited=rate_limited,
+        not_found=not_found and not rate_limited,
+        retry_after=retry_after_seconds(exc) if rate_limited else None
+    )
+
+
+class Provider:
+    """
+    Base provider. Subclasses implement _complete(model, prompt, json_mode)
+    returning (text, usage), usage being {"prompt_tokens", "completion_tokens"} or None,
+    and may implement _stream(model, prompt, json_mode, usage) yielding text
+    chunks (the default yields the whole completion at once).
+    """
+
+    kind = "base"
+    key_env = None
+
+    def __init__(self, api_key=None):
+        self.api_key = api_key or (os.environ.get(self.key_env) if self.key_env else None)
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        """True if the provider has what it needs to make calls."""
+        return bool(self.api_key)
+
+    def client(self):
+        """Builds the SDK client once (thread-safe)."""
+        with self._lock:
+            if self._client is None:
+                self._client = self._make_client()
+        return self._client
+
+    def _make_client(self):
+        return None
+
+    def generate(self, model, prompt, json_mode=True):
+        """Returns the completion text; raises ProviderError on failure."""
+        return self.complete(model, prompt, json_mode)[0]
+
+    def complete(self, model, prompt, json_mode=True):
+        """Returns (text, usage); raises ProviderError on failure."""
+        if not self.available:
+            raise ProviderError(f"{self.kind}: no API key configured")
+        try:
+            text, usage = self._complete(model, prompt, json_mode)
+        except Exception as e:
+            raise classify_error(e)
+        if not text:
+            raise ProviderError(f"{self.kind}/{model}: empty response")
+        return text, usage
+
+    def stream(self, model, prompt, json_mode=True, usage=None):
+        """
+        Yields completion text chunks; raises ProviderError on failure.
+        usage (a dict) is filled in when the API reports token counts.
+        """
+        if not self.available:
+            raise ProviderError(f"{self.kind}: no API key configured")
+        chunks = self._stream(model, prompt, json_mode, usage if usage is not None else {})
+        received = False
+        try:
+            for chunk in chunks:
+                if chunk:
+                    received = True
+                    yield chunk
+        except Exception as e:  # GeneratorExit (caller closed the stream) is not an Exception
+            raise classify_error(e)
+        finally:
+            chunks.close()
+        if not received:
+            raise ProviderError(f"{self.kind}/{model}: empty response")
+
+    def _complete(self, model, prompt, json_mode):
+        raise NotImplementedError
+
+    def _stream(self, model, prompt, json_mode, usage):
+        text, reported = self._complete(model, prompt, json_mode)
+        usage.update(reported or {})
+        yield text
+
+
+class GroqProvider(Provider):
+    kind = "groq"
+    key_env = "GROQ_API_KEY"
+
+    def _make_client(self):
+        from groq import Groq
+        return Groq(api_key=self.api_key)
+
+    def _complete(self, model, prompt, json_mode):
+        kwargs = {}
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}  # Groq supports JSON mode natively
+        completion = self.client().chat.completions.create(
+            messages=[{"role": "user", "content": prompt}],
+            model=model,
+            temperature=0,
+            **kwargs
+        )
+        usage = getattr(completion, "usage", None)
+        return completion.choices[0].message.content, usage and {
+            "prompt_tokens": usage.prompt_tokens or 0,
+            "completion_tokens": usage.completion_tokens or 0,
+        }
+
+    def _stream(self, model, prompt, json_mode, usage):
+        if json_mode:
+            # Groq's JSON mode does not stream: keep it, as one chunk
+            yield from super()._stream(model, prompt, json_mode, usage)
+            return
+        stream = self.client().chat.completions.create(
+            messages=[{"role": "user", "content": prompt}],
+            model=model,
+            temperature=0,
+            stream=True
+        )
+        try:
+            for chunk in stream:
+                reported = getattr(getattr(chunk, "x_groq", None), "usage", None)
+                if reported:
+                    usage.update(prompt_tokens=reported.prompt_tokens or 0,
+                                 completion_tokens=reported.completion_tokens or 0)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            stream.close()
+
+
+class GeminiProvider(Provider):
+    kind = "gemini"
+    key_env = "GOOGLE_API_KEY"
+
+    def _make_client(self):
+        from google import genai
+        return genai.Client(api_key=self.api_key)
+
+    def _complete(self, model, prompt, json_mode):
+        kwargs = {}
+        if json_mode:
+            kwargs["config"] = {"response_mime_type": "application/json"}
+        response = self.client().models.generate_content(
+            model=model,
+            contents=prompt,
+            **kwargs
+        )
+        usage = getattr(response, "usage_metadata", None)
+        return response.text, usage and {
+            "prompt_tokens": usage.prompt_token_count or 0,
+            "completion_tokens": usage.candidates_token_count or 0,
+        }
+
+    def _stream(self, model, prompt, json_mode, usage):
+        kwargs = {}
+        if json_mode:
+            kwargs["config"] = {"response_mime_type": "application/json"}
+        for response in self.client().models.generate_content_stream(model=model, contents=prompt, **kwargs):
+            reported = getattr(response, "usage_metadata", None)
+            if reported and reported.candidates_token_count:
+                usage.update(prompt_tokens=reported.prompt_token_count or 0,
+                             completion_tokens=reported.candidates_token_count or 0)
+            if response.text:
+                yield response.text
+
+
+class LocalProvider(Provider):
+    """
+    CPU-only stand-in for dry runs and offline testing. No network, no key.
+    Answers the extraction prompt with keyword heuristics: relevant if the
+    text reads like a residential tower story, with floors/units pulled by regex.
+    """
+
+    kind = "local"
+
+    RELEVANT_TERMS = ("condo", "tower", "high-rise", "residential", "apartment", "units", "stories")
+    IRRELEVANT_TERMS = ("single-family", "restaurant", "retail store", "election")
+
+    @property
+    def available(self):
+        return True
+
+    def _complete(self, model, prompt, json_mode):
+        import json
+
+        text = prompt.rsplit("TEXT:", 1)[-1].lower()
+        hits = sum(text.count(term) for term in self.RELEVANT_TERMS)
+        misses = sum(text.count(term) for term in self.IRRELEVANT_TERMS)
+        if hits < 3 or misses > hits:
+            return json.dumps({"relevant": False}), None
+
+        floors = re.search(r"(\d{2,3})[- ]stor(?:y|ies)", text)
+        units = re.search(r"(\d{2,4})\s+(?:residential\s+)?units", text)
+        return json.dumps({
+            "relevant": True,
+            "name": None,
+            "floors": int(floors.group(1)) if floors else None,
+            "units": int(units.group(1)) if units else None,
+            "description": "Local stand-in extraction (no LLM call).",
+        }), None
+
+
+PROVIDERS = {
+    "groq": GroqProvider,
+    "gemini": GeminiProvider,
+    "local": LocalProvider,
+}
+
+_INSTANCES = {}
+_INSTANCES_LOCK = threading.Lock()
+
+
+def get_provider(kind):
+    """Shared provider instance by kind ("groq", "gemini", "local")."""
+    with _INSTANCES_LOCK:
+        if kind not in _INSTANCES:
+            if kind not in PROVIDERS:
+                raise ValueError(f"Unknown LLM provider: {kind}")
+            _INSTANCES[kind] = PROVIDERS[kind]()
+        return _INSTANCES[kind]
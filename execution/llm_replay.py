@@ -0,0 +1,336 @@
+"""
+LLM Replay - Record real provider calls to fixtures and replay them offline
+Benchmarks and regression runs of the enrichers need no keys, quota or network:
+
+    LLM_RECORD=data/llm_fixtures.jsonl   wrap every real provider; each call
+                                         (prompt, response, usage, latency, or
+                                         the error) is appended to the fixture file
+    LLM_REPLAY=data/llm_fixtures.jsonl   every remote provider is replaced by a
+                                         ReplayProvider answering from the fixtures
+
+Replay is deterministic: responses are keyed by (model, prompt hash) and
+repeated prompts cycle through their recordings in order. Random draws
+(latency, injected 429s) come from an RNG seeded per (LLM_REPLAY_SEED, prompt,
+call number), so a run does not depend on thread scheduling.
+
+Replay knobs (environment):
+    LLM_REPLAY_KEYS      fake API keys per provider (default 1)
+    LLM_REPLAY_LATENCY   "recorded" (default), "fixed:S", "uniform:A,B",
+                         "normal:MEAN,SD" or "lognormal:MEDIAN,SIGMA" (seconds)
+    LLM_REPLAY_429_RATE  probability of an injected 429 per call (default 0)
+    LLM_REPLAY_RPM       server-side requests/min per key; calls above it get a
+                         429 with Retry-After, like the real APIs (default 0 = off)
+    LLM_REPLAY_STRICT    1: a prompt missing from the fixtures raises; default
+                         answers with the local heuristic and counts a miss
+    LLM_REPLAY_SEED      RNG seed (default 0)
+
+Usage:
+    python3 execution/llm_replay.py stats [fixtures]   # calls, models, latency percentiles, 429 rate
+"""
+import collections
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+import llm_providers
+
+DEFAULT_FIXTURES = Path(__file__).parent.parent / "data" / "llm_fixtures.jsonl"
+
+RECORD_PATH = os.environ.get("LLM_RECORD")
+REPLAY_PATH = os.environ.get("LLM_REPLAY")
+REPLAY_KEYS = int(os.environ.get("LLM_REPLAY_KEYS", "1"))
+REPLAY_LATENCY = os.environ.get("LLM_REPLAY_LATENCY", "recorded")
+REPLAY_429_RATE = float(os.environ.get("LLM_REPLAY_429_RATE", "0"))
+REPLAY_RPM = float(os.environ.get("LLM_REPLAY_RPM", "0"))
+REPLAY_STRICT = os.environ.get("LLM_REPLAY_STRICT", "0") == "1"
+REPLAY_SEED = os.environ.get("LLM_REPLAY_SEED", "0")
+
+# Latency for "recorded" mode when a fixture has none (errors, hand-written fixtures)
+FALLBACK_LATENCY = 1.0
+
+# Streamed replays: time to first chunk as a share of the latency, and chunks per response
+FIRST_TOKEN_SHARE = 0.3
+STREAM_CHUNKS = 8
+
+STATS = {"calls": 0, "hits": 0, "misses": 0, "injected_429": 0, "quota_429": 0, "latency": 0.0}
+_STATS_LOCK = threading.Lock()
+
+
+def prompt_hash(prompt):
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def count(stat, amount=1):
+    with _STATS_LOCK:
+        STATS[stat] += amount
+
+
+def reset_stats():
+    """Zeroes STATS and the per-prompt call numbers (a fresh, identical replay)."""
+    with _STATS_LOCK:
+        for stat in STATS:
+            STATS[stat] = 0
+    with _FIXTURES_LOCK:
+        _CALLS.clear()
+
+
+# --- RECORDING ---
+_RECORD_LOCK = threading.Lock()
+
+
+def append_fixture(path, entry):
+    with _RECORD_LOCK:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+class RecordingProvider(llm_providers.Provider):
+    """Wraps a real provider and appends every call to the fixture file."""
+
+    def __init__(self, inner, path):
+        super().__init__(api_key=inner.api_key)
+        self.inner = inner
+        self.kind = inner.kind
+        self.path = path
+
+    @property
+    def available(self):
+        return self.inner.available
+
+    def complete(self, model, prompt, json_mode=True):
+        entry = {"kind": self.kind, "model": model, "prompt_hash": prompt_hash(prompt), "prompt": prompt,
+                 "recorded_at": time.time()}
+        started = time.monotonic()
+        try:
+            text, usage = self.inner.complete(model, prompt, json_mode)
+        except llm_providers.ProviderError as e:
+            entry.update(latency=round(time.monotonic() - started, 3), error=str(e),
+                         rate_limited=e.rate_limited, retry_after=e.retry_after)
+            append_fixture(self.path, entry)
+            raise
+        entry.update(latency=round(time.monotonic() - started, 3), response=text, usage=usage)
+        append_fixture(self.path, entry)
+        return text, usage
+
+    def stream(self, model, prompt, json_mode=True, usage=None):
+        """
+        Passes the stream through. A stream the caller closed early (early
+        abort) is recorded with what it read so far and partial=True: the same
+        watcher stops at the same point on replay.
+        """
+        usage = usage if usage is not None else {}
+        entry = {"kind": self.kind, "model": model, "prompt_hash": prompt_hash(prompt), "prompt": prompt,
+                 "recorded_at": time.time()}
+        started = time.monotonic()
+        parts = []
+        try:
+            for chunk in self.inner.stream(model, prompt, json_mode, usage):
+                parts.append(chunk)
+                yield chunk
+        except llm_providers.ProviderError as e:
+            entry.update(latency=round(time.monotonic() - started, 3), error=str(e),
+                         rate_limited=e.rate_limited, retry_after=e.retry_after)
+            append_fixture(self.path, entry)
+            raise
+        except GeneratorExit:
+            entry.update(latency=round(time.monotonic() - started, 3), response="".join(parts),
+                         usage=usage or None, partial=True)
+            append_fixture(self.path, entry)
+            raise
+        entry.update(latency=round(time.monotonic() - started, 3), response="".join(parts), usage=usage or None)
+        append_fixture(self.path, entry)
+
+
+# --- REPLAY ---
+def load_fixtures(path):
+    """{(model, prompt_hash): [entries]} of successful recordings, in file order."""
+    fixtures = collections.defaultdict(list)
+    if not Path(path).exists():
+        return fixtures
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if entry.get("response"):
+                fixtures[(entry["model"], entry["prompt_hash"])].append(entry)
+    return fixtures
+
+
+def parse_latency(spec):
+    """Latency spec -> function (rng, recorded_latency) -> seconds."""
+    name, _, args = (spec or "recorded").partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()]
+    if name == "fixed":
+        return lambda rng, recorded: values[0]
+    if name == "uniform":
+        return lambda rng, recorded: rng.uniform(values[0], values[1])
+    if name == "normal":
+        return lambda rng, recorded: max(0.0, rng.gauss(values[0], values[1]))
+    if name == "lognormal":
+        return lambda rng, recorded: rng.lognormvariate(math.log(values[0]), values[1])
+    if name == "recorded":
+        return lambda rng, recorded: FALLBACK_LATENCY if recorded is None else recorded
+    raise ValueError(f"Unknown LLM_REPLAY_LATENCY: {spec}")
+
+
+_FIXTURES = None
+_FIXTURES_LOCK = threading.Lock()
+_CALLS = collections.Counter()  # (model, prompt hash) -> calls so far, across keys
+
+
+def next_call(key):
+    """Number of earlier calls with this prompt (picks the recording and seeds the RNG)."""
+    with _FIXTURES_LOCK:
+        n = _CALLS[key]
+        _CALLS[key] += 1
+        return n
+
+
+def fixtures():
+    """Fixtures from REPLAY_PATH, loaded once per process."""
+    global _FIXTURES
+    with _FIXTURES_LOCK:
+        if _FIXTURES is None:
+            _FIXTURES = load_fixtures(REPLAY_PATH)
+        return _FIXTURES
+
+
+class ReplayProvider(llm_providers.Provider):
+    """
+    Offline stand-in for one API key of a remote provider. Answers from the
+    fixtures after a simulated latency (streamed in chunks over that latency
+    by stream()); injects 429s at LLM_REPLAY_429_RATE and past LLM_REPLAY_RPM
+    like the real APIs.
+    """
+
+    def __init__(self, kind, index):
+        super().__init__(api_key=f"replay-{kind}-{index + 1:04d}")
+        self.kind = kind
+        self.latency = parse_latency(REPLAY_LATENCY)
+        self.window = collections.deque()   # start times within the last minute (RPM quota)
+        self.local = llm_providers.LocalProvider()
+
+    def _over_quota(self):
+        """Sliding-window RPM check. Returns Retry-After seconds, or None if within quota."""
+        if REPLAY_RPM <= 0:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            while self.window and now - self.window[0] >= 60.0:
+                self.window.popleft()
+            if len(self.window) >= REPLAY_RPM:
+                return round(60.0 - (now - self.window[0]), 2)
+            self.window.append(now)
+        return None
+
+    def _respond(self, model, prompt, json_mode):
+        """(text, usage, latency) for a call, or raises the injected/quota 429."""
+        key = (model, prompt_hash(prompt))
+        n = next_call(key)
+        rng = random.Random(f"{REPLAY_SEED}:{key[0]}:{key[1]}:{n}")
+        count("calls")
+
+        retry_after = self._over_quota()
+        if retry_after is not None:
+            count("quota_429")
+            raise llm_providers.ProviderError(f"429 Rate limit reached. Please try again in {retry_after}s",
+                                              rate_limited=True, retry_after=retry_after)
+        if REPLAY_429_RATE and rng.random() < REPLAY_429_RATE:
+            count("injected_429")
+            raise llm_providers.ProviderError("429 Too Many Requests (injected)", rate_limited=True)
+
+        recordings = fixtures().get(key)
+        if recordings:
+            entry = recordings[n % len(recordings)]
+            count("hits")
+        elif REPLAY_STRICT:
+            count("misses")
+            raise llm_providers.ProviderError(f"replay: no fixture for {model} prompt {key[1][:12]}")
+        else:
+            text, _ = self.local._complete(model, prompt, json_mode)
+            entry = {"response": text, "usage": None, "latency": None}
+            count("misses")
+
+        delay = self.latency(rng, entry.get("latency"))
+        count("latency", delay)
+        return entry["response"], entry.get("usage"), delay
+
+    def _complete(self, model, prompt, json_mode):
+        text, usage, delay = self._respond(model, prompt, json_mode)
+        time.sleep(delay)
+        return text, usage
+
+    def _stream(self, model, prompt, json_mode, usage):
+        """The response in STREAM_CHUNKS pieces: FIRST_TOKEN_SHARE of the latency, then the rest spread evenly."""
+        text, reported, delay = self._respond(model, prompt, json_mode)
+        time.sleep(delay * FIRST_TOKEN_SHARE)
+        size = max(1, -(-len(text) // STREAM_CHUNKS))
+        for i in range(0, len(text), size):
+            if i:
+                time.sleep(delay * (1 - FIRST_TOKEN_SHARE) / STREAM_CHUNKS)
+            yield text[i:i + size]
+        time.sleep(delay * (1 - FIRST_TOKEN_SHARE) / STREAM_CHUNKS)
+        usage.update(reported or {})
+
+
+def replay_providers(kind):
+    """LLM_REPLAY_KEYS fake keys for a provider kind."""
+    return [ReplayProvider(kind, i) for i in range(max(1, REPLAY_KEYS))]
+
+
+def wrap_providers(kind, providers):
+    """Hook for credential_pool: swaps in replay providers or wraps for recording per the env."""
+    if kind not in llm_providers.PROVIDERS or llm_providers.PROVIDERS[kind].key_env is None:
+        return providers  # keyless local stand-in: nothing to record or replay
+    if REPLAY_PATH:
+        return replay_providers(kind)
+    if RECORD_PATH:
+        return [RecordingProvider(p, RECORD_PATH) for p in providers]
+    return providers
+
+
+# --- FIXTURE STATS ---
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def report(path):
+    calls = collections.Counter()
+    rate_limited = collections.Counter()
+    latencies = collections.defaultdict(list)
+    prompts = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            model = f"{entry['kind']}/{entry['model']}"
+            calls[model] += 1
+            prompts.add((entry["model"], entry["prompt_hash"]))
+            if entry.get("rate_limited"):
+                rate_limited[model] += 1
+            elif entry.get("response") and entry.get("latency") is not None:
+                latencies[model].append(entry["latency"])
+    print(f"🎞️ {sum(calls.values())} recorded calls, {len(prompts)} distinct prompts ({path})")
+    for model, n in calls.most_common():
+        lat = latencies[model]
+        print(f"   {model:40s} {n:6d} calls  429 rate {rate_limited[model] / n:5.1%}  "
+              f"latency p50 {percentile(lat, 0.5):.2f}s p95 {percentile(lat, 0.95):.2f}s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "stats":
+        report(sys.argv[2] if len(sys.argv) > 2 else RECORD_PATH or REPLAY_PATH or DEFAULT_FIXTURES)
+    else:
+        print(__doc__)
@@ -48,14 +48,11 @@ def main():
         except Exception as e:
             log(f"⚠️ Status check failed: {e}")
 
-        # 2. Run Fast Fix (Regex)
-        run_script("execution/regex_date_fix.py")
-        
-        # 3. Run Slow Fix (Gemini Backfill)
+        # 2. Run Backfill (local heuristic, no LLM)
         # This scans for processed signals without dates
         run_script("execution/backfill_dates.py")
         
-        # 4. Wait a bit
+        # 3. Wait a bit
         log("⏳ Sleeping 10s before next pass...")
         time.sleep(10)
         iteration += 1
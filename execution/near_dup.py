@@ -0,0 +1,159 @@
+"""
+Near-Duplicate Detector - MinHash + LSH over recent raw_signals
+Syndicated coverage (YIMBY, Curbed, The Real Deal, press-release rewrites)
+lands as separate raw_signals. Only article-level signals (dredge, deep
+harvest) are checked: homepage snapshots differ by a headline or two and
+are compared line by line against the previous snapshot instead (harvester.py). Each new
+signal gets a MinHash signature of its word shingles (one-permutation
+hashing: each shingle is hashed once and binned, so a signature costs
+O(shingles) instead of O(shingles x permutations)); an LSH band index over
+recent signals finds candidates in O(bands), and the signature estimate of
+Jaccard similarity confirms them. Confirmed duplicates are saved with
+`duplicate_of` and processed=True so the enrichers only pay for one copy.
+"""
+import hashlib
+import re
+import time
+
+# Tuning
+SHINGLE_SIZE = 3          # words per shingle
+NUM_PERM = 64             # MinHash permutations
+LSH_BANDS = 16            # 16 bands x 4 rows -> candidate threshold ~0.5
+DUPLICATE_THRESHOLD = 0.7  # estimated Jaccard required to call it a duplicate
+MAX_CHARS = 8000          # only the head of the article is shingled
+RECENT_DAYS = 60          # signals older than this are not indexed
+
+_EMPTY_BIN = 1 << 64
+
+_WORD_RE = re.compile(r"[a-z0-9$]+")
+
+
+def shingles(text):
+    """Set of 64-bit hashes of word shingles from the head of the text."""
+    words = _WORD_RE.findall(text[:MAX_CHARS].lower())
+    if len(words) < SHINGLE_SIZE:
+        words = words + [""] * (SHINGLE_SIZE - len(words))
+
+    hashed = set()
+    for i in range(len(words) - SHINGLE_SIZE + 1):
+        shingle = " ".join(words[i:i + SHINGLE_SIZE]).encode("utf-8")
+        hashed.add(int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), "little"))
+    return hashed
+
+
+def minhash(text):
+    """
+    MinHash signature (tuple of NUM_PERM ints) for a text.
+    Bin = hash % NUM_PERM, value = min(hash // NUM_PERM) per bin; empty bins
+    borrow the next non-empty bin (rotation densification) with a bin offset
+    so they still compare like independent permutations.
+    """
+    bins = [_EMPTY_BIN] * NUM_PERM
+    for h in shingles(text or ""):
+        b = h % NUM_PERM
+        v = h // NUM_PERM
+        if v < bins[b]:
+            bins[b] = v
+
+    if all(v == _EMPTY_BIN for v in bins):
+        return tuple(bins)
+
+    signature = list(bins)
+    for b in range(NUM_PERM):
+        if signature[b] != _EMPTY_BIN:
+            continue
+        offset = 1
+        while bins[(b + offset) % NUM_PERM] == _EMPTY_BIN:
+            offset += 1
+        signature[b] = bins[(b + offset) % NUM_PERM] + offset * _EMPTY_BIN
+    return tuple(signature)
+
+
+def estimate_similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity from two signatures."""
+    same = sum(1 for x, y in zip(sig_a, sig_b) if x == y)
+    return same / len(sig_a)
+
+
+class NearDupIndex:
+    """LSH band index mapping signatures to the signal ids that produced them."""
+
+    def __init__(self, bands=LSH_BANDS, threshold=DUPLICATE_THRESHOLD):
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.threshold = threshold
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield band, signature[start:start + self.rows]
+
+    def add(self, signal_id, signature):
+        """Indexes a signal's signature."""
+        self.signatures[signal_id] = signature
+        for band, key in self._band_keys(signature):
+            self.buckets[band].setdefault(key, []).append(signal_id)
+
+    def find_duplicate(self, signature):
+        """Returns (signal_id, similarity) of the best match above threshold, or (None, 0.0)."""
+        candidates = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self.buckets[band].get(key, ()))
+
+        best_id, best_score = None, 0.0
+        for candidate in candidates:
+            score = estimate_similarity(signature, self.signatures[candidate])
+            if score > best_score:
+                best_id, best_score = candidate, score
+
+        if best_score >= self.threshold:
+            return best_id, best_score
+        return None, 0.0
+
+    def __len__(self):
+        return len(self.signatures)
+
+
+def build_index(signals, recent_days=RECENT_DAYS):
+    """
+    Builds an index from raw_signals rows created in the last `recent_days`.
+    Rows already flagged as duplicates are skipped (their original is indexed).
+    """
+    index = NearDupIndex()
+    min_created = int((time.time() - recent_days * 86400) * 1000)
+
+    for signal in signals:
+        if signal.get("duplicate_of"):
+            continue
+        if (signal.get("created_at") or 0) < min_created:
+            continue
+        content = signal.get("content")
+        if content and signal.get("id"):
+            index.add(signal["id"], minhash(content))
+
+    return index
+
+
+def check_duplicate(index, content):
+    """
+    Ingest hook. Returns (fields, signature): `fields` are the payload fields to
+    add to the new raw_signal (duplicate_of + processed=True for duplicates,
+    empty for originals). Index the signature with index.add() once an
+    original is saved.
+    """
+    if index is None or not content:
+        return {}, None
+
+    signature = minhash(content)
+    original_id, score = index.find_duplicate(signature)
+    if original_id:
+        return {
+            "duplicate_of": original_id,
+            "duplicate_score": round(score, 3),
+            "processed": True,
+            "status": "DUPLICATE"
+        }, signature
+
+    return {}, signature
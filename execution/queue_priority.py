@@ -0,0 +1,140 @@
+"""
+Queue Priority - Which claimable signals the enrichment engine takes first
+claim_signals used to lease whatever order InstantDB returned, so a fresh
+groundbreaking announcement could sit behind thousands of backfill articles.
+Every claimable signal now gets a priority:
+- freshness: publish date (article_date, else the date in its URL), else
+  when it was harvested; halves every FRESH_HALF_LIFE_DAYS
+- source quality: projects saved per signal settled from that source
+  (usage_ledger outcomes), smoothed towards PRIOR_YIELD for new sources
+- pre-filter score: relevance_filter.score of the article text
+- minus a small penalty per failed attempt
+and belongs to a lane: "live" (published, or harvested when the publish
+date is unknown, within LIVE_MAX_AGE_DAYS) or "backfill" (older, or saved
+by a backfill dredge with no publish date). Each batch gives LIVE_SHARE of
+its slots to the best live signals and the rest to the best backfill ones,
+so backfill keeps progressing under a steady live stream; a lane's unused
+slots go to the other.
+The pre-filter score is the expensive part, so it is only computed for a
+bounded window per lane (SCORE_WINDOW x the slots, ranked by the other
+components); the rest of the backlog is ranked without it.
+
+Configuration (environment):
+    ENRICH_LIVE_SHARE     share of each batch reserved for live signals (default 0.75)
+    ENRICH_LIVE_DAYS      age in days up to which a signal is live (default 14)
+"""
+import math
+import os
+import threading
+import time
+import date_window
+import relevance_filter
+import usage_ledger
+
+LIVE_SHARE = min(1.0, max(0.0, float(os.environ.get("ENRICH_LIVE_SHARE", "0.75"))))
+LIVE_MAX_AGE_DAYS = float(os.environ.get("ENRICH_LIVE_DAYS", "14"))
+FRESH_HALF_LIFE_DAYS = 7.0
+
+# Priority = weighted sum of components in [0, 1], minus the retry penalty
+WEIGHTS = {"freshness": 0.5, "source": 0.2, "prefilter": 0.3}
+RETRY_PENALTY = 0.05
+# Candidates per claim slot that get a relevance_filter score
+SCORE_WINDOW = 4
+
+# Source yield (projects / signals), smoothed: a new source counts as PRIOR_WEIGHT signals at PRIOR_YIELD
+PRIOR_YIELD = 0.2
+PRIOR_WEIGHT = 10
+YIELD_WINDOW_HOURS = 30 * 24
+YIELD_REFRESH_SECONDS = 600
+
+_yields = {"at": 0.0, "by_source": {}}
+_lock = threading.Lock()
+
+LAST_SELECTION = {"live": 0, "backfill": 0, "live_waiting": 0, "backfill_waiting": 0}
+
+
+def source_yields():
+    """{source: (signals, projects)} from the usage ledger, refreshed every YIELD_REFRESH_SECONDS."""
+    with _lock:
+        if time.time() - _yields["at"] < YIELD_REFRESH_SECONDS:
+            return _yields["by_source"]
+    by_source = usage_ledger.source_outcomes(hours=YIELD_WINDOW_HOURS)
+    with _lock:
+        _yields["at"] = time.time()
+        _yields["by_source"] = by_source
+    return by_source
+
+
+def source_quality(source, yields):
+    signals, projects = yields.get(source, (0, 0))
+    return min(1.0, (projects + PRIOR_YIELD * PRIOR_WEIGHT) / (signals + PRIOR_WEIGHT))
+
+
+def age_days(signal, now_ts):
+    """(days since publication or harvest, whether the publish date is known)."""
+    published = date_window.parse_timestamp(signal.get("article_date")) or date_window.parse_url_date(signal.get("url"))
+    if published:
+        return (now_ts / 1000 - date_window.date_to_ms(published) / 1000) / 86400, True
+    created = signal.get("created_at") or now_ts
+    return (now_ts - created) / 86400000, False
+
+
+def lane(signal, now_ts):
+    age, dated = age_days(signal, now_ts)
+    if not dated and signal.get("harvest_mode") == "backfill":
+        return "backfill"
+    return "live" if age <= LIVE_MAX_AGE_DAYS else "backfill"
+
+
+def base_priority(signal, now_ts, yields, source_of):
+    """Priority without the pre-filter component (cheap: no article scoring)."""
+    age, _ = age_days(signal, now_ts)
+    score = (WEIGHTS["freshness"] * 0.5 ** (max(0.0, age) / FRESH_HALF_LIFE_DAYS)
+             + WEIGHTS["source"] * source_quality(source_of(signal), yields))
+    return score - RETRY_PENALTY * (signal.get("attempts") or 0)
+
+
+def rank(signals, slots):
+    """
+    Sorts a lane's (base priority, signal) entries best first. Only the top
+    SCORE_WINDOW x slots by base priority get the pre-filter score added and
+    compete for the slots; the rest follow in base-priority order.
+    """
+    signals.sort(key=lambda entry: entry[0], reverse=True)
+    window = slots * SCORE_WINDOW
+    head = [(base + WEIGHTS["prefilter"] * relevance_filter.score(signal.get("content") or ""), signal)
+            for base, signal in signals[:window]]
+    head.sort(key=lambda entry: entry[0], reverse=True)
+    return head + signals[window:]
+
+
+def select(candidates, limit, source_of=lambda s: s.get("source_id") or "unknown", now_ts=None):
+    """
+    The `limit` signals to claim from `candidates`: LIVE_SHARE of the slots
+    for the best live ones, the rest for the best backfill ones (unused slots
+    go to the other lane). Returned highest priority first.
+    """
+    now_ts = now_ts or int(time.time() * 1000)
+    yields = source_yields()
+    lanes = {"live": [], "backfill": []}
+    for signal in candidates:
+        lanes[lane(signal, now_ts)].append((base_priority(signal, now_ts, yields, source_of), signal))
+
+    live_slots = min(len(lanes["live"]), math.ceil(limit * LIVE_SHARE))
+    backfill_slots = min(len(lanes["backfill"]), limit - live_slots)
+    live_slots = min(len(lanes["live"]), limit - backfill_slots)
+    lanes = {"live": rank(lanes["live"], live_slots), "backfill": rank(lanes["backfill"], backfill_slots)}
+    chosen = lanes["live"][:live_slots] + lanes["backfill"][:backfill_slots]
+    chosen.sort(key=lambda entry: entry[0], reverse=True)
+
+    LAST_SELECTION.update(live=live_slots, backfill=backfill_slots,
+                          live_waiting=len(lanes["live"]) - live_slots,
+                          backfill_waiting=len(lanes["backfill"]) - backfill_slots)
+    return [signal for _, signal in chosen]
+
+
+def summary():
+    """One-line report of the last selection."""
+    s = dict(LAST_SELECTION)
+    return (f"Queue: {s['live']} live (+{s['live_waiting']:,} waiting), "
+            f"{s['backfill']} backfill (+{s['backfill_waiting']:,} waiting), live share {LIVE_SHARE:.0%}")
@@ -0,0 +1,173 @@
+"""
+Rate Limiter - Requests/min and tokens/min token buckets per provider + model
+Replaces the fixed sleeps between LLM calls. Each (provider, model) pair gets
+two buckets sized to its quota; a call goes out as soon as both have room,
+so concurrent workers use the whole quota instead of one request per sleep.
+
+Quotas are per API key (see credential_pool.py), default to the free tiers
+below and can be overridden without a deploy:
+    ENRICH_RATE_LIMITS="groq/llama-3.3-70b-versatile=60:24000,gemini/gemini-2.0-flash=30:1000000"
+"""
+import os
+import threading
+import time
+from token_count import count_tokens
+
+# (provider, model) -> (requests per minute, tokens per minute)
+RATE_LIMITS = {
+    ("groq", "llama-3.3-70b-versatile"): (30, 12000),
+    ("groq", "llama-3.1-8b-instant"): (30, 6000),
+    ("gemini", "gemini-flash-latest"): (15, 1000000),
+    ("gemini", "gemini-2.0-flash"): (15, 1000000),
+}
+
+# Unknown models on a remote provider get a conservative default
+DEFAULT_LIMIT = (10, 100000)
+
+# Providers that never need limiting
+UNLIMITED_PROVIDERS = {"local"}
+
+# Completion tokens reserved per call on top of the prompt estimate
+OUTPUT_TOKEN_RESERVE = 600
+
+
+def parse_overrides(spec):
+    """Parses "provider/model=rpm:tpm,..." into {(provider, model): (rpm, tpm)}."""
+    overrides = {}
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item or "=" not in item or "/" not in item:
+            continue
+        key, value = item.split("=", 1)
+        provider, model = key.split("/", 1)
+        try:
+            rpm, tpm = (float(v) for v in value.split(":", 1))
+        except ValueError:
+            continue
+        overrides[(provider.strip(), model.strip())] = (rpm, tpm)
+    return overrides
+
+
+def estimate_tokens(text, completions=1, reserve=OUTPUT_TOKEN_RESERVE):
+    """Prompt size in tokens plus the completion reserve for each expected result."""
+    return count_tokens(text) + reserve * completions
+
+
+class TokenBucket:
+    """Refills `per_minute` units evenly over 60s, holding at most one minute's worth."""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """Seconds until `amount` units are available (0 if available now)."""
+        amount = min(amount, self.capacity)  # an oversized request waits for a full bucket
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount):
+        self.level -= min(amount, self.capacity)
+
+
+class ModelLimiter:
+    """The RPM + TPM bucket pair for one (provider, model). Thread-safe."""
+
+    def __init__(self, rpm, tpm):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.lock = threading.Lock()
+
+    def _wait_locked(self, tokens):
+        now = time.monotonic()
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        return max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+
+    def wait_time(self, tokens):
+        """Seconds until a call of `tokens` could start."""
+        with self.lock:
+            return self._wait_locked(tokens)
+
+    def try_acquire(self, tokens):
+        """Takes capacity for one call if it is available right now."""
+        with self.lock:
+            if self._wait_locked(tokens) > 0:
+                return False
+            self.requests.consume(1)
+            self.tokens.consume(tokens)
+            return True
+
+    def acquire(self, tokens, max_wait=60.0):
+        """Blocks until capacity is available. Returns False if that would exceed max_wait."""
+        deadline = time.monotonic() + max_wait
+        while True:
+            with self.lock:
+                wait = self._wait_locked(tokens)
+                if wait <= 0:
+                    self.requests.consume(1)
+                    self.tokens.consume(tokens)
+                    return True
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(min(wait, 1.0))
+
+    def penalize(self):
+        """Empties both buckets after a 429 so callers back off for a refill period."""
+        with self.lock:
+            now = time.monotonic()
+            for bucket in (self.requests, self.tokens):
+                bucket.refill(now)
+                bucket.level = 0.0
+
+
+class NullLimiter:
+    """Limiter for providers without quotas."""
+
+    def wait_time(self, tokens):
+        return 0.0
+
+    def try_acquire(self, tokens):
+        return True
+
+    def acquire(self, tokens, max_wait=60.0):
+        return True
+
+    def penalize(self):
+        pass
+
+
+_LIMITERS = {}
+_LIMITERS_LOCK = threading.Lock()
+_OVERRIDES = parse_overrides(os.environ.get("ENRICH_RATE_LIMITS"))
+
+
+def get_limiter(provider, model, key_id=None):
+    """
+    Shared limiter for a (provider, model) pair. With key_id, each API key
+    gets its own buckets (quotas are per key).
+    """
+    key = (provider, model)
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get((key, key_id))
+        if limiter is None:
+            if provider in UNLIMITED_PROVIDERS:
+                limiter = NullLimiter()
+            else:
+                rpm, tpm = _OVERRIDES.get(key) or RATE_LIMITS.get(key) or DEFAULT_LIMIT
+                limiter = ModelLimiter(rpm, tpm)
+            _LIMITERS[(key, key_id)] = limiter
+        return limiter
+
+
+def reset_limiters():
+    """Drops every limiter (full buckets), e.g. between benchmark runs."""
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
@@ -1,53 +1,13 @@
-import re
 import db_client
-from dateutil import parser
+import date_window
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 
-def extract_date_heuristic(text):
-    if not text: return None
-    
-    # Limit search to first 2000 chars (Header/Metadata area)
-    header = text[:3000]
-    
-    # 1. Look for explicit labels
-    # "Published: Jan 12, 2024"
-    explicit_pattern = r'(?i)(published|posted|date|updated)[:\s-]+([A-Z][a-z]{2,8}\s+\d{1,2},?\s+\d{4})'
-    match = re.search(explicit_pattern, header)
-    if match:
-        try:
-            dt = parser.parse(match.group(2))
-            if 2018 <= dt.year <= 2027:
-                return dt.strftime("%Y-%m-%d")
-        except:
-            pass
-
-    # 2. Look for standalone dates (Common formats)
-    # January 12, 2024
-    dates = []
-    # Regex for "Month DD, YYYY"
-    # Matches: Jan 1, 2024 | January 01, 2024 | Sept. 12, 2023
-    regex_verbose = r'([A-Z][a-z]{2,8}\.?\s+\d{1,2},?\s+\d{4})'
-    
-    candidates = re.findall(regex_verbose, header)
-    
-    for c in candidates:
-        try:
-            dt = parser.parse(c)
-            # Filter valid range for this project (2020-2026)
-            if 2020 <= dt.year <= 2027:
-                dates.append(dt)
-        except:
-            continue
-            
-    if dates:
-        # Usually the first date found in header is the pub date.
-        # But if we find multiple, maybe the one closest to "today" without being in future?
-        # Or just the first one found (top of page).
-        return dates[0].strftime("%Y-%m-%d")
-
-    return None
+def extract_date_heuristic(text, url=None):
+    """YYYY-MM-DD from the article header (see date_window.find_content_date), or None."""
+    found, _ = date_window.find_content_date(text, url)
+    return found.strftime("%Y-%m-%d") if found else None
 
 def run_fix():
     print("SEARCHING FOR DATES (REGEX MODE)...")
@@ -0,0 +1,195 @@
+"""
+Relevance Filter - CPU-only pre-filter in front of the LLM enrichment
+A large share of the backlog is retail, single-family and city politics, and
+each one used to burn a 70B call just to get {"relevant": false}. This scores
+the article text locally (keyword/regex features + a logistic model trained
+on the LLM's own historical verdicts) and auto-rejects only clear negatives;
+uncertain and positive signals still go to the LLM.
+
+The filter only rejects once a model has been trained (no model file = pass-through).
+
+Usage:
+    python3 execution/relevance_filter.py train    # learn weights from LLM verdicts on raw_signals
+    python3 execution/relevance_filter.py report   # precision/recall + throughput on held-out history
+"""
+import re
+import sys
+import time
+from pathlib import Path
+import linear_model
+
+MODEL_PATH = Path(__file__).parent.parent / "data" / "relevance_model.json"
+
+# Signals scoring below this are rejected without an LLM call
+REJECT_THRESHOLD = 0.05
+
+# Only the head of the article carries the signal; keeps scoring ~constant-time
+MAX_CHARS = 6000
+
+# Prior weights (log-odds) for word features
+KEYWORD_WEIGHTS = {
+    "condo": 1.5, "condominium": 1.5, "tower": 1.2, "high-rise": 1.5, "highrise": 1.5,
+    "residential": 1.0, "units": 1.0, "apartments": 0.8, "multifamily": 1.2, "mixed-use": 1.0,
+    "residences": 1.2, "penthouse": 0.8, "developer": 0.6, "groundbreaking": 0.8,
+    "restaurant": -1.2, "menu": -1.5, "chef": -1.5, "brunch": -2.0, "election": -1.5,
+    "mayor": -0.8, "commissioner": -0.5, "single-family": -1.2, "warehouse": -1.0,
+    "industrial": -0.8, "retail": -0.5, "police": -1.5, "shooting": -2.0, "football": -2.0,
+}
+
+# Regex features: (name, compiled pattern, prior weight)
+REGEX_FEATURES = [
+    ("re:stories", re.compile(r"\b\d{2,3}[- ]stor(?:y|ies)\b"), 2.0),
+    ("re:floors", re.compile(r"\b\d{2,3}[- ]floors?\b"), 1.2),
+    ("re:units", re.compile(r"\b\d{2,4}\s+(?:residential\s+|condo\s+|apartment\s+|rental\s+)?units\b"), 1.5),
+    ("re:usd_millions", re.compile(r"\$\s?\d+(?:\.\d+)?\s?(?:million|billion|m\b|b\b)"), 0.5),
+    ("re:square_feet", re.compile(r"\b\d[\d,]*\s+square[- ]f(?:ee|oo)t\b"), 0.4),
+    ("re:single_family", re.compile(r"\bsingle[- ]family (?:home|house)s?\b"), -1.0),
+]
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9]*(?:-[a-z0-9]+)?")
+
+# Loaded lazily from MODEL_PATH
+_MODEL = None
+
+
+def features(content):
+    """Binary feature set: words plus regex hits over the head of the text."""
+    text = (content or "")[:MAX_CHARS].lower()
+    feats = set(_WORD_RE.findall(text))
+    for name, pattern, _ in REGEX_FEATURES:
+        if pattern.search(text):
+            feats.add(name)
+    return feats
+
+
+# Every prior weight by feature name
+PRIORS = dict(KEYWORD_WEIGHTS, **{name: weight for name, _, weight in REGEX_FEATURES})
+
+
+def load_model(path=MODEL_PATH):
+    """Loads learned weights, or None if no model has been trained."""
+    global _MODEL
+    if _MODEL is None:
+        _MODEL = linear_model.load(path) or {}
+    return _MODEL or None
+
+
+def save_model(model, path=MODEL_PATH):
+    global _MODEL
+    linear_model.save(model, path)
+    _MODEL = model
+
+
+def score(content, model=None):
+    """Probability (0-1) that the LLM would call this article relevant."""
+    return linear_model.probability(features(content), PRIORS, model or load_model())
+
+
+def should_enrich(content, threshold=REJECT_THRESHOLD):
+    """
+    Returns (forward, score). Without a trained model every signal is
+    forwarded (score is still reported for prioritisation).
+    """
+    model = load_model()
+    p = score(content, model)
+    if model is None:
+        return True, p
+    return p >= threshold, p
+
+
+def train(examples, epochs=15, learning_rate=0.05, l2=0.0005, min_count=3):
+    """
+    Fits a logistic model on top of the priors (linear_model.train).
+    examples: list of (content, label) where label is 1 (LLM said relevant) or 0.
+    Features seen in fewer than min_count examples are ignored.
+    """
+    rows = [(features(content), label) for content, label in examples]
+    return linear_model.train(rows, PRIORS, epochs, learning_rate, l2, min_count=min_count)
+
+
+def load_labelled_examples():
+    """
+    (content, label) from LLM verdicts: llm_relevant when recorded, otherwise
+    linked-to-a-project = relevant, LLM-processed without a project = not.
+    Pre-filter rejections, duplicates and parse errors are excluded so the
+    model never trains on its own output.
+    """
+    import db_client
+
+    data = db_client.query_db({"raw_signals": {}, "projects": {}}) or {}
+    project_signal_ids = {p.get("source_signal_id") for p in data.get("projects", []) if p.get("source_signal_id")}
+
+    examples = []
+    for signal in data.get("raw_signals", []):
+        content = signal.get("content")
+        if not content or signal.get("processed") is not True:
+            continue
+        if signal.get("duplicate_of") or signal.get("prefilter_rejected") or signal.get("enrich_error"):
+            continue
+        if signal.get("llm_relevant") is not None:
+            label = 1 if signal.get("llm_relevant") else 0
+        elif signal.get("id") in project_signal_ids:
+            label = 1
+        elif signal.get("enrich_engine"):
+            label = 0
+        else:
+            continue
+        examples.append((content, label))
+    return examples
+
+
+def report(examples, model=None, threshold=REJECT_THRESHOLD):
+    """
+    Prints the reject decision quality on labelled examples:
+    rejection precision (rejected that really were irrelevant), relevant
+    recall (relevant signals still forwarded), LLM calls saved and scoring speed.
+    """
+    model = model or load_model()
+    start = time.perf_counter()
+    scores = [score(content, model) for content, _ in examples]
+    elapsed = time.perf_counter() - start
+
+    rejected_neg = rejected_pos = forwarded_pos = forwarded_neg = 0
+    for p, (_, label) in zip(scores, examples):
+        rejected = p < threshold
+        if label:
+            rejected_pos += rejected
+            forwarded_pos += not rejected
+        else:
+            rejected_neg += rejected
+            forwarded_neg += not rejected
+
+    total = len(examples) or 1
+    rejected = rejected_neg + rejected_pos
+    print(f"📊 Relevance filter @ threshold {threshold}: {len(examples)} labelled signals")
+    print(f"   🚫 Rejection precision: {rejected_neg / rejected if rejected else 1.0:.1%} ({rejected_neg}/{rejected})")
+    print(f"   ✅ Relevant recall:     {forwarded_pos / (forwarded_pos + rejected_pos) if forwarded_pos + rejected_pos else 1.0:.1%}"
+          f" (lost {rejected_pos})")
+    print(f"   💸 LLM calls saved:     {rejected / total:.0%} ({rejected} of {len(examples)})")
+    print(f"   ⚡ Throughput:          {len(examples) / elapsed if elapsed else 0:,.0f} signals/s on one CPU")
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "report"
+    examples = load_labelled_examples()
+    positives = sum(label for _, label in examples)
+    print(f"📊 Loaded {len(examples)} LLM verdicts ({positives} relevant)")
+    if not examples:
+        print("❌ No labelled history yet")
+        return
+
+    train_rows, test_rows = linear_model.split(examples)
+    if command == "train":
+        model = train(train_rows)
+        report(test_rows, model)
+        save_model(train(examples))
+        print(f"💾 Saved model (trained on all {len(examples)} verdicts) to {MODEL_PATH}")
+    else:
+        # The saved model was fit on every verdict, test rows included: refit on
+        # the training split so the figures are held-out
+        print(f"🔁 Refitting on {len(train_rows)} training verdicts, reporting on {len(test_rows)} held out")
+        report(test_rows, train(train_rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Replay Signals - Inspect and re-queue dead-lettered raw_signals
+A signal that fails enrichment MAX_ATTEMPTS times (see db_client) is parked
+as DEAD_LETTER with its last_error instead of being retried forever.
+Once the cause is fixed (quota restored, prompt fixed), put them back:
+
+Usage:
+    python3 execution/replay_signals.py list                   # dead letters grouped by reason
+    python3 execution/replay_signals.py replay                 # re-queue every dead letter
+    python3 execution/replay_signals.py replay --reason parse  # only reasons containing "parse"
+    python3 execution/replay_signals.py replay <signal_id> ... # specific signals
+"""
+import sys
+import db_client
+
+
+def group_by_reason(signals):
+    groups = {}
+    for s in signals:
+        groups.setdefault(s.get("last_error") or "unknown", []).append(s)
+    return groups
+
+
+def list_dead_letters():
+    signals = db_client.get_dead_letter_signals()
+    print(f"☠️ {len(signals)} dead-lettered signals")
+    for reason, group in sorted(group_by_reason(signals).items(), key=lambda kv: -len(kv[1])):
+        print(f"   {len(group):5d}  {reason[:100]}")
+
+
+def replay(args):
+    reason = None
+    if args[:1] == ["--reason"]:
+        reason = args[1].lower() if len(args) > 1 else ""
+        args = args[2:]
+
+    signals = db_client.get_dead_letter_signals()
+    if args:
+        wanted = set(args)
+        signals = [s for s in signals if s.get("id") in wanted]
+    if reason is not None:
+        signals = [s for s in signals if reason in (s.get("last_error") or "").lower()]
+
+    if not signals:
+        print("✅ Nothing to replay")
+        return
+
+    ids = [s["id"] for s in signals]
+    for i in range(0, len(ids), 100):
+        db_client.replay_signals(ids[i:i + 100])
+    print(f"🔁 Re-queued {len(ids)} signals with a fresh attempt budget")
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "replay":
+        replay(sys.argv[2:])
+    elif command == "list":
+        list_dead_letters()
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
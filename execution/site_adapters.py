@@ -0,0 +1,122 @@
+"""
+Site Adapters - Per-domain extraction recipes for the dredgers
+Each adapter names the selectors a site actually uses (listing links,
+article body, listing dates) and its archive pagination pattern, so the
+dredgers run one targeted selector instead of probing a generic list.
+
+Resolution order: explicit DOMAIN_ADAPTERS entry -> CMS auto-detection
+from the homepage HTML -> "generic" (the old multi-selector probing).
+The resolved adapter name is cached on the source row as `site_adapter`.
+"""
+import url_canon
+
+# Generic content selectors, in order of preference (the pre-adapter behaviour)
+GENERIC_CONTENT_SELECTORS = [
+    "div.entry-content",
+    "article .content",
+    "div.post-content",
+    "div.article-content",
+    "div.story-content",
+    "article",
+    "main",
+    "div.content"
+]
+
+ADAPTERS = {
+    "yimby": {
+        "listing_links": "h2.entry-title a, article a[rel='bookmark']",
+        "content": "div.entry-content",
+        "dates": "time.entry-date, time",
+        "pagination": ["{base}/page/{n}/"],
+    },
+    "wordpress": {
+        "listing_links": "h2.entry-title a, h3.entry-title a, article a[rel='bookmark']",
+        "content": "div.entry-content",
+        "dates": "time.entry-date, time[datetime]",
+        "pagination": ["{base}/page/{n}/"],
+    },
+    "drupal": {
+        "listing_links": "article h2 a, .views-row h2 a, .node__title a",
+        "content": "div.field--name-body, div.node__content",
+        "dates": "time[datetime], .node__submitted",
+        "pagination": ["{base}/?page={n}"],
+    },
+    "generic": {
+        "listing_links": None,  # every same-domain anchor
+        "content": None,        # probe GENERIC_CONTENT_SELECTORS
+        "dates": "time",
+        "pagination": ["{base}/page/{n}/", "{base}/?page={n}"],
+    },
+}
+
+# Known sites (hostname without www.) -> adapter name
+DOMAIN_ADAPTERS = {
+    "floridayimby.com": "yimby",
+    "newyorkyimby.com": "yimby",
+    "sfyimby.com": "yimby",
+    "chicagoyimby.com": "yimby",
+}
+
+# CMS fingerprints checked against the homepage HTML, in order
+CMS_FINGERPRINTS = [
+    ("wordpress", ["wp-content/", "wp-includes/", 'content="WordPress']),
+    ("drupal", ['content="Drupal', "/sites/default/files/", "drupal-settings-json"]),
+]
+
+
+def domain_of(url):
+    """Hostname without the www. prefix."""
+    return url_canon.site_key(url) or ""
+
+
+def detect_adapter(html):
+    """Guesses the CMS adapter from homepage HTML. Returns an adapter name."""
+    if not html:
+        return "generic"
+    for name, markers in CMS_FINGERPRINTS:
+        if any(marker in html for marker in markers):
+            return name
+    return "generic"
+
+
+def resolve_adapter_name(source_url, html=None, cached=None):
+    """
+    Returns the adapter name for a source.
+    A cached name (from the source row) wins, then the domain table, then detection.
+    """
+    if cached in ADAPTERS:
+        return cached
+    name = DOMAIN_ADAPTERS.get(domain_of(source_url))
+    if name:
+        return name
+    return detect_adapter(html)
+
+
+def get_adapter(name):
+    """Adapter dict by name (falls back to generic)."""
+    return ADAPTERS.get(name, ADAPTERS["generic"])
+
+
+def archive_pages(adapter, base_url, max_pages):
+    """Yields (url, pattern_type) for the adapter's pagination patterns."""
+    for pattern in adapter["pagination"]:
+        pattern_type = "page_query" if "?page=" in pattern else "page_path"
+        for n in range(1, max_pages + 1):
+            yield pattern.format(base=base_url, n=n), pattern_type
+
+
+def select_content(soup, adapter, min_length):
+    """
+    Runs the adapter's content selector; falls back to generic probing.
+    Returns (text, selector_used) or (None, None).
+    """
+    selectors = [adapter["content"]] if adapter.get("content") else []
+    selectors += [s for s in GENERIC_CONTENT_SELECTORS if s not in selectors]
+
+    for selector in selectors:
+        content_div = soup.select_one(selector)
+        if content_div:
+            text = content_div.get_text(separator="\n", strip=True)
+            if len(text) >= min_length:
+                return text, selector
+    return None, None
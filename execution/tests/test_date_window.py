@@ -0,0 +1,94 @@
+from datetime import date
+
+import pytest
+
+import date_window
+
+TODAY = date(2025, 6, 1)
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://x.com/2024/12/15/tower", date(2024, 12, 15)),
+    ("https://x.com/2024/8/2/tower", date(2024, 8, 2)),
+    ("https://x.com/2024-12-15-tower", date(2024, 12, 15)),
+    # Partial dates resolve to the latest day they could mean
+    ("https://x.com/2024/02/tower", date(2024, 2, 29)),
+    ("https://x.com/2024/tower", date(2024, 12, 31)),
+    ("https://x.com/tower?d=2024/01/01", None),
+    # An impossible month falls back to the year
+    ("https://x.com/2024/13/tower", date(2024, 12, 31)),
+    ("https://x.com/tower-2024", None),
+    (None, None),
+])
+def test_parse_url_date(url, expected):
+    assert date_window.parse_url_date(url) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2025-03-04", date(2025, 3, 4)),
+    ("2025-03-04T10:00:00Z", date(2025, 3, 4)),
+    ("2025-03-04T23:30:00-05:00", date(2025, 3, 4)),
+    ("Tue, 04 Mar 2025 10:00:00 GMT", date(2025, 3, 4)),
+    ("March 4, 2025", date(2025, 3, 4)),
+    ("Sept. 12, 2024", date(2024, 9, 12)),
+    ("yesterday", None),
+    ("", None),
+])
+def test_parse_timestamp(value, expected):
+    assert date_window.parse_timestamp(value) == expected
+
+
+@pytest.mark.parametrize("text, url, expected", [
+    ("Body", "https://x.com/2025/03/04/tower", (date(2025, 3, 4), "url")),
+    # A year/month URL is not a publish date; the byline is
+    ("Published: March 3, 2025\nBody", "https://x.com/2025/03/tower", (date(2025, 3, 3), "label")),
+    ("Posted on 2025-01-12 by staff", None, (date(2025, 1, 12), "label")),
+    ("Tower plans were first shown on May 2, 2025 to the board.", None, (date(2025, 5, 2), "text")),
+    # Future and implausibly old dates are skipped
+    ("Updated: July 4, 2026\nDelivery expected March 1, 2025", None, (date(2025, 3, 1), "text")),
+    ("Founded January 1, 1999", None, (None, None)),
+    ("Body", "https://x.com/2026/01/01/tower", (None, None)),
+    ("", None, (None, None)),
+])
+def test_find_content_date(text, url, expected):
+    assert date_window.find_content_date(text, url, today=TODAY) == expected
+
+
+def test_content_date_only_looks_at_the_header():
+    text = "x" * date_window.CONTENT_DATE_CHARS + " Published: March 3, 2025"
+    assert date_window.find_content_date(text, today=TODAY) == (None, None)
+
+
+@pytest.mark.parametrize("local, model, expected", [
+    (("2025-03-04", "url"), "2025-01-01", {"article_date": "2025-03-04", "article_date_source": "url"}),
+    (("2025-03-04", "label"), "2025-01-01", {"article_date": "2025-03-04", "article_date_source": "label"}),
+    (("2025-03-04", "text"), "2025-01-01", {"article_date": "2025-01-01", "article_date_source": "llm"}),
+    (("2025-03-04", "text"), None, {"article_date": "2025-03-04", "article_date_source": "text"}),
+    ((None, None), "2025-01-01", {"article_date": "2025-01-01", "article_date_source": "llm"}),
+    ((None, None), None, {}),
+])
+def test_article_date_fields_precedence(local, model, expected):
+    assert date_window.article_date_fields(local, model) == expected
+
+
+@pytest.mark.parametrize("today, expected", [
+    (date(2025, 6, 15), date(2025, 1, 15)),
+    (date(2025, 7, 31), date(2025, 2, 28)),
+    (date(2024, 7, 31), date(2024, 2, 29)),
+])
+def test_backfill_cutoff(today, expected):
+    assert date_window.get_backfill_cutoff(today) == expected
+
+
+def test_ms_round_trip():
+    assert date_window.ms_to_date(date_window.date_to_ms(date(2025, 3, 4))) == date(2025, 3, 4)
+
+
+@pytest.mark.parametrize("url, hint, expected", [
+    ("https://x.com/2025/03/04/tower", date(2025, 1, 1), date(2025, 3, 4)),
+    ("https://x.com/2025/03/tower", date(2025, 3, 2), date(2025, 3, 2)),
+    ("https://x.com/2025/03/tower", None, date(2025, 3, 31)),
+    ("https://x.com/tower", None, None),
+])
+def test_resolve_article_date(url, hint, expected):
+    assert date_window.resolve_article_date(url, hint) == expected
@@ -0,0 +1,101 @@
+from datetime import date
+
+import pytest
+
+import extraction_schema as schema
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("Completed", ("Completed", "ok")),
+    ("Construction", ("Construction", "ok")),
+    (None, (None, "ok")),
+    ("complete", ("Completed", "coerced")),
+    ("The tower opened in March", ("Completed", "coerced")),
+    ("Topped out", ("Construction", "coerced")),
+    ("Under construction, completion expected 2027", ("Construction", "coerced")),
+    ("site plan approved", ("Permitting", "coerced")),
+    ("Plans filed", ("Permitting", "coerced")),
+    ("Pre-construction sales, permits approved", ("Permitting", "coerced")),
+    ("in design", ("Planning", "coerced")),
+    ("announced", ("Proposed", "coerced")),
+    # Stage words inside other words or phrases that do not mean the stage
+    ("Incomplete", (None, "rejected")),
+    ("opened sales gallery", (None, "rejected")),
+    ("Sales center opened", (None, "rejected")),
+    ("Pre-construction sales", (None, "rejected")),
+    ("Replanted landscaping", (None, "rejected")),
+    # Template placeholders
+    ("Proposed/Planning/Permitting/Construction/Completed", (None, "coerced")),
+    ("unknown", (None, "coerced")),
+    ("0", (None, "coerced")),
+    (0, (None, "coerced")),
+    (3, (None, "rejected")),
+])
+def test_coerce_stage(value, expected):
+    assert schema.coerce_stage(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    (300, (300, "ok")),
+    (None, (None, "ok")),
+    (0, (None, "coerced")),
+    ("0", (None, "coerced")),
+    ("approx. 300", (300, "coerced")),
+    ("40-story", (40, "coerced")),
+    ("1,200 units", (1200, "coerced")),
+    (299.6, (300, "coerced")),
+    ("N/A", (None, "coerced")),
+    ("many", (None, "rejected")),
+    (50000, (None, "rejected")),
+])
+def test_coerce_units(value, expected):
+    assert schema.FIELD_COERCERS["units"](value) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$1.2 billion", 1_200_000_000),
+    ("$500M", 500_000_000),
+    ("USD 85 million", 85_000_000),
+    ("$1.2-1.5B", 1_200_000_000),
+    ("300 units, $90 million", 90_000_000),
+    ("€50 million", None),
+    ("undisclosed", None),
+])
+def test_parse_usd(text, expected):
+    assert schema.parse_usd(text) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2025-03-04", ("2025-03-04", "ok")),
+    ("March 4, 2025", ("2025-03-04", "coerced")),
+    ("2025-03-04T10:00:00Z", ("2025-03-04", "coerced")),
+    ("2031-01-01", (None, "rejected")),
+    ("1999-12-31", (None, "rejected")),
+    ("unknown", (None, "coerced")),
+])
+def test_coerce_article_date(value, expected):
+    assert schema.coerce_article_date(value, today=date(2025, 6, 1)) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("  Related Group ", ("Related Group", "coerced")),
+    ("Related Group", ("Related Group", "ok")),
+    ("N/A", (None, "coerced")),
+    (0, (None, "coerced")),
+    (["x"], (None, "rejected")),
+])
+def test_coerce_text(value, expected):
+    assert schema.coerce_text(value) == expected
+
+
+def test_validate_adds_derived_fields_and_keeps_unknown_ones():
+    clean = schema.validate({
+        "units": "approx. 300", "floors": 0, "gdv": "$1.2 billion",
+        "delivery_date": "Q4 2027", "status_stage": "Incomplete", "extra": "kept",
+    })
+    assert clean["units"] == 300
+    assert clean["floors"] is None
+    assert clean["gdv_usd"] == 1_200_000_000
+    assert clean["delivery_year"] == 2027
+    assert clean["status_stage"] is None
+    assert clean["extra"] == "kept"
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from json_extract import ArrayItemStream, extract_json
+
+RESULTS = {"results": [
+    {"id": "a", "relevant": True, "unit_mix": [{"type": "1BR", "count": 40}, {"type": "2BR", "count": 20}]},
+    {"id": "b", "relevant": False, "description": "braces } { and \"quotes\" and \\ in text"},
+    {"id": "c", "relevant": True, "name": "Tower [North]"},
+]}
+
+
+def feed_in_chunks(text, size):
+    scanner = ArrayItemStream()
+    items = []
+    for end in range(size, len(text) + size, size):
+        items += scanner.feed(text[:end])
+    return items, scanner.done
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+def test_stream_items_match_full_parse_for_any_chunking(size):
+    text = "```json\n" + json.dumps(RESULTS, indent=1) + "\n```"
+    items, done = feed_in_chunks(text, size)
+    assert items == RESULTS["results"]
+    assert done
+
+
+def test_stream_not_done_until_outer_value_closes():
+    text = json.dumps(RESULTS)
+    scanner = ArrayItemStream()
+    first = scanner.feed(text[:text.index('"id": "b"')])
+    assert [item["id"] for item in first] == ["a"]
+    assert not scanner.done
+    rest = scanner.feed(text)
+    assert [item["id"] for item in rest] == ["b", "c"]
+    assert scanner.done
+
+
+def test_stream_bare_array():
+    items, done = feed_in_chunks('[{"id": 1}, {"id": 2}]', 5)
+    assert items == [{"id": 1}, {"id": 2}]
+    assert done
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": 1}', {"a": 1}),
+    ('```json\n{"a": 1}\n```', {"a": 1}),
+    ('Here you go: {"a": 1} hope it helps', {"a": 1}),
+    ("{'a': 1, 'b': [1, 2,],}", {"a": 1, "b": [1, 2]}),
+    ('{"a": True, "b": None}', {"a": True, "b": None}),
+    ('noise {not json} then {"a": {"b": 2}}', {"a": {"b": 2}}),
+    ("no json at all", None),
+    ("", None),
+])
+def test_extract_json(text, expected):
+    assert extract_json(text) == expected
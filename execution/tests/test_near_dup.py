@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+import near_dup
+
+ARTICLE = (
+    "Related Group has filed plans for a 40-story condominium tower at 1200 Brickell Avenue in Miami. "
+    "The project would include 320 residences, a rooftop pool and 12,000 square feet of retail space. "
+    "Arquitectonica is the architect and construction is expected to start in 2026, pending approvals "
+    "from the city's Urban Development Review Board, according to documents filed this week."
+)
+REWRITE = ARTICLE.replace("this week", "on Tuesday") + " Sales have not launched yet."
+OTHER = (
+    "The city commission voted to extend the brunch hours of waterfront restaurants through the summer, "
+    "after a heated debate about noise complaints from residents of the neighborhood and the police."
+)
+
+
+def index_of(**signals):
+    index = near_dup.NearDupIndex()
+    for signal_id, text in signals.items():
+        index.add(signal_id, near_dup.minhash(text))
+    return index
+
+
+@pytest.mark.parametrize("text, expected_id", [
+    (ARTICLE, "original"),
+    (REWRITE, "original"),
+    (OTHER, None),
+    ("", None),
+])
+def test_find_duplicate(text, expected_id):
+    index = index_of(original=ARTICLE)
+    found, score = index.find_duplicate(near_dup.minhash(text))
+    assert found == expected_id
+    assert (score >= near_dup.DUPLICATE_THRESHOLD) == (expected_id is not None)
+
+
+def test_signature_is_deterministic_and_full_length():
+    signature = near_dup.minhash(ARTICLE)
+    assert signature == near_dup.minhash(ARTICLE)
+    assert len(signature) == near_dup.NUM_PERM
+
+
+@pytest.mark.parametrize("a, b, low, high", [
+    (ARTICLE, ARTICLE, 1.0, 1.0),
+    (ARTICLE, REWRITE, 0.7, 1.0),
+    (ARTICLE, OTHER, 0.0, 0.2),
+])
+def test_estimate_similarity(a, b, low, high):
+    assert low <= near_dup.estimate_similarity(near_dup.minhash(a), near_dup.minhash(b)) <= high
+
+
+def test_check_duplicate_fields():
+    fields, signature = near_dup.check_duplicate(index_of(original=ARTICLE), REWRITE)
+    assert fields["duplicate_of"] == "original"
+    assert fields["processed"] is True and fields["status"] == "DUPLICATE"
+    assert signature == near_dup.minhash(REWRITE)
+
+    assert near_dup.check_duplicate(index_of(original=ARTICLE), OTHER)[0] == {}
+    assert near_dup.check_duplicate(None, ARTICLE) == ({}, None)
+
+
+def test_build_index_skips_old_rows_and_known_duplicates():
+    now = int(time.time() * 1000)
+    old = now - (near_dup.RECENT_DAYS + 1) * 86400000
+    index = near_dup.build_index([
+        {"id": "recent", "content": ARTICLE, "created_at": now},
+        {"id": "old", "content": OTHER, "created_at": old},
+        {"id": "dup", "content": REWRITE, "created_at": now, "duplicate_of": "recent"},
+        {"id": "empty", "content": "", "created_at": now},
+    ])
+    assert set(index.signatures) == {"recent"}
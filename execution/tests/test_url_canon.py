@@ -0,0 +1,73 @@
+import pytest
+
+from url_canon import canonical_from_html, canonicalize_url, site_key, url_key
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTPS://WWW.Example.com:443/News/Tower/", "https://www.example.com/News/Tower"),
+    ("http://example.com:8080/a", "http://example.com:8080/a"),
+    ("https://example.com/a#comments", "https://example.com/a"),
+    ("https://example.com/a?utm_source=x&fbclid=y&id=2", "https://example.com/a?id=2"),
+    ("https://example.com/a?b=2&a=1", "https://example.com/a?a=1&b=2"),
+    ("https://example.com/a?source=rss&ref=home&share=1",
+     "https://example.com/a?ref=home&share=1&source=rss"),
+    ("https://amp.example.com/a", "https://example.com/a"),
+    ("https://example.com/2025/01/tower/amp/", "https://example.com/2025/01/tower"),
+    ("https://example.com/amp/tower", "https://example.com/tower"),
+    ("https://example.com/tower.amp.html", "https://example.com/tower.html"),
+    ("https://example.com//a//b", "https://example.com/a/b"),
+    ("example.com/a", "https://example.com/a"),
+    ("mailto:x@example.com", None),
+    ("javascript:void(0)", None),
+    ("", None),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_relative_url_resolves_against_base():
+    assert canonicalize_url("../b/", base_url="https://example.com/x/a/") == "https://example.com/x/b"
+
+
+@pytest.mark.parametrize("a, b", [
+    ("https://www.example.com/a/", "http://example.com/a"),
+    ("https://example.com/a?utm_campaign=x", "https://example.com/a"),
+    ("https://amp.example.com/a", "https://example.com/a/amp"),
+])
+def test_url_key_identity(a, b):
+    assert url_key(a) == url_key(b)
+
+
+def test_site_key():
+    assert site_key("https://www.Example.com/a?b=1") == "example.com"
+
+
+def canonical_html(href):
+    return f'<html><head><link rel="canonical" href="{href}"></head><body></body></html>'
+
+
+PAGE = "https://example.com/2025/01/new-tower"
+LISTING = "https://example.com/news/page/2"
+
+
+@pytest.mark.parametrize("href, expected", [
+    # The article's own canonical wins
+    ("https://www.example.com/2025/01/new-tower-renamed/", "https://www.example.com/2025/01/new-tower-renamed"),
+    ("/2025/01/new-tower?utm_source=x", "https://example.com/2025/01/new-tower"),
+    # Implausible canonicals fall back to the page URL
+    ("https://example.com/", PAGE),
+    ("https://example.com/news/page/2", PAGE),
+    ("https://example.com/news", PAGE),
+    ("https://other-site.com/2025/01/new-tower", PAGE),
+])
+def test_canonical_from_html(href, expected):
+    assert canonical_from_html(canonical_html(href), PAGE, LISTING) == expected
+
+
+def test_query_fetched_page_may_name_any_path():
+    html = canonical_html("https://example.com/2025/01/new-tower")
+    assert canonical_from_html(html, "https://example.com/?p=123") == "https://example.com/2025/01/new-tower"
+
+
+def test_no_html_falls_back_to_page():
+    assert canonical_from_html(None, PAGE + "/") == PAGE
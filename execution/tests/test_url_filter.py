@@ -0,0 +1,55 @@
+import pytest
+
+import url_filter
+from url_filter import UrlFilter
+
+
+def test_trie_matches_legacy_substring_loop():
+    same_rules = UrlFilter(deny_segments=(), deny_extensions=())
+    urls = url_filter.synthetic_urls(5000)
+    assert [same_rules.is_ignored(u) for u in urls] == [url_filter._legacy_should_ignore(u) for u in urls]
+
+
+@pytest.mark.parametrize("patterns", [
+    ["/a", "/ab", "/abc"],
+    ["/abc", "/ab", "/a"],
+    ["/tag/", "/tags", "/t"],
+    ["x.y", "x+y", "(z)"],
+])
+def test_trie_of_overlapping_prefixes_matches_any_pattern(patterns):
+    compiled = url_filter.compile_rules(patterns)
+    for url in ["https://h.com/abc", "https://h.com/ab", "https://h.com/a", "https://h.com/tags/x",
+                "https://h.com/x.y", "https://h.com/xzy", "https://h.com/(z)", "https://h.com/z"]:
+        assert bool(compiled.search(url.lower())) == any(p in url.lower() for p in patterns), url
+
+
+@pytest.mark.parametrize("url, ignored", [
+    ("https://x.com/2025/01/tower-plans", False),
+    ("https://x.com/contact", True),
+    ("https://x.com/TAG/condos", True),
+    ("https://x.com/page/3/", True),
+    ("https://x.com/pageant-tower", False),
+    ("https://x.com/news/events?x=1", True),
+    ("https://x.com/events-center-tower", False),
+    ("https://x.com/uploads/render.JPG", True),
+    ("https://x.com/uploads/render.jpg?w=300", True),
+    ("https://x.com/jpg-tower", False),
+])
+def test_default_filter(url, ignored):
+    assert url_filter.DEFAULT_FILTER.is_ignored(url) is ignored
+
+
+@pytest.mark.parametrize("source, url, ignored", [
+    ({"url_allow": ["/category/projects"]}, "https://x.com/category/projects/tower", False),
+    ({"url_allow": ["/category/projects"]}, "https://x.com/category/dining", True),
+    ({"url_deny": ["/sponsored"]}, "https://x.com/sponsored/tower", True),
+    ({"url_deny_segments": ["video"]}, "https://x.com/video/tower", True),
+    ({"url_deny_segments": ["video"]}, "https://x.com/videographer-tower", False),
+])
+def test_source_overrides(source, url, ignored):
+    assert url_filter.get_filter(source).is_ignored(url) is ignored
+
+
+def test_filters_are_cached_per_rule_set():
+    assert url_filter.get_filter({}) is url_filter.DEFAULT_FILTER
+    assert url_filter.get_filter({"url_deny": ["/x"]}) is url_filter.get_filter({"url_deny": ["/x"]})
@@ -0,0 +1,173 @@
+"""
+Article Triage - Pre-fetch relevance score from URL slug + listing title
+Runs before the dredgers fetch an article page. Scores a candidate with
+hand-set keyword weights plus a small logistic model learned from our own
+outcomes (signals that became projects vs. signals the enricher rejected),
+and drops candidates that are clearly not high-rise residential news
+("best-brunch-spots", "mayor-race") before any fetch or LLM spend.
+
+Usage:
+    python3 execution/triage.py train    # learn weights from raw_signals/projects
+    python3 execution/triage.py report   # score distribution on labelled history
+"""
+import re
+import sys
+from pathlib import Path
+from urllib.parse import urlsplit
+import linear_model
+
+MODEL_PATH = Path(__file__).parent.parent / "data" / "triage_model.json"
+
+# Candidates scoring below this are not fetched
+DROP_THRESHOLD = 0.2
+
+# Prior weights (log-odds) used with or without a trained model
+KEYWORD_WEIGHTS = {
+    # strong positives
+    "condo": 2.0, "condos": 2.0, "condominium": 2.0, "tower": 1.8, "towers": 1.8,
+    "highrise": 2.0, "high-rise": 2.0, "skyscraper": 2.0, "story": 1.0, "stories": 1.4,
+    "residential": 1.5, "units": 1.3, "apartments": 1.3, "apartment": 1.0,
+    "multifamily": 1.5, "mixed-use": 1.5, "mixeduse": 1.5, "groundbreaking": 1.5,
+    "topping": 1.2, "tops": 0.8, "permits": 1.0, "permit": 0.8, "proposed": 1.0,
+    "plans": 0.6, "filed": 0.8, "rezoning": 0.8, "developer": 1.0, "development": 0.8,
+    "luxury": 1.0, "penthouse": 1.0, "rental": 0.8, "hotel": 0.6, "branded": 0.8,
+    "residences": 1.6, "construction": 0.8, "renderings": 1.0, "revealed": 0.5,
+    # strong negatives
+    "brunch": -2.5, "restaurant": -1.8, "restaurants": -1.8, "bar": -1.0, "recipe": -2.5,
+    "mayor": -1.5, "election": -2.0, "race": -1.2, "vote": -1.0, "candidate": -1.5,
+    "sports": -2.0, "game": -1.2, "concert": -2.0, "festival": -1.5, "weather": -2.0,
+    "hurricane": -1.0, "crime": -2.0, "police": -1.8, "shooting": -2.5, "obituary": -2.5,
+    "podcast": -1.5, "video": -0.8, "quiz": -2.0, "horoscope": -3.0, "best": -0.8,
+    "single-family": -1.5, "retail": -0.8, "store": -0.8, "opening": -0.5,
+    "review": -1.0, "events": -1.2, "weekend": -1.0, "things": -1.0,
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)?")
+_SLUG_SPLIT_RE = re.compile(r"[^a-z0-9]+")
+_EXTENSION_RE = re.compile(r"\.(html?|php|aspx?)$")
+
+# Loaded lazily from MODEL_PATH
+_MODEL = None
+
+
+def tokenize(url, title=None):
+    """Feature tokens from the last path segments of the URL and the listing title."""
+    tokens = set()
+    path = urlsplit(url or "").path.lower()
+    segments = [s for s in path.split("/") if s and not s.isdigit()]
+    for segment in segments[-2:]:
+        segment = _EXTENSION_RE.sub("", segment)
+        words = [w for w in _SLUG_SPLIT_RE.split(segment) if w and not w.isdigit()]
+        tokens.update(words)
+        tokens.update(f"{a}-{b}" for a, b in zip(words, words[1:]))
+
+    if title:
+        words = _TOKEN_RE.findall(title.lower())
+        tokens.update(words)
+        flat = [w for word in words for w in word.split("-")]
+        tokens.update(f"{a}-{b}" for a, b in zip(flat, flat[1:]))
+    return tokens
+
+
+def load_model(path=MODEL_PATH):
+    """Loads learned weights ({"bias": float, "weights": {token: float}}), or an empty model."""
+    global _MODEL
+    if _MODEL is None:
+        _MODEL = linear_model.load(path) or {"bias": 0.0, "weights": {}}
+    return _MODEL
+
+
+def save_model(model, path=MODEL_PATH):
+    """Writes learned weights to disk."""
+    global _MODEL
+    linear_model.save(model, path)
+    _MODEL = model
+
+
+def score(url, title=None, model=None):
+    """Probability (0-1) that the candidate is relevant high-rise/residential news."""
+    return linear_model.probability(tokenize(url, title), KEYWORD_WEIGHTS, model or load_model())
+
+
+def should_fetch(url, title=None, threshold=DROP_THRESHOLD):
+    """Returns (keep, score) for a candidate article."""
+    p = score(url, title)
+    return p >= threshold, p
+
+
+def train(examples, epochs=20, learning_rate=0.1, l2=0.001):
+    """
+    Fits a logistic model on top of KEYWORD_WEIGHTS (linear_model.train).
+    examples: list of (url, title, label) where label is 1 (relevant) or 0.
+    """
+    rows = [(tokenize(url, title), label) for url, title, label in examples]
+    return linear_model.train(rows, KEYWORD_WEIGHTS, epochs, learning_rate, l2)
+
+
+def signal_title(signal):
+    """First line of a signal's content, used as a stand-in for the listing title."""
+    content = (signal.get("content") or "").strip()
+    return content.split("\n", 1)[0][:200] if content else None
+
+
+def load_labelled_examples():
+    """
+    Builds (url, title, label) from history: signals linked to a project are
+    relevant; processed, non-duplicate signals without a project are not.
+    """
+    import db_client
+
+    data = db_client.query_db({"raw_signals": {}, "projects": {}}) or {}
+    project_signal_ids = {p.get("source_signal_id") for p in data.get("projects", []) if p.get("source_signal_id")}
+
+    examples = []
+    for signal in data.get("raw_signals", []):
+        url = signal.get("url")
+        if not url or signal.get("duplicate_of") or signal.get("processed") is not True:
+            continue
+        label = 1 if signal.get("id") in project_signal_ids else 0
+        examples.append((url, signal_title(signal), label))
+    return examples
+
+
+def report(examples, model=None, threshold=DROP_THRESHOLD):
+    """Prints how many relevant/irrelevant candidates the threshold would drop."""
+    kept_pos = dropped_pos = kept_neg = dropped_neg = 0
+    for url, title, label in examples:
+        keep = score(url, title, model) >= threshold
+        if label:
+            kept_pos += keep
+            dropped_pos += not keep
+        else:
+            kept_neg += keep
+            dropped_neg += not keep
+
+    total = len(examples) or 1
+    print(f"📊 Triage @ threshold {threshold}: {len(examples)} labelled candidates")
+    print(f"   ✅ Relevant kept:     {kept_pos}  (lost: {dropped_pos})")
+    print(f"   🚫 Irrelevant dropped: {dropped_neg}  (still fetched: {kept_neg})")
+    print(f"   📉 Fetch volume cut:   {(dropped_pos + dropped_neg) / total:.0%}")
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "report"
+    examples = load_labelled_examples()
+    positives = sum(label for _, _, label in examples)
+    print(f"📊 Loaded {len(examples)} labelled signals ({positives} relevant)")
+
+    if not examples:
+        print("❌ No labelled history yet, keeping keyword weights only")
+        return
+
+    # Figures are always held-out: the model is refit on the training split
+    train_rows, test_rows = linear_model.split(examples)
+    print(f"🔁 Fitting on {len(train_rows)} labelled signals, reporting on {len(test_rows)} held out")
+    report(test_rows, train(train_rows))
+    if command == "train":
+        model = train(examples)
+        save_model(model)
+        print(f"💾 Saved {len(model['weights'])} learned weights (trained on all {len(examples)}) to {MODEL_PATH}")
+
+
+if __name__ == "__main__":
+    main()
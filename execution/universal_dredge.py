@@ -4,34 +4,38 @@ Iterates through sources table and applies deep crawl heuristics:
 - Pagination patterns (page/N, ?page=N)
 - Sitemap extraction
 - Full-text article fetching with deduplication
+- Per-source cursors so a crashed run resumes where it stopped
+- Date-windowed backfill: archives are paged only until they cross the cutoff
+- Site adapters (see site_adapters.py) cached per source for targeted selectors
+- Pre-fetch triage (see triage.py) drops obviously irrelevant slugs/titles
 """
 import time
 import re
 import requests
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-from db_client import query_db, transact_db
+from db_client import query_db, transact_db, update_source_cursor
 import uuid
 import xml.etree.ElementTree as ET
+import date_window
+import near_dup
+import url_canon
+import triage
+import url_filter
+import site_adapters
 
 # Configuration
-MAX_ARCHIVE_PAGES = 10
+MAX_ARCHIVE_PAGES = 100  # safety cap; the date window normally stops paging much earlier
 MIN_CONTENT_LENGTH = 500
 FETCH_DELAY = 2  # seconds between article fetches
 PAGE_DELAY = 1   # seconds between archive pages
+REDREDGE_INTERVAL_HOURS = 24  # completed sources are skipped until due again
 
 # User-Agent to avoid blocks
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 }
 
-# URLs to ignore (navigation, legal pages, etc.)
-IGNORE_PATTERNS = [
-    "/contact", "/about", "/login", "/privacy", "/terms",
-    "/advertise", "/subscribe", "/newsletter", "/tag/",
-    "/category/", "/author/", "/wp-admin", "/wp-login",
-    "/feed/", "/rss", "/sitemap", "/search"
-]
+# URLs to ignore (navigation, legal pages, etc.) live in url_filter.py
 
 
 def get_all_sources():
@@ -47,46 +51,69 @@ def get_all_sources():
     return sources
 
 
+# Near-duplicate index over recent signals (built by get_existing_urls)
+DUP_INDEX = None
+
+
 def get_existing_urls():
-    """Fetches all existing URLs in raw_signals for deduplication."""
+    """
+    Fetches all existing URLs in raw_signals for deduplication.
+    Also builds the near-duplicate content index (DUP_INDEX) from the same rows.
+    """
+    global DUP_INDEX
     query = {"raw_signals": {}}
     data = query_db(query)
     
     if not data or "raw_signals" not in data:
+        DUP_INDEX = near_dup.NearDupIndex()
         return set()
     
     urls = set()
     for signal in data["raw_signals"]:
         url = signal.get("url", "")
         if url:
-            urls.add(url.rstrip("/"))
+            urls.add(url_canon.url_key(url))
+    
+    DUP_INDEX = near_dup.build_index(data["raw_signals"])
     
     print(f"📊 Loaded {len(urls)} existing URLs for deduplication")
+    print(f"📊 Indexed {len(DUP_INDEX)} recent signals for near-duplicate detection")
     return urls
 
 
-def should_ignore_url(url):
-    """Checks if URL matches ignore patterns."""
-    url_lower = url.lower()
-    for pattern in IGNORE_PATTERNS:
-        if pattern in url_lower:
-            return True
-    return False
+def should_ignore_url(url, rules=None):
+    """Checks if URL matches ignore rules (compiled filter, see url_filter.py)."""
+    return (rules or url_filter.DEFAULT_FILTER).is_ignored(url)
+
 
+def get_source_cutoff(source):
+    """
+    Returns (cutoff_date, mode) for a source.
+    Sources still backfilling use the full 5-month window; sources whose
+    backfill is COMPLETE only need what was published since the last dredge.
+    """
+    cursor = source.get("dredge_cursor") or {}
+    if cursor.get("status") == "IN_PROGRESS" and cursor.get("cutoff"):
+        return date_window.ms_to_date(cursor["cutoff"]), cursor.get("mode", "backfill")
+
+    if source.get("backfill_status") == "COMPLETE" and source.get("last_dredged"):
+        return date_window.cutoff_from_ms(source["last_dredged"]), "incremental"
 
-def is_valid_year(url):
-    """Checks if URL contains /2024/, /2025/, or /2026/ (recent articles only)."""
-    return "/2024/" in url or "/2025/" in url or "/2026/" in url
+    return date_window.get_backfill_cutoff(), "backfill"
 
 
 def normalize_base_url(url):
-    """Ensures URL has proper format."""
-    if not url:
-        return None
-    url = url.strip()
-    if not url.startswith("http"):
-        url = "https://" + url
-    return url.rstrip("/")
+    """Ensures URL has proper format (canonical form, see url_canon)."""
+    return url_canon.canonicalize_url(url)
+
+
+def is_same_site(link_site, base_site):
+    """Same host, or one is a subdomain of the other."""
+    return (
+        link_site == base_site
+        or link_site.endswith("." + base_site)
+        or base_site.endswith("." + link_site)
+    )
 
 
 def fetch_page(url, timeout=15):
@@ -101,20 +128,15 @@ def fetch_page(url, timeout=15):
         return None
 
 
-def generate_archive_targets(base_url):
+def generate_archive_targets(base_url, adapter=None):
     """
-    Generates archive page URLs using multiple heuristics.
+    Generates archive page URLs using the adapter's pagination pattern(s).
     Returns list of (url, pattern_type) tuples.
     """
-    targets = []
+    adapter = adapter or site_adapters.get_adapter("generic")
     
-    # Pattern A: /page/N/ (WordPress style)
-    for i in range(1, MAX_ARCHIVE_PAGES + 1):
-        targets.append((f"{base_url}/page/{i}/", "page_path"))
-    
-    # Pattern B: ?page=N (Query param style)
-    for i in range(1, MAX_ARCHIVE_PAGES + 1):
-        targets.append((f"{base_url}/?page={i}", "page_query"))
+    # Pattern A/B: /page/N/ (WordPress style) and/or ?page=N (Query param style)
+    targets = list(site_adapters.archive_pages(adapter, base_url, MAX_ARCHIVE_PAGES))
     
     # Pattern C: Sitemap
     targets.append((f"{base_url}/sitemap.xml", "sitemap"))
@@ -124,71 +146,82 @@ def generate_archive_targets(base_url):
     return targets
 
 
-def extract_links_from_html(html, base_url):
-    """Extracts article links from HTML page."""
+def find_listing_date(a_tag, date_selector="time"):
+    """Finds the timestamp printed next to a link on a listing page."""
+    container = a_tag.find_parent(["article", "li"]) or a_tag.parent
+    if container is None:
+        return None
+    
+    time_tag = container.select_one(date_selector)
+    if time_tag is None:
+        return None
+    
+    return date_window.parse_timestamp(time_tag.get("datetime") or time_tag.get_text(strip=True))
+
+
+def extract_links_from_html(html, base_url, adapter=None, rules=None):
+    """Extracts article links from HTML page as {url: (listing_date, anchor_text)}."""
+    adapter = adapter or site_adapters.get_adapter("generic")
     soup = BeautifulSoup(html, "html.parser")
-    links = set()
+    links = {}
+    
+    base_site = url_canon.site_key(base_url)
+    base_key = url_canon.url_key(base_url)
     
-    parsed_base = urlparse(base_url)
-    base_domain = parsed_base.netloc.replace("www.", "")
+    # Adapter listing selector first; every anchor if it has none or finds nothing
+    anchors = soup.select(adapter["listing_links"]) if adapter.get("listing_links") else []
+    if not anchors:
+        anchors = soup.find_all("a", href=True)
     
-    # Find all links
-    for a_tag in soup.find_all("a", href=True):
+    for a_tag in anchors:
         href = a_tag.get("href")
         if not href:
             continue
         
-        # Resolve relative URLs
-        full_url = urljoin(base_url, href)
-        parsed = urlparse(full_url)
-        
-        # Only same domain
-        link_domain = parsed.netloc.replace("www.", "")
-        if base_domain not in link_domain and link_domain not in base_domain:
+        # Skip ignored patterns (cheapest rejection, before any URL parsing)
+        if should_ignore_url(href, rules):
             continue
         
-        # Skip non-http
-        if not parsed.scheme.startswith("http"):
+        # Resolve relative URLs and canonicalize (None for non-http)
+        clean_url = url_canon.canonicalize_url(href, base_url=base_url)
+        if not clean_url:
             continue
         
-        # Skip ignored patterns
-        if should_ignore_url(full_url):
+        # Only same domain
+        if not is_same_site(url_canon.site_key(clean_url), base_site):
             continue
         
-        # Clean URL (remove fragments, trailing slash)
-        clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}".rstrip("/")
-        
         # Skip homepage
-        if clean_url == base_url:
+        if url_canon.url_key(clean_url) == base_key:
             continue
         
-        links.add(clean_url)
+        listing_date, title = links.get(clean_url, (None, None))
+        listing_date = listing_date or find_listing_date(a_tag, adapter.get("dates") or "time")
+        anchor_text = a_tag.get_text(" ", strip=True)
+        if anchor_text and len(anchor_text) > len(title or ""):
+            title = anchor_text
+        links[clean_url] = (listing_date, title)
     
     return links
 
 
-def extract_links_from_sitemap(xml_content, limit=500):
-    """Extracts URLs from sitemap XML."""
-    links = set()
+def extract_links_from_sitemap(xml_content, limit=500, rules=None):
+    """Extracts article URLs from sitemap XML as {url: (lastmod_date, None)}."""
+    links = {}
     
     try:
         # Remove namespace for easier parsing
         xml_content = re.sub(r'\sxmlns="[^"]+"', '', xml_content)
         root = ET.fromstring(xml_content)
         
-        # Handle sitemap index
-        for sitemap in root.findall(".//sitemap"):
-            loc = sitemap.find("loc")
-            if loc is not None and loc.text:
-                links.add(loc.text.strip())
-        
-        # Handle URL entries
+        # Handle URL entries (sitemap index children are sitemaps, not articles)
         for url_elem in root.findall(".//url"):
             loc = url_elem.find("loc")
             if loc is not None and loc.text:
-                url = loc.text.strip()
-                if not should_ignore_url(url):
-                    links.add(url)
+                url = url_canon.canonicalize_url(loc.text)
+                if url and not should_ignore_url(url, rules):
+                    lastmod = url_elem.find("lastmod")
+                    links[url] = (date_window.parse_timestamp(lastmod.text) if lastmod is not None else None, None)
                     if len(links) >= limit:
                         break
     except ET.ParseError:
@@ -197,32 +230,19 @@ def extract_links_from_sitemap(xml_content, limit=500):
     return links
 
 
-def extract_article_content(html):
+def extract_article_content(html, adapter=None):
     """Extracts the main article content from an article page."""
+    adapter = adapter or site_adapters.get_adapter("generic")
     soup = BeautifulSoup(html, "html.parser")
     
     # Remove unwanted elements first
     for element in soup.select("script, style, nav, footer, header, aside, .sidebar, .comments, .sharedaddy, .jp-relatedposts, .related-posts, .advertisement, .ad-container"):
         element.decompose()
     
-    # Try multiple content selectors in order of preference
-    selectors = [
-        "div.entry-content",
-        "article .content",
-        "div.post-content",
-        "div.article-content",
-        "div.story-content",
-        "article",
-        "main",
-        "div.content"
-    ]
-    
-    for selector in selectors:
-        content_div = soup.select_one(selector)
-        if content_div:
-            text = content_div.get_text(separator="\n", strip=True)
-            if len(text) >= MIN_CONTENT_LENGTH:
-                return text
+    # Adapter selector first, generic selectors as fallback
+    text, _ = site_adapters.select_content(soup, adapter, MIN_CONTENT_LENGTH)
+    if text:
+        return text
     
     # Last resort: body text
     body = soup.find("body")
@@ -234,30 +254,142 @@ def extract_article_content(html):
     return None
 
 
-def save_signal(url, content, source):
-    """Saves a new raw signal to the database."""
+def save_signal(url, content, source, triage_score=None, mode=None):
+    """
+    Saves a new raw signal to the database.
+    Near-duplicates of a recent signal are saved pre-processed with duplicate_of.
+    mode ("backfill" / "incremental") is kept as harvest_mode for queue priority.
+    """
     signal_id = str(uuid.uuid4())
     now_ts = int(time.time() * 1000)
     
+    payload = {
+        "url": url,
+        "content": content,
+        "source": source,
+        "processed": False,
+        "created_at": now_ts
+    }
+    if triage_score is not None:
+        payload["triage_score"] = round(triage_score, 3)
+    if mode:
+        payload["harvest_mode"] = mode
+    
+    dup_fields, signature = near_dup.check_duplicate(DUP_INDEX, content)
+    payload.update(dup_fields)
+    
     tx_steps = [
         [
-            "update", "raw_signals", signal_id,
-            {
-                "url": url,
-                "content": content,
-                "source": source,
-                "processed": False,
-                "created_at": now_ts
-            }
+            "update", "raw_signals", signal_id, payload
         ]
     ]
     
     result = transact_db(tx_steps)
-    return result is not None
+    if result is None:
+        return False
+    
+    if dup_fields:
+        print(f"   🪞 Near-duplicate of {dup_fields['duplicate_of'][:8]} ({dup_fields['duplicate_score']:.0%} similar), skipping enrichment")
+    elif signature is not None:
+        DUP_INDEX.add(signal_id, signature)
+    return True
+
+
+def is_source_due(source, now_ms=None):
+    """Checks if a source needs dredging (never finished, or finished long enough ago)."""
+    cursor = source.get("dredge_cursor") or {}
+    if cursor.get("status") != "COMPLETE":
+        return True
+
+    last_dredged = source.get("last_dredged")
+    if not last_dredged:
+        return True
+
+    now_ms = now_ms or int(time.time() * 1000)
+    return now_ms - last_dredged >= REDREDGE_INTERVAL_HOURS * 3600 * 1000
+
+
+def load_resume_point(source, archive_targets):
+    """
+    Returns (target_index, item_index) to resume from.
+    Falls back to the start if the cursor is missing, complete, or no longer
+    lines up with the generated archive targets.
+    """
+    cursor = source.get("dredge_cursor") or {}
+    if cursor.get("status") != "IN_PROGRESS":
+        return 0, 0
+
+    target_index = cursor.get("target", 0)
+    if not isinstance(target_index, int) or not 0 <= target_index < len(archive_targets):
+        return 0, 0
+
+    if archive_targets[target_index][0] != cursor.get("target_url"):
+        return 0, 0
+
+    return target_index, cursor.get("item", 0) or 0
+
+
+def build_cursor(archive_targets, target_index, item_index, window, status="IN_PROGRESS"):
+    """Builds the cursor dict persisted on the source row."""
+    cutoff, mode = window
+    cursor = {
+        "status": status,
+        "target": target_index,
+        "item": item_index,
+        "cutoff": date_window.date_to_ms(cutoff),
+        "mode": mode,
+        "updated_at": int(time.time() * 1000)
+    }
+    if target_index < len(archive_targets):
+        target_url, pattern_type = archive_targets[target_index]
+        cursor["target_url"] = target_url
+        cursor["pattern"] = pattern_type
+        page_match = re.search(r"(?:/page/|\?page=)(\d+)", target_url)
+        cursor["page"] = int(page_match.group(1)) if page_match else None
+    return cursor
+
+
+def next_pattern_index(archive_targets, target_index):
+    """Index of the first target after `target_index` that uses a different pattern."""
+    pattern_type = archive_targets[target_index][1]
+    index = target_index + 1
+    while index < len(archive_targets) and archive_targets[index][1] == pattern_type:
+        index += 1
+    return index
+
+
+def resolve_source_adapter(source, base_url):
+    """
+    Returns the site adapter for a source, detecting it from the homepage the
+    first time and caching the name on the source row as `site_adapter`.
+    """
+    cached = source.get("site_adapter")
+    if cached in site_adapters.ADAPTERS:
+        return cached, site_adapters.get_adapter(cached)
+    
+    html = None
+    if site_adapters.domain_of(base_url) not in site_adapters.DOMAIN_ADAPTERS:
+        html = fetch_page(base_url, timeout=10)
+    name = site_adapters.resolve_adapter_name(base_url, html=html)
+    
+    source["site_adapter"] = name
+    if source.get("id"):
+        transact_db([["update", "sources", source["id"], {"site_adapter": name}]])
+    
+    return name, site_adapters.get_adapter(name)
+
+
+def save_cursor(source, cursor, **updates):
+    """Persists the cursor and mirrors it on the in-memory source row."""
+    source["dredge_cursor"] = cursor
+    source.update(updates)
+    source_id = source.get("id")
+    if source_id:
+        update_source_cursor(source_id, cursor, **updates)
 
 
 def process_source(source, existing_urls):
-    """Processes a single source with deep dredge heuristics."""
+    """Processes a single source with deep dredge heuristics, resuming from its cursor."""
     source_url = source.get("url")
     if not source_url:
         return 0, 0
@@ -266,84 +398,143 @@ def process_source(source, existing_urls):
     if not base_url:
         return 0, 0
     
-    parsed = urlparse(base_url)
-    source_name = parsed.netloc.replace("www.", "")
+    source_name = url_canon.site_key(base_url)
+    
+    window = get_source_cutoff(source)
+    cutoff, mode = window
     
     print(f"\n🔍 DREDGING: {source_name}")
     print(f"   Base URL: {base_url}")
     
-    article_urls = set()
-    pages_found = 0
-    
-    # Generate and process archive targets
-    archive_targets = generate_archive_targets(base_url)
+    adapter_name, adapter = resolve_source_adapter(source, base_url)
+    rules = url_filter.get_filter(source)
+    print(f"   🧩 Adapter: {adapter_name}")
+    print(f"   📅 Window ({mode}): articles since {cutoff.isoformat()}")
+    
+    if mode == "backfill" and source.get("backfill_status") != "IN_PROGRESS":
+        source["backfill_status"] = "IN_PROGRESS"
+        if source.get("id"):
+            transact_db([["update", "sources", source["id"], {
+                "backfill_status": "IN_PROGRESS",
+                "backfill_cutoff": date_window.date_to_ms(cutoff)
+            }]])
+    
+    # Generate archive targets and find where the last run stopped
+    archive_targets = generate_archive_targets(base_url, adapter)
+    start_target, start_item = load_resume_point(source, archive_targets)
+    if start_target or start_item:
+        print(f"   ⏩ Resuming at target {start_target + 1}/{len(archive_targets)}, item {start_item}")
     
-    for target_url, pattern_type in archive_targets:
+    new_count = 0
+    skip_count = 0
+    total_links = 0
+    triage_dropped = 0
+    previous_links = set()
+    
+    target_index = start_target
+    while target_index < len(archive_targets):
+        target_url, pattern_type = archive_targets[target_index]
+        first_item = start_item if target_index == start_target else 0
+        paginated = pattern_type != "sitemap"
+        
         html = fetch_page(target_url, timeout=10)
         if not html:
+            # Past the last archive page: the rest of this pattern will 404 too
+            target_index = next_pattern_index(archive_targets, target_index) if paginated else target_index + 1
+            save_cursor(source, build_cursor(archive_targets, target_index, 0, window))
             continue
         
-        pages_found += 1
-        
         if pattern_type == "sitemap":
-            links = extract_links_from_sitemap(html)
+            links = extract_links_from_sitemap(html, rules=rules)
             print(f"   📑 Sitemap: Found {len(links)} URLs")
         else:
-            links = extract_links_from_html(html, base_url)
+            links = extract_links_from_html(html, base_url, adapter, rules)
             if links:
                 print(f"   📄 {pattern_type}: Found {len(links)} links")
         
-        article_urls.update(links)
-        time.sleep(0.5)  # Brief pause between archive pages
-    
-    if not article_urls:
-        print(f"   ⚠️ No article URLs found")
-        return 0, 0
-    
-    print(f"   📊 Total unique article URLs: {len(article_urls)}")
-    
-    # Filter for 2024/2025 articles only
-    recent_urls = [url for url in article_urls if is_valid_year(url)]
-    print(f"   📅 2024/2025 articles: {len(recent_urls)}")
-    
-    # Process articles
-    new_count = 0
-    skip_count = 0
-    
-    for article_url in recent_urls:
-        normalized = article_url.rstrip("/")
+        total_links += len(links)
         
-        # Deduplicate
-        if normalized in existing_urls:
-            skip_count += 1
-            continue
+        dated = {url: date_window.resolve_article_date(url, hint) for url, (hint, _) in links.items()}
         
-        # Fetch full content
-        article_html = fetch_page(normalized)
-        if not article_html:
-            continue
+        # Sorted so the item position in the cursor is stable across runs
+        recent_urls = sorted(url for url, day in dated.items() if date_window.is_in_window(day, cutoff))
         
-        content = extract_article_content(article_html)
-        if not content:
-            continue
+        # Triage on slug + listing title before spending a fetch
+        triaged = {url: triage.should_fetch(url, links[url][1]) for url in recent_urls}
+        dropped = [url for url in recent_urls if not triaged[url][0]]
+        if dropped:
+            print(f"   ✂️ Triage dropped {len(dropped)}/{len(recent_urls)} candidates")
+            triage_dropped += len(dropped)
+        recent_urls = [url for url in recent_urls if triaged[url][0]]
         
-        if len(content) < MIN_CONTENT_LENGTH:
-            print(f"   ⚠️ Warning: Short content ({len(content)} chars): {normalized[:50]}...")
-            continue
+        # Stop paging once the listing has crossed the cutoff (or pagination is ignored)
+        known_dates = [day for day in dated.values() if day]
+        crossed_cutoff = bool(known_dates) and max(known_dates) < cutoff
+        repeated_page = bool(links) and set(links) == previous_links
+        previous_links = set(links)
         
-        # Save to database
-        if save_signal(normalized, content, source_name):
-            existing_urls.add(normalized)
-            new_count += 1
-            # Extract title for logging
-            title = normalized.split("/")[-1].replace("-", " ")[:40]
-            print(f"   ✅ [{source_name}] Deep Harvest: Saved '{title}...'")
+        for item_index in range(first_item, len(recent_urls)):
+            normalized = recent_urls[item_index]
+            
+            # Deduplicate (no cursor write: a skip costs no fetch, so a run of
+            # skips is covered by the next fetched item or the end of the page)
+            if url_canon.url_key(normalized) in existing_urls:
+                skip_count += 1
+                continue
+            
+            # Fetch full content
+            article_html = fetch_page(normalized)
+            content = extract_article_content(article_html, adapter) if article_html else None
+            
+            # The page's rel=canonical may name a URL we already hold
+            canonical = url_canon.canonical_from_html(article_html, normalized, target_url) if article_html else normalized
+            if url_canon.url_key(canonical) in existing_urls:
+                skip_count += 1
+                existing_urls.add(url_canon.url_key(normalized))
+            elif content and len(content) < MIN_CONTENT_LENGTH:
+                print(f"   ⚠️ Warning: Short content ({len(content)} chars): {normalized[:50]}...")
+            elif content and save_signal(canonical, content, source_name, triage_score=triaged[normalized][1], mode=mode):
+                existing_urls.add(url_canon.url_key(normalized))
+                existing_urls.add(url_canon.url_key(canonical))
+                new_count += 1
+                # Extract title for logging
+                title = normalized.split("/")[-1].replace("-", " ")[:40]
+                print(f"   ✅ [{source_name}] Deep Harvest: Saved '{title}...'")
+            
+            save_cursor(source, build_cursor(archive_targets, target_index, item_index + 1, window))
+            
+            if article_html:
+                time.sleep(FETCH_DELAY)
+            
+            # Status update every 10 new articles
+            if new_count % 10 == 0 and new_count > 0:
+                print(f"   📊 Progress: {new_count} new articles saved...")
         
-        time.sleep(FETCH_DELAY)
+        if paginated and (crossed_cutoff or repeated_page or not links):
+            if crossed_cutoff:
+                print(f"   🛑 {pattern_type}: crossed cutoff {cutoff.isoformat()} at {target_url}")
+            target_index = next_pattern_index(archive_targets, target_index)
+        else:
+            target_index += 1
         
-        # Status update every 10 new articles
-        if new_count % 10 == 0 and new_count > 0:
-            print(f"   📊 Progress: {new_count} new articles saved...")
+        save_cursor(source, build_cursor(archive_targets, target_index, 0, window))
+        time.sleep(0.5)  # Brief pause between archive pages
+    
+    now_ms = int(time.time() * 1000)
+    updates = {"last_dredged": now_ms}
+    if mode == "backfill":
+        updates["backfill_status"] = "COMPLETE"
+        updates["backfill_completed_at"] = now_ms
+    save_cursor(
+        source,
+        build_cursor(archive_targets, len(archive_targets), 0, window, status="COMPLETE"),
+        **updates
+    )
+    
+    if not total_links and not start_target:
+        print(f"   ⚠️ No article URLs found")
+    elif triage_dropped:
+        print(f"   ✂️ Triage skipped {triage_dropped} article fetches for {source_name}")
     
     return new_count, skip_count
 
@@ -366,8 +557,13 @@ def run_universal_dredge():
     total_new = 0
     total_skipped = 0
     sources_processed = 0
+    sources_not_due = 0
     
     for source in sources:
+        if not is_source_due(source):
+            sources_not_due += 1
+            continue
+        
         try:
             new_count, skip_count = process_source(source, existing_urls)
             total_new += new_count
@@ -388,6 +584,7 @@ def run_universal_dredge():
     print("\n" + "=" * 70)
     print("🏁 UNIVERSAL DREDGE COMPLETE")
     print(f"   📁 Sources processed: {sources_processed}")
+    print(f"   💤 Sources not due yet: {sources_not_due}")
     print(f"   ✅ New articles saved: {total_new}")
     print(f"   ⏭️ Duplicates skipped: {total_skipped}")
     print("=" * 70)
@@ -0,0 +1,141 @@
+"""
+URL Canon - One canonicalizer for every writer and dedupe index
+Two views of the same normalization:
+- canonicalize_url(url): clean, still-fetchable URL that writers store
+  (lowercase scheme/host, no default port, no fragment, tracking params
+  stripped, AMP variant collapsed to the article, no trailing slash).
+- url_key(url): identity key for dedupe sets and source matching
+  (canonical URL without scheme and without the www. prefix).
+canonical_from_html() prefers the page's own <link rel="canonical">, unless
+it is obviously not the article's (site root, the listing, another depth).
+"""
+import re
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query params that never change the page content ("source", "ref" and
+# "share" are left alone: some CMSs use them as real query keys)
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "_hsenc", "_hsmi", "mkt_tok", "ref_src", "referrer",
+    "cmpid", "cmp", "ito", "smid", "sr_share", "amp",
+    "outputtype",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "hsa_", "oly_", "vero_")
+
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+_OTHER_SCHEME_RE = re.compile(r"^[a-z][a-z0-9+.-]*:(?!\d)", re.IGNORECASE)
+_CANONICAL_LINK_RE = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_REL_CANONICAL_RE = re.compile(r"""\brel\s*=\s*["']?canonical\b""", re.IGNORECASE)
+_HREF_RE = re.compile(r"""\bhref\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+
+
+def _is_tracking(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def _strip_amp(host, path):
+    """Collapses AMP variants (amp. host, /amp/ path, .amp.html) to the article."""
+    if host.startswith("amp."):
+        host = host[4:]
+    path = re.sub(r"/amp/?$", "", path)
+    path = re.sub(r"^/amp(?=/)", "", path)
+    path = re.sub(r"\.amp(\.html?)$", r"\1", path)
+    return host, path
+
+
+def canonicalize_url(url, base_url=None):
+    """Returns the canonical, fetchable form of a URL (None for non-http URLs)."""
+    if not url:
+        return None
+    url = url.strip()
+    if base_url:
+        url = urljoin(base_url, url)
+    elif "://" not in url:
+        if _OTHER_SCHEME_RE.match(url):
+            return None  # mailto:, tel:, javascript:
+        url = "https://" + url
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https"):
+        return None
+
+    host = (parts.hostname or "").lower().rstrip(".")
+    if not host:
+        return None
+    try:
+        port = parts.port
+    except ValueError:
+        return None
+    netloc = host if not port or str(port) == DEFAULT_PORTS.get(scheme) else f"{host}:{port}"
+
+    netloc, path = _strip_amp(netloc, parts.path or "")
+    path = re.sub(r"/{2,}", "/", path).rstrip("/")
+
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k)]
+    query.sort()
+
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+
+def url_key(url, base_url=None):
+    """Identity key for dedupe: canonical URL without scheme or www."""
+    canonical = canonicalize_url(url, base_url)
+    if not canonical:
+        return None
+    key = canonical.split("://", 1)[1]
+    if key.startswith("www."):
+        key = key[4:]
+    return key
+
+
+def site_key(url):
+    """Host identity for source matching (no scheme, no www, no path)."""
+    key = url_key(url)
+    if not key:
+        return None
+    return key.split("/", 1)[0].split("?", 1)[0]
+
+
+def _path_depth(url):
+    return len([segment for segment in urlsplit(url).path.split("/") if segment])
+
+
+def plausible_canonical(canonical, page_url, listing_url=None):
+    """
+    False for a rel=canonical that cannot be the article's own URL: the site
+    root, the listing it was found on, or a path of another depth than the
+    fetched page (a section root). Pages fetched by query (?p=123) may name any path.
+    """
+    if _path_depth(canonical) == 0:
+        return False
+    if listing_url and url_key(canonical) == url_key(listing_url):
+        return False
+    page_depth = _path_depth(page_url)
+    return page_depth == 0 or _path_depth(canonical) == page_depth
+
+
+def canonical_from_html(html, page_url, listing_url=None):
+    """
+    Returns the page's <link rel="canonical"> (canonicalized) if it points to
+    the same site and plausibly names this article (plausible_canonical),
+    otherwise the canonical form of page_url.
+    """
+    fallback = canonicalize_url(page_url)
+    if not html:
+        return fallback
+
+    head = html[:200000]
+    for tag in _CANONICAL_LINK_RE.findall(head):
+        if not _REL_CANONICAL_RE.search(tag):
+            continue
+        href = _HREF_RE.search(tag)
+        if not href:
+            continue
+        canonical = canonicalize_url(href.group(1), base_url=page_url)
+        if (canonical and site_key(canonical) == site_key(page_url)
+                and plausible_canonical(canonical, page_url, listing_url)):
+            return canonical
+    return fallback
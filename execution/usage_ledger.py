@@ -0,0 +1,213 @@
+"""
+Usage Ledger - Token and cost accounting for LLM calls
+Every enrichment call records the prompt/completion tokens the provider
+reported (llm_providers.Provider.complete; a token_count.py estimate when it
+reported none) into SQLite, aggregated per hour x engine x model x API key x
+source. A request covering several articles (multi-document, triage) splits
+its tokens evenly over their sources. Ledger errors are logged, never raised:
+accounting must not fail an enrichment. Signals settled and projects saved are
+counted per hour x source, so sources that burn quota for zero projects stand out.
+
+Costs use the list prices in PRICES_PER_MTOK (free-tier keys are billed
+nothing, but the figure sizes paid capacity for the backlog).
+
+Usage:
+    python3 execution/usage_ledger.py          # last 24h by engine, key and source
+    python3 execution/usage_ledger.py 168      # last 7 days
+"""
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+LEDGER_PATH = Path(os.environ.get("LLM_USAGE_PATH", Path(__file__).parent.parent / "data" / "llm_usage.sqlite"))
+
+# USD per million (prompt, completion) tokens
+PRICES_PER_MTOK = {
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "gemini-flash-latest": (0.30, 2.50),
+    "gemini-2.0-flash": (0.10, 0.40),
+}
+
+_lock = threading.Lock()
+_conn = None
+_session = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "estimated_calls": 0, "cost": 0.0}
+
+
+def hour_bucket(ts=None):
+    """UTC hour a timestamp falls in, as "YYYY-MM-DDTHH"."""
+    return time.strftime("%Y-%m-%dT%H", time.gmtime(ts or time.time()))
+
+
+def cost_usd(model, prompt_tokens, completion_tokens):
+    prompt_price, completion_price = PRICES_PER_MTOK.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1e6
+
+
+def _connect():
+    """Opens (and creates) the ledger once per process. Caller holds _lock."""
+    global _conn
+    if _conn is None:
+        LEDGER_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(str(LEDGER_PATH), check_same_thread=False, timeout=30)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS usage ("
+            " hour TEXT, engine TEXT, model TEXT, key_id TEXT, source TEXT,"
+            " calls REAL DEFAULT 0, prompt_tokens REAL DEFAULT 0, completion_tokens REAL DEFAULT 0,"
+            " estimated_calls REAL DEFAULT 0,"
+            " PRIMARY KEY (hour, engine, model, key_id, source))"
+        )
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS outcomes ("
+            " hour TEXT, source TEXT, signals INTEGER DEFAULT 0, projects INTEGER DEFAULT 0,"
+            " PRIMARY KEY (hour, source))"
+        )
+    return _conn
+
+
+def record_call(engine, model, key_id, sources, prompt_tokens, completion_tokens, estimated=False):
+    """
+    Adds one completed call. sources lists the source of each article in the
+    request (tokens are split evenly); estimated marks counts the API did not report.
+    """
+    sources = list(sources) or ["unknown"]
+    share = 1.0 / len(sources)
+    hour = hour_bucket()
+    rows = {}
+    for source in sources:
+        rows[source] = rows.get(source, 0.0) + share
+    with _lock:
+        _session["calls"] += 1
+        _session["prompt_tokens"] += prompt_tokens
+        _session["completion_tokens"] += completion_tokens
+        _session["estimated_calls"] += 1 if estimated else 0
+        _session["cost"] += cost_usd(model, prompt_tokens, completion_tokens)
+    try:
+        with _lock:
+            conn = _connect()
+            conn.executemany(
+                "INSERT INTO usage (hour, engine, model, key_id, source, calls, prompt_tokens, completion_tokens,"
+                " estimated_calls) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (hour, engine, model, key_id, source) DO UPDATE SET"
+                " calls = calls + excluded.calls, prompt_tokens = prompt_tokens + excluded.prompt_tokens,"
+                " completion_tokens = completion_tokens + excluded.completion_tokens,"
+                " estimated_calls = estimated_calls + excluded.estimated_calls",
+                [(hour, engine, model, key_id or "", source, weight, prompt_tokens * weight,
+                  completion_tokens * weight, weight if estimated else 0.0)
+                 for source, weight in rows.items()]
+            )
+            conn.commit()
+    except (sqlite3.Error, OSError) as e:
+        logging.warning(f"   ⚠️ Usage ledger error: {e}")
+
+
+def record_outcome(source, saved=False):
+    """Counts one settled signal (and a saved project) against its source."""
+    try:
+        with _lock:
+            conn = _connect()
+            conn.execute(
+                "INSERT INTO outcomes (hour, source, signals, projects) VALUES (?, ?, 1, ?)"
+                " ON CONFLICT (hour, source) DO UPDATE SET"
+                " signals = signals + 1, projects = projects + excluded.projects",
+                (hour_bucket(), source or "unknown", 1 if saved else 0)
+            )
+            conn.commit()
+    except (sqlite3.Error, OSError) as e:
+        logging.warning(f"   ⚠️ Usage ledger error: {e}")
+
+
+def session_summary():
+    """One-line report of this process's usage."""
+    with _lock:
+        s = dict(_session)
+    if not s["calls"]:
+        return "Usage: no calls yet"
+    estimated = f", {s['estimated_calls']} estimated" if s["estimated_calls"] else ""
+    return (f"Usage: {s['calls']} calls, {s['prompt_tokens']:,} prompt + {s['completion_tokens']:,} "
+            f"completion tokens (~${s['cost']:.4f}{estimated})")
+
+
+def summary(hours=24):
+    """
+    Usage over the last `hours`: {"totals", "by_engine", "by_key", "by_source", "by_hour"}.
+    Each entry has calls, prompt_tokens, completion_tokens, cost; by_source adds
+    signals and projects.
+    """
+    since = hour_bucket(time.time() - hours * 3600)
+    with _lock:
+        conn = _connect()
+        rows = conn.execute(
+            "SELECT hour, engine, model, key_id, source, calls, prompt_tokens, completion_tokens"
+            " FROM usage WHERE hour >= ?", (since,)
+        ).fetchall()
+        outcomes = conn.execute(
+            "SELECT source, SUM(signals), SUM(projects) FROM outcomes WHERE hour >= ? GROUP BY source", (since,)
+        ).fetchall()
+
+    def empty():
+        return {"calls": 0.0, "prompt_tokens": 0.0, "completion_tokens": 0.0, "cost": 0.0}
+
+    def add(entry, model, calls, prompt, completion):
+        entry["calls"] += calls
+        entry["prompt_tokens"] += prompt
+        entry["completion_tokens"] += completion
+        entry["cost"] += cost_usd(model, prompt, completion)
+
+    result = {"totals": empty(), "by_engine": {}, "by_key": {}, "by_source": {}, "by_hour": {}}
+    for hour, engine, model, key_id, source, calls, prompt, completion in rows:
+        add(result["totals"], model, calls, prompt, completion)
+        for group, key in (("by_engine", f"{engine} ({model})"), ("by_key", key_id or "-"),
+                           ("by_source", source), ("by_hour", hour)):
+            add(result[group].setdefault(key, empty()), model, calls, prompt, completion)
+    for source, signals, projects in outcomes:
+        entry = result["by_source"].setdefault(source, empty())
+        entry["signals"] = signals
+        entry["projects"] = projects
+    return result
+
+
+def source_outcomes(hours=24):
+    """{source: (signals, projects)} settled over the last `hours` ({} if the ledger is unreadable)."""
+    since = hour_bucket(time.time() - hours * 3600)
+    try:
+        with _lock:
+            rows = _connect().execute(
+                "SELECT source, SUM(signals), SUM(projects) FROM outcomes WHERE hour >= ? GROUP BY source", (since,)
+            ).fetchall()
+    except (sqlite3.Error, OSError) as e:
+        logging.warning(f"   ⚠️ Usage ledger error: {e}")
+        return {}
+    return {source: (signals, projects) for source, signals, projects in rows}
+
+
+def _tokens(entry):
+    return int(entry["prompt_tokens"] + entry["completion_tokens"])
+
+
+def report(hours=24):
+    """Prints usage over the last `hours`."""
+    data = summary(hours)
+    totals = data["totals"]
+    print(f"💸 LLM usage, last {hours}h ({LEDGER_PATH})")
+    print(f"   {totals['calls']:.0f} calls | {totals['prompt_tokens']:,.0f} prompt + "
+          f"{totals['completion_tokens']:,.0f} completion tokens | ~${totals['cost']:.2f}")
+    for title, key in (("engine", "by_engine"), ("key", "by_key")):
+        print(f"\n   By {title}:")
+        for name, entry in sorted(data[key].items(), key=lambda kv: -_tokens(kv[1])):
+            print(f"   {name:45s} {entry['calls']:7.0f} calls {_tokens(entry):12,d} tok  ${entry['cost']:.2f}")
+    print("\n   By source (tokens per saved project):")
+    for name, entry in sorted(data["by_source"].items(), key=lambda kv: -_tokens(kv[1]))[:30]:
+        projects = entry.get("projects", 0)
+        per_project = f"{_tokens(entry) / projects:,.0f}/project" if projects else "⚠️ no projects"
+        print(f"   {name[:45]:45s} {_tokens(entry):12,d} tok {entry.get('signals', 0):5d} signals "
+              f"{projects:4d} projects  {per_project}")
+
+
+if __name__ == "__main__":
+    report(int(sys.argv[1]) if len(sys.argv) > 1 else 24)